@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""接口测试用例执行模块"""
+from .body_capture import BodyCapture
+from .case_flakiness_tracker import CaseFlakinessTracker
+from .case_executor import CaseExecutor
+from .async_step_executor import AsyncCaseExecutor
+from .http_client import AsyncClientPool
+from .latency_histogram import LatencyHistogram
+from .load_step_executor import LoadStepExecutor
+from .step_timing import RequestTimer, SessionRequestTimer, StepTimingAggregator
+from .case_result_recorder import CaseResultRecorder
+from .suite_runner import SuiteDefinition, SuiteRunner
+from .test_case_cache import TestCaseFileCache
+
+__all__ = [
+    'BodyCapture',
+    'CaseExecutor',
+    'CaseFlakinessTracker',
+    'AsyncCaseExecutor',
+    'AsyncClientPool',
+    'CaseResultRecorder',
+    'LatencyHistogram',
+    'LoadStepExecutor',
+    'RequestTimer',
+    'SessionRequestTimer',
+    'StepTimingAggregator',
+    'SuiteDefinition',
+    'SuiteRunner',
+    'TestCaseFileCache'
+]
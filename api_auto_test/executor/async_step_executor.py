@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+"""
+基于 asyncio + httpx 的异步用例执行器
+使用 AsyncClientPool 的常驻事件循环线程，按 base_url 复用 keep-alive 的连接池，
+多个用例的请求在同一个事件循环中并发等待，跨用例、跨执行复用 TCP/TLS 连接；
+每个用例使用独立的 AsyncClient，cookie jar 与该用例 runner 副本的会话共用，不会带到其他用例
+
+由 httpx 直接执行的 http_request 步骤只能包含以下字段：
+- request: method / endpoint / headers / params / body
+- validate: 断言列表，比较器限 eq / ne / gt / lt / contains / not_null，
+  取值路径限 status_code / headers.xxx / data.xxx / $.xxx，如 {"eq": ["status_code", 200]}
+其他 http_request 步骤（包含 extract、其他比较器或取值路径、其他步骤/请求字段）交给 YAMLTestRunner.execute_step 执行，
+断言和变量提取沿用 runner 自身的语义，同一份 YAML 在两种引擎下结果一致
+load 类型的压测步骤直接在事件循环中执行；
+polling、repeat 等其他类型步骤回退到 runner 的同步实现（沿用 runner 的字段和默认值），在线程池中执行，
+执行期间用例继续占用并发名额，同时执行的用例数不超过 concurrency
+"""
+import asyncio
+import contextvars
+import queue
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .case_executor import CaseExecutor
+from .http_client import AsyncClientPool, build_http_request, get_runner_session
+from .load_step_executor import LoadStepExecutor
+from .step_timing import RequestTimer
+from .suite_runner import SuiteRunner
+
+# 当前用例的 AsyncClient（base_url -> client），用例结束后丢弃，cookie 不会带到其他用例
+CASE_CLIENTS: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar('CASE_CLIENTS', default=None)
+
+
+class AsyncCaseExecutor(CaseExecutor):
+    """异步用例执行器"""
+
+    # 异步执行不占用线程，允许更高的并发数
+    MAX_CONCURRENCY = 200
+
+    def iter_cases(self, cases: List[Dict], concurrency: int = 1) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        在常驻事件循环中并发执行用例，按完成顺序产出 (用例序号, 用例执行结果)
+        结果经线程安全队列交回调用线程，调用方在自己的线程中处理（如写数据库），不阻塞事件循环
+        :param cases: 用例列表
+        :param concurrency: 同时在途的用例数
+        :return: (用例在 cases 中的序号, 用例执行结果) 迭代器
+        """
+        concurrency = self.normalize_concurrency(concurrency, len(cases))
+        self.logger.info(f"异步执行用例，并发数: {concurrency}")
+
+        runnerSteps = sum(
+            1 for case in cases for step in case.get('steps', [])
+            if step.get('type', 'http_request') == 'http_request' and not self.is_async_step(step)
+        )
+        if runnerSteps:
+            self.logger.info(f"{runnerSteps} 个 http_request 步骤使用了异步引擎不支持的字段或断言，交给 runner 同步执行")
+
+        completed = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self.run_cases_async(cases, concurrency, completed.put),
+            AsyncClientPool.get_loop()
+        )
+
+        remaining = len(cases)
+        while remaining:
+            try:
+                item = completed.get(timeout=1)
+            except queue.Empty:
+                if future.done():
+                    # 协程异常结束时抛出异常，避免无限等待
+                    future.result()
+                    break
+                continue
+            remaining -= 1
+            yield item
+
+        future.result()
+
+    def fork_runner(self):
+        """
+        复制一份用例独占的 runner
+        异步执行时所有用例在同一个事件循环线程中交替运行，不能按线程复用副本
+        """
+        return SuiteRunner.copy_runner(self.runner)
+
+    async def run_cases_async(self, cases: List[Dict], concurrency: int,
+                              on_completed: Callable[[Tuple[int, Dict[str, Any]]], None]):
+        """按信号量限制并发，每完成一个用例回调一次 on_completed"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def runWithLimit(index, case):
+            async with semaphore:
+                caseResult = await self.run_case_async(self.fork_runner(), case)
+            on_completed((index, caseResult))
+
+        await asyncio.gather(*(runWithLimit(index, case) for index, case in enumerate(cases)))
+
+    async def run_case_async(self, runner, case: Dict) -> Dict[str, Any]:
+        """
+        执行单个用例
+        :param runner: 用例独占的 YAMLTestRunner 副本
+        :param case: 用例数据
+        :return: 用例执行结果
+        """
+        caseId = case.get('case', 'UNKNOWN')
+        caseName = case.get('name', caseId)
+
+        self.logger.info(f"执行用例: {caseId} - {caseName}")
+
+        loop = asyncio.get_running_loop()
+        caseStart = loop.time()
+        CASE_CLIENTS.set({})
+        caseResult = {
+            'case_id': caseId,
+            'case_name': caseName,
+            'status': 'PASS',
+            'duration': 0,
+            'error_message': '',
+            'steps': []
+        }
+
+        try:
+            for step in case.get('steps', []):
+                stepResult = await self.run_step_async(runner, step)
+                if self.body_capture.spill:
+                    # 转存完整 body 会同步上传 COS，放到线程池执行，避免阻塞事件循环
+                    await loop.run_in_executor(None, self.body_capture.capture_step, stepResult)
+                else:
+                    self.body_capture.capture_step(stepResult)
+                caseResult['steps'].append(stepResult)
+
+                if stepResult['status'] != 'PASS':
+                    caseResult['status'] = 'FAIL'
+                    caseResult['error_message'] = f"{stepResult['name']}: {stepResult['error_message']}"
+                    break
+
+        except Exception as e:
+            caseResult['status'] = 'FAIL'
+            caseResult['error_message'] = str(e)
+            self.logger.error(f"用例执行异常: {caseId}, 错误: {e}")
+
+        caseResult['duration'] = loop.time() - caseStart
+        return caseResult
+
+    async def run_step_async(self, runner, step: Dict) -> Dict[str, Any]:
+        """
+        执行单个步骤，http_request 走 httpx，其他类型回退到 runner 的同步实现
+        :param runner: YAMLTestRunner 副本
+        :param step: 步骤数据
+        :return: 步骤执行结果
+        """
+        stepType = step.get('type', 'http_request')
+
+        if stepType == 'load':
+            return await LoadStepExecutor().run_async(runner, step)
+
+        if stepType != 'http_request' or not self.is_async_step(step):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.run_step, runner, step)
+
+        stepResult = {
+            'name': step.get('name', 'unknown_step'),
+            'status': 'PASS',
+            'error_message': '',
+            'request': {},
+            'response': {}
+        }
+
+        try:
+            success, stepResponse, error = await self.execute_http_step(runner, step, stepResult)
+
+            if stepResponse:
+                stepResult['response'] = {
+                    'status_code': stepResponse.get('status_code', 0),
+                    'body': stepResponse.get('data')
+                }
+            else:
+                stepResult['response'] = {
+                    'status_code': 0,
+                    'body': None,
+                    'error': str(error) if error else '无响应'
+                }
+
+            if not success:
+                stepResult['status'] = 'FAIL'
+                stepResult['error_message'] = str(error) if error else '步骤执行失败'
+
+        except Exception as e:
+            stepResult['status'] = 'FAIL'
+            stepResult['error_message'] = str(e)
+            stepResult['response'] = {
+                'status_code': 0,
+                'body': None,
+                'error': str(e)
+            }
+
+        return stepResult
+
+    # httpx 直接执行的步骤允许的步骤字段和请求字段
+    ASYNC_STEP_KEYS = frozenset({'name', 'type', 'request', 'validate'})
+    ASYNC_REQUEST_KEYS = frozenset({'method', 'endpoint', 'headers', 'params', 'body'})
+
+    # 取值路径前缀：status_code / headers.xxx / data.xxx / $.xxx
+    ASYNC_PATH_PREFIXES = ('headers.', 'data.', '$.')
+
+    @classmethod
+    def is_async_step(cls, step: Dict) -> bool:
+        """
+        判断 http_request 步骤能否由 httpx 直接执行
+        步骤只包含本执行器能按 runner 语义处理的字段、比较器和取值路径时返回 True，
+        否则交给 runner.execute_step，避免同一份 YAML 在两种引擎下结果不同
+        """
+        if not set(step) <= cls.ASYNC_STEP_KEYS:
+            return False
+
+        request = step.get('request') or {}
+        if not isinstance(request, dict) or not set(request) <= cls.ASYNC_REQUEST_KEYS:
+            return False
+
+        validators = step.get('validate') or []
+        if not isinstance(validators, list):
+            return False
+        for validator in validators:
+            if not isinstance(validator, dict):
+                return False
+            for comparator, args in validator.items():
+                if comparator not in cls.COMPARATORS or not isinstance(args, (list, tuple)) or not args:
+                    return False
+                if len(args) > 2 or not cls.is_async_path(args[0]):
+                    return False
+        return True
+
+    @classmethod
+    def is_async_path(cls, path) -> bool:
+        """取值路径是否为本执行器支持的格式"""
+        return isinstance(path, str) and (path == 'status_code' or path.startswith(cls.ASYNC_PATH_PREFIXES))
+
+    async def execute_http_step(self, runner, step: Dict, stepResult: Dict) -> Tuple[bool, Optional[Dict], Any]:
+        """
+        发送 HTTP 请求并执行断言（步骤已经过 is_async_step 检查）
+        :return: (是否成功, 响应数据, 错误信息)，与 runner.execute_step 的返回约定一致
+        """
+        stepResponse = await self.send_http_request(runner, step, stepResult)
+
+        passed, error = self.check_validators(runner, step.get('validate'), stepResponse)
+        if not passed:
+            return False, stepResponse, error
+
+        return True, stepResponse, None
+
+    async def send_http_request(self, runner, step: Dict, stepResult: Dict) -> Dict[str, Any]:
+        """
+        发送 HTTP 请求，请求信息写入 stepResult['request']，各阶段网络耗时写入 stepResult['timings']
+        :return: 响应数据 {"status_code": ..., "headers": {...}, "data": ...}
+        """
+        baseUrl, method, endpoint, requestKwargs, stepResult['request'] = build_http_request(runner, step)
+
+        client = self.get_case_client(runner, baseUrl)
+        requestTimer = RequestTimer()
+        httpResponse = await client.request(method, endpoint, extensions={'trace': requestTimer.trace}, **requestKwargs)
+        stepResult['timings'] = requestTimer.timings()
+
+        try:
+            data = httpResponse.json()
+        except ValueError:
+            data = httpResponse.text
+
+        return {
+            'status_code': httpResponse.status_code,
+            'headers': dict(httpResponse.headers),
+            'data': data
+        }
+
+    @staticmethod
+    def get_case_client(runner, baseUrl: str):
+        """
+        获取当前用例的 AsyncClient，cookie jar 与 runner 会话共用，
+        同一用例中 httpx 执行的步骤和 runner 执行的步骤读写同一份 cookie
+        """
+        clients = CASE_CLIENTS.get()
+        client = clients.get(baseUrl) if clients is not None else None
+        if client is None:
+            session = get_runner_session(runner)
+            client = AsyncClientPool.create_client(baseUrl, session.cookies if session is not None else None)
+            if clients is not None:
+                clients[baseUrl] = client
+        return client
+
+    def check_validators(self, runner, validators, stepResponse: Dict) -> Tuple[bool, Optional[str]]:
+        """替换变量后依次执行断言，返回第一条失败断言的错误信息"""
+        for validator in runner.var_handler.replace_variables(validators or []):
+            passed, error = self.check_validator(validator, stepResponse)
+            if not passed:
+                return False, error
+        return True, None
+
+    # 断言比较器
+    COMPARATORS = {
+        'eq': lambda actual, expected: actual == expected,
+        'ne': lambda actual, expected: actual != expected,
+        'gt': lambda actual, expected: actual is not None and actual > expected,
+        'lt': lambda actual, expected: actual is not None and actual < expected,
+        'contains': lambda actual, expected: actual is not None and expected in actual,
+        'not_null': lambda actual, expected: actual is not None,
+    }
+
+    def check_validator(self, validator: Dict, stepResponse: Dict) -> Tuple[bool, Optional[str]]:
+        """
+        执行单条断言
+        :param validator: 如 {"eq": ["data.code", 0]}
+        :param stepResponse: 响应数据
+        :return: (是否通过, 错误信息)
+        """
+        for comparator, args in validator.items():
+            compare = self.COMPARATORS[comparator]
+            path = args[0]
+            expected = args[1] if len(args) > 1 else None
+
+            actual = self.resolve_path(stepResponse, path)
+            try:
+                passed = compare(actual, expected)
+            except TypeError:
+                passed = False
+            if not passed:
+                return False, f"断言失败: {comparator}({path}), 实际值: {actual}, 期望值: {expected}"
+
+        return True, None
+
+    @staticmethod
+    def resolve_path(stepResponse: Dict, path: str):
+        """
+        按点分路径取值，支持 status_code / headers.xxx / data.xxx / $.xxx（等同 data.xxx）
+        列表下标使用数字，如 data.items.0.id
+        """
+        if not isinstance(path, str):
+            return None
+        if path.startswith('$.'):
+            path = 'data.' + path[2:]
+
+        current: Any = stepResponse
+        for key in path.split('.'):
+            if isinstance(current, dict):
+                current = current.get(key)
+            elif isinstance(current, list) and key.lstrip('-').isdigit():
+                index = int(key)
+                current = current[index] if -len(current) <= index < len(current) else None
+            else:
+                return None
+        return current
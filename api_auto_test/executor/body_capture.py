@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+请求/响应体采集策略
+超过大小上限的 body 只保留头部和尾部片段，附带原始大小和 SHA-256，
+可选将完整内容另存为单独的 COS 对象，保证 worker 内存和报告大小可控
+
+环境配置 capture_policy 字段示例：
+{"max_body_size": 65536, "head_size": 8192, "tail_size": 2048, "spill_to_cos": true}
+"""
+import hashlib
+import json
+import logging
+from typing import Any, Callable, Dict, Optional
+
+
+class BodyCapture:
+    """body 采集器"""
+
+    # 默认策略：未配置 capture_policy 的环境同样生效
+    DEFAULT_POLICY = {
+        'max_body_size': 64 * 1024,
+        'head_size': 8 * 1024,
+        'tail_size': 2 * 1024,
+        'spill_to_cos': False
+    }
+
+    def __init__(self, policy: Optional[Dict[str, Any]] = None,
+                 spill: Optional[Callable[[bytes, str], Optional[str]]] = None, logger=None):
+        """
+        :param policy: 采集策略，缺省项使用 DEFAULT_POLICY
+        :param spill: 完整 body 转存函数，入参为 (内容, sha256)，返回访问 URL；
+                      仅在策略开启 spill_to_cos 时使用
+        :param logger: 日志对象，默认使用模块日志
+        """
+        policy = {**self.DEFAULT_POLICY, **(policy or {})}
+        self.max_body_size = int(policy['max_body_size'])
+        self.head_size = int(policy['head_size'])
+        self.tail_size = int(policy['tail_size'])
+        self.spill = spill if policy['spill_to_cos'] else None
+        self.logger = logger or logging.getLogger(__name__)
+
+    @classmethod
+    def validate_policy(cls, policy) -> Optional[str]:
+        """
+        校验采集策略
+        :param policy: 采集策略
+        :return: 错误信息，校验通过时返回 None
+        """
+        if not isinstance(policy, dict):
+            return "采集策略必须为对象"
+
+        unknown_keys = set(policy) - set(cls.DEFAULT_POLICY)
+        if unknown_keys:
+            return f"不支持的采集策略配置: {', '.join(sorted(unknown_keys))}"
+
+        for key in ('max_body_size', 'head_size', 'tail_size'):
+            if key in policy and (not isinstance(policy[key], int) or isinstance(policy[key], bool) or policy[key] < 0):
+                return f"{key} 必须为非负整数"
+
+        merged = {**cls.DEFAULT_POLICY, **policy}
+        if merged['head_size'] + merged['tail_size'] > merged['max_body_size']:
+            return "head_size 与 tail_size 之和不能超过 max_body_size"
+
+        if not isinstance(merged['spill_to_cos'], bool):
+            return "spill_to_cos 必须为布尔值"
+
+        return None
+
+    def capture_step(self, stepResult: Dict[str, Any]):
+        """按策略截断步骤结果中的请求体和响应体（原地修改）"""
+        request = stepResult.get('request')
+        if isinstance(request, dict) and request.get('body'):
+            request['body'] = self.capture(request['body'])
+
+        response = stepResult.get('response')
+        if isinstance(response, dict) and response.get('body') is not None:
+            response['body'] = self.capture(response['body'])
+
+    def capture(self, body):
+        """
+        按策略采集 body
+        :param body: 原始 body（dict / list / str / bytes）
+        :return: 未超过上限时原样返回；超过上限时返回截断信息
+        """
+        if isinstance(body, bytes):
+            content = body
+        elif isinstance(body, str):
+            content = body.encode('utf-8')
+        else:
+            try:
+                content = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            except (TypeError, ValueError):
+                content = str(body).encode('utf-8')
+
+        if len(content) <= self.max_body_size:
+            return body
+
+        sha256 = hashlib.sha256(content).hexdigest()
+        captured = {
+            'truncated': True,
+            'size': len(content),
+            'sha256': sha256,
+            'head': content[:self.head_size].decode('utf-8', errors='ignore'),
+            'tail': content[len(content) - self.tail_size:].decode('utf-8', errors='ignore') if self.tail_size else ''
+        }
+
+        if self.spill:
+            try:
+                captured['full_body_url'] = self.spill(content, sha256)
+            except Exception as e:
+                self.logger.warning(f"完整 body 转存失败: {sha256}, 错误: {e}")
+
+        return captured
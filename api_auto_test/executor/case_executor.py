@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+接口测试用例执行器
+基于 YAMLTestRunner 执行 YAML 中的用例，收集每个步骤的详细请求/响应信息
+支持串行执行，也支持按线程池并发执行同一套件内互不依赖的用例
+load 类型的压测步骤由 LoadStepExecutor 执行
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Tuple
+
+from .body_capture import BodyCapture
+from .http_client import get_runner_session
+from .load_step_executor import LoadStepExecutor
+from .step_timing import SessionRequestTimer
+from .suite_runner import SuiteRunner
+
+
+class CaseExecutor:
+    """用例执行器"""
+
+    # 单次执行允许的最大并发数，避免单个 worker 创建过多线程
+    MAX_CONCURRENCY = 20
+
+    def __init__(self, runner, logger=None, body_capture=None):
+        """
+        :param runner: YAMLTestRunner 实例
+        :param logger: 日志对象，默认使用模块日志
+        :param body_capture: BodyCapture 实例，为空时使用默认采集策略
+        """
+        self.runner = runner
+        self.logger = logger or logging.getLogger(__name__)
+        self.body_capture = body_capture or BodyCapture(logger=self.logger)
+        # 并发执行时每个工作线程独占的 runner 副本
+        self.thread_local = threading.local()
+
+    def run_cases(self, cases: List[Dict], concurrency: int = 1) -> List[Dict[str, Any]]:
+        """
+        执行用例列表
+        返回结果的顺序与 cases 顺序一致，与并发数无关
+        :param cases: 用例列表
+        :param concurrency: 并发数，1 表示串行执行
+        :return: 用例执行结果列表
+        """
+        caseResults = [None] * len(cases)
+        for index, caseResult in self.iter_cases(cases, concurrency):
+            caseResults[index] = caseResult
+        return caseResults
+
+    def iter_cases(self, cases: List[Dict], concurrency: int = 1) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        执行用例列表，每完成一个用例产出一次 (用例序号, 用例执行结果)
+        并发执行时按完成顺序产出，调用方需按用例序号排序；
+        调用方可边执行边持久化结果，不必在内存中保留整个套件的结果
+        :param cases: 用例列表
+        :param concurrency: 并发数，1 表示串行执行
+        :return: (用例在 cases 中的序号, 用例执行结果) 迭代器
+        """
+        concurrency = self.normalize_concurrency(concurrency, len(cases))
+
+        if concurrency == 1:
+            for index, case in enumerate(cases):
+                yield index, self.run_case(self.runner, case)
+            return
+
+        self.logger.info(f"并发执行用例，并发数: {concurrency}")
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='api_test_case') as pool:
+            # 按完成顺序产出，耗时较长的用例不会阻塞其后已完成用例的持久化和进度更新
+            futures = {
+                pool.submit(lambda case=case: self.run_case(self.fork_runner(), case)): index
+                for index, case in enumerate(cases)
+            }
+            for future in as_completed(futures):
+                yield futures.pop(future), future.result()
+
+    @classmethod
+    def normalize_concurrency(cls, concurrency, case_count: int) -> int:
+        """将并发数限制在 [1, min(MAX_CONCURRENCY, 用例数)] 范围内"""
+        try:
+            concurrency = int(concurrency or 1)
+        except (TypeError, ValueError):
+            concurrency = 1
+        return max(1, min(concurrency, cls.MAX_CONCURRENCY, case_count or 1))
+
+    def fork_runner(self):
+        """
+        获取当前工作线程的 runner 副本（每个线程首次调用时复制一份）
+        会话、缓存等状态按线程独立，避免线程间共享 requests 会话；var_handler 在每个用例开始时重建
+        """
+        runner = getattr(self.thread_local, 'runner', None)
+        if runner is None:
+            runner = SuiteRunner.copy_runner(self.runner)
+            self.thread_local.runner = runner
+        return runner
+
+    def run_case(self, runner, case: Dict) -> Dict[str, Any]:
+        """
+        执行单个用例
+        :param runner: YAMLTestRunner 实例
+        :param case: 用例数据
+        :return: 用例执行结果，格式见 HtmlReportGenerator.add_case_result
+        """
+        caseId = case.get('case', 'UNKNOWN')
+        caseName = case.get('name', caseId)
+
+        self.logger.info(f"执行用例: {caseId} - {caseName}")
+
+        caseStart = time.time()
+        caseResult = {
+            'case_id': caseId,
+            'case_name': caseName,
+            'status': 'PASS',
+            'duration': 0,
+            'error_message': '',
+            'steps': []
+        }
+
+        try:
+            runner.var_handler = runner.var_handler.__class__(runner.config)
+
+            for step in case.get('steps', []):
+                stepResult = self.run_step(runner, step)
+                self.body_capture.capture_step(stepResult)
+                caseResult['steps'].append(stepResult)
+
+                if stepResult['status'] != 'PASS':
+                    caseResult['status'] = 'FAIL'
+                    caseResult['error_message'] = f"{stepResult['name']}: {stepResult['error_message']}"
+                    break
+
+        except Exception as e:
+            caseResult['status'] = 'FAIL'
+            caseResult['error_message'] = str(e)
+            self.logger.error(f"用例执行异常: {caseId}, 错误: {e}")
+
+        caseResult['duration'] = time.time() - caseStart
+        return caseResult
+
+    def run_step(self, runner, step: Dict) -> Dict[str, Any]:
+        """
+        执行单个步骤
+        :param runner: YAMLTestRunner 实例
+        :param step: 步骤数据
+        :return: 步骤执行结果
+        """
+        stepName = step.get('name', 'unknown_step')
+        stepType = step.get('type', 'http_request')
+
+        if stepType == 'load':
+            return LoadStepExecutor().run(runner, step)
+
+        stepResult = {
+            'name': stepName,
+            'status': 'PASS',
+            'error_message': '',
+            'request': {},
+            'response': {}
+        }
+
+        try:
+            requestConfig = runner.var_handler.replace_variables(step.get('request', {}))
+
+            method = requestConfig.get('method', 'GET')
+            endpoint = requestConfig.get('endpoint', '')
+            fullUrl = runner.config.get('base_url', '') + endpoint
+
+            stepResult['request'] = {
+                'method': method,
+                'url': fullUrl,
+                'headers': requestConfig.get('headers', {}),
+                'body': requestConfig.get('body', {})
+            }
+
+            # 通过会话的 response 钩子记录请求耗时（runner 没有 requests 会话时不记录）
+            session = get_runner_session(runner)
+            requestTimer = SessionRequestTimer.attach(session) if session is not None else None
+            if requestTimer:
+                requestTimer.reset()
+
+            if stepType == 'polling':
+                success, stepResponse, error = runner.execute_polling(step)
+            elif stepType == 'repeat':
+                success, stepResponse, error = runner.execute_repeat(step)
+            else:
+                success, stepResponse, error = runner.execute_step(step)
+
+            if requestTimer and requestTimer.timings():
+                stepResult['timings'] = requestTimer.timings()
+
+            # 无论成功失败都记录响应信息
+            if stepResponse:
+                if isinstance(stepResponse, dict):
+                    stepResult['response'] = {
+                        'status_code': stepResponse.get('status_code', 0),
+                        'body': stepResponse.get('data', stepResponse)
+                    }
+                else:
+                    stepResult['response'] = {
+                        'status_code': 0,
+                        'body': stepResponse
+                    }
+            else:
+                stepResult['response'] = {
+                    'status_code': 0,
+                    'body': None,
+                    'error': str(error) if error else '无响应'
+                }
+
+            if not success:
+                stepResult['status'] = 'FAIL'
+                stepResult['error_message'] = str(error) if error else '步骤执行失败'
+
+        except Exception as e:
+            stepResult['status'] = 'FAIL'
+            stepResult['error_message'] = str(e)
+            # 确保异常时也记录请求信息（如果还未记录）
+            if not stepResult['request']:
+                rawRequest = step.get('request', {})
+                stepResult['request'] = {
+                    'method': rawRequest.get('method', 'GET'),
+                    'url': runner.config.get('base_url', '') + rawRequest.get('endpoint', ''),
+                    'headers': rawRequest.get('headers', {}),
+                    'body': rawRequest.get('body', {})
+                }
+            # 记录异常响应
+            stepResult['response'] = {
+                'status_code': 0,
+                'body': None,
+                'error': str(e)
+            }
+
+        return stepResult
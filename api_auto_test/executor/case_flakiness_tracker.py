@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+用例稳定性统计
+执行结束时将每个用例的通过/失败结果移入 (测试用例, 环境, 用例编号) 的结果位图（最近 64 次），
+并根据位图中通过/失败的切换次数计算不稳定分数，查询时直接按分数排序，无需扫描历史报告
+"""
+import logging
+from typing import Any, Dict
+
+from django.db import transaction
+from django.utils import timezone
+
+from api_auto_test.models import ApiTestCaseFlakinessModel
+
+
+class CaseFlakinessTracker:
+    """用例稳定性统计器"""
+
+    # 位图保留的最近结果数
+    WINDOW_SIZE = 64
+    WINDOW_MASK = (1 << WINDOW_SIZE) - 1
+
+    def __init__(self, execution_id: int, project_id: int, test_case_id: int, env_id: int, logger=None):
+        """
+        :param execution_id: 执行记录 ID
+        :param project_id: 项目 ID
+        :param test_case_id: 测试用例 ID
+        :param env_id: 环境配置 ID
+        :param logger: 日志对象，默认使用模块日志
+        """
+        self.execution_id = execution_id
+        self.project_id = project_id
+        self.test_case_id = test_case_id
+        self.env_id = env_id
+        self.logger = logger or logging.getLogger(__name__)
+        # case_id -> (case_name, 是否失败)，同一用例编号重复出现时以最后一次为准
+        self.outcomes: Dict[str, tuple] = {}
+
+    def add(self, case_result: Dict[str, Any]):
+        """
+        记录一个用例的执行结果
+        :param case_result: 用例执行结果，格式见 HtmlReportGenerator.add_case_result
+        """
+        case_id = str(case_result.get('case_id', 'UNKNOWN'))[:255]
+        self.outcomes[case_id] = (case_result.get('case_name'), case_result.get('status') != 'PASS')
+
+    def flush(self):
+        """将本次执行的用例结果合并到稳定性统计"""
+        if not self.outcomes:
+            return
+
+        with transaction.atomic():
+            existing = {
+                item.case_id: item
+                for item in ApiTestCaseFlakinessModel.objects.select_for_update().filter(
+                    test_case_id=self.test_case_id,
+                    env_id=self.env_id,
+                    case_id__in=list(self.outcomes)
+                )
+            }
+
+            now = timezone.now()
+            to_update = []
+            to_create = []
+            for case_id, (case_name, failed) in self.outcomes.items():
+                item = existing.get(case_id)
+                if item is None:
+                    item = ApiTestCaseFlakinessModel(
+                        project_id=self.project_id,
+                        test_case_id=self.test_case_id,
+                        env_id=self.env_id,
+                        case_id=case_id
+                    )
+                    to_create.append(item)
+                else:
+                    to_update.append(item)
+
+                item.case_name = case_name
+                item.outcome_bits = ((item.outcome_bits << 1) | int(failed)) & self.WINDOW_MASK
+                item.window_size = min(item.window_size + 1, self.WINDOW_SIZE)
+                item.run_count += 1
+                item.fail_count += int(failed)
+                item.flakiness_score = self.score(item.outcome_bits, item.window_size)
+                item.last_execution_id = self.execution_id
+                # bulk_update 不会触发 auto_now
+                item.updated_at = now
+
+            if to_update:
+                ApiTestCaseFlakinessModel.objects.bulk_update(to_update, [
+                    'case_name', 'outcome_bits', 'window_size', 'run_count',
+                    'fail_count', 'flakiness_score', 'last_execution_id', 'updated_at'
+                ], batch_size=500)
+            if to_create:
+                # 并发执行同时创建同一用例时以先写入的为准，本次结果丢弃
+                ApiTestCaseFlakinessModel.objects.bulk_create(to_create, batch_size=500, ignore_conflicts=True)
+
+        self.logger.info(
+            f"执行记录 {self.execution_id} 用例稳定性已更新: 更新 {len(to_update)} 个, 新增 {len(to_create)} 个"
+        )
+        self.outcomes = {}
+
+    @classmethod
+    def score(cls, outcome_bits: int, window_size: int) -> float:
+        """
+        计算不稳定分数：最近 window_size 次结果中相邻两次结果不同的次数占比（0-100）
+        一直通过或一直失败为 0，通过/失败交替出现为 100
+        :param outcome_bits: 结果位图
+        :param window_size: 有效结果数
+        :return: 不稳定分数
+        """
+        if window_size < 2:
+            return 0.0
+        pair_mask = (1 << (window_size - 1)) - 1
+        flips = bin((outcome_bits ^ (outcome_bits >> 1)) & pair_mask).count('1')
+        return round(flips / (window_size - 1) * 100, 2)
+
+    @staticmethod
+    def recent_outcomes(outcome_bits: int, window_size: int) -> str:
+        """
+        将位图转换为结果序列字符串（由旧到新，P-通过, F-失败）
+        :param outcome_bits: 结果位图
+        :param window_size: 有效结果数
+        :return: 结果序列
+        """
+        return ''.join(
+            'F' if (outcome_bits >> offset) & 1 else 'P'
+            for offset in range(window_size - 1, -1, -1)
+        )
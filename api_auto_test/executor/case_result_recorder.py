@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+用例执行结果持久化
+用例执行完成后先放入缓冲区，每满一批 bulk_create 写入 api_test_case_result，
+同时累加执行记录上的通过/失败用例数，状态接口据此返回实时进度；
+写入后立即释放缓冲区，worker 不再在内存中保留整个套件的请求/响应数据
+"""
+import logging
+import os
+from typing import Any, Dict, Iterator, List
+
+from django.db.models import F
+
+from api_auto_test.models import ApiTestCaseResultModel, ApiTestExecutionModel
+
+
+class CaseResultRecorder:
+    """用例执行结果记录器（非线程安全，在调用 iter_cases 的线程中使用）"""
+
+    # 每批写入的用例数
+    BATCH_SIZE = int(os.environ.get('API_TEST_RESULT_BATCH_SIZE', 20))
+
+    def __init__(self, execution_id: int, index_offset: int = 0, logger=None):
+        """
+        :param execution_id: 执行记录 ID
+        :param index_offset: 用例序号偏移量（分片执行时为分片起始序号）
+        :param logger: 日志对象，默认使用模块日志
+        """
+        self.execution_id = execution_id
+        self.index_offset = index_offset
+        self.logger = logger or logging.getLogger(__name__)
+        self.buffer: List[ApiTestCaseResultModel] = []
+        self.recorded_count = 0
+
+    def add(self, index: int, case_result: Dict[str, Any]):
+        """
+        记录一个用例的执行结果，缓冲区满时写入数据库
+        :param index: 用例在本次执行的用例列表中的序号
+        :param case_result: 用例执行结果，格式见 HtmlReportGenerator.add_case_result
+        """
+        self.buffer.append(ApiTestCaseResultModel(
+            execution_id=self.execution_id,
+            case_index=self.index_offset + index,
+            case_id=str(case_result.get('case_id', 'UNKNOWN')),
+            case_name=case_result.get('case_name'),
+            status=ApiTestCaseResultModel.CaseStatus.PASS if case_result.get('status') == 'PASS' else ApiTestCaseResultModel.CaseStatus.FAIL,
+            duration=case_result.get('duration') or 0,
+            error_message=case_result.get('error_message') or '',
+            steps=case_result.get('steps') or []
+        ))
+
+        if len(self.buffer) >= self.BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """将缓冲区写入数据库并累加执行记录上的用例计数"""
+        if not self.buffer:
+            return
+
+        passedCases = sum(1 for item in self.buffer if item.status == ApiTestCaseResultModel.CaseStatus.PASS)
+        failedCases = len(self.buffer) - passedCases
+
+        ApiTestCaseResultModel.objects.bulk_create(self.buffer)
+        # 使用 F 表达式累加，多个分片并发写入时计数不会互相覆盖
+        ApiTestExecutionModel.objects.filter(id=self.execution_id).update(
+            passed_cases=F('passed_cases') + passedCases,
+            failed_cases=F('failed_cases') + failedCases
+        )
+
+        self.recorded_count += len(self.buffer)
+        self.logger.info(f"执行记录 {self.execution_id} 已写入 {self.recorded_count} 条用例结果")
+        self.buffer = []
+
+    @staticmethod
+    def reset(execution_id: int):
+        """清空执行记录已有的用例结果和计数（任务重试时从头执行）"""
+        ApiTestCaseResultModel.objects.filter(execution_id=execution_id).delete()
+        ApiTestExecutionModel.objects.filter(id=execution_id).update(
+            total_cases=0,
+            passed_cases=0,
+            failed_cases=0
+        )
+
+    @staticmethod
+    def add_total(execution_id: int, case_count: int):
+        """累加执行记录的总用例数（分片各自累加本分片的用例数）"""
+        ApiTestExecutionModel.objects.filter(id=execution_id).update(
+            total_cases=F('total_cases') + case_count
+        )
+
+    @staticmethod
+    def iter_results(execution_id: int) -> Iterator[Dict[str, Any]]:
+        """
+        按用例序号分批读取执行结果，转换为 HtmlReportGenerator.add_case_result 的格式
+        按 case_index 翻页（每批一次查询），MySQL 驱动不支持服务端游标，queryset.iterator 仍会一次加载全部结果
+        :param execution_id: 执行记录 ID
+        :return: 用例执行结果迭代器
+        """
+        lastIndex = -1
+        while True:
+            batch = list(
+                ApiTestCaseResultModel.objects
+                .filter(execution_id=execution_id, case_index__gt=lastIndex)
+                .order_by('case_index')[:CaseResultRecorder.BATCH_SIZE]
+            )
+            if not batch:
+                return
+            lastIndex = batch[-1].case_index
+            for item in batch:
+                yield {
+                    'case_id': item.case_id,
+                    'case_name': item.case_name,
+                    'status': 'PASS' if item.status == ApiTestCaseResultModel.CaseStatus.PASS else 'FAIL',
+                    'duration': item.duration,
+                    'error_message': item.error_message or '',
+                    'steps': item.steps or []
+                }
+            if len(batch) < CaseResultRecorder.BATCH_SIZE:
+                return
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+httpx 客户端管理
+一个 worker 进程内常驻一个事件循环线程，按 base_url 复用 keep-alive 的连接池（httpx.AsyncHTTPTransport），
+每个用例使用独立的短生命周期 httpx.AsyncClient，cookie 不会在用例、执行、用户之间串用
+"""
+import asyncio
+import os
+import threading
+from http.cookiejar import CookieJar
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+
+class AsyncClientPool:
+    """进程内共享的事件循环与按 base_url 复用的连接池"""
+
+    # 每个 base_url 的最大连接数与最大 keep-alive 连接数
+    MAX_CONNECTIONS = 100
+    MAX_KEEPALIVE_CONNECTIONS = 20
+
+    _lock = threading.Lock()
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _pid: Optional[int] = None
+    _transports: Dict[str, httpx.AsyncHTTPTransport] = {}
+
+    @classmethod
+    def get_loop(cls) -> asyncio.AbstractEventLoop:
+        """获取常驻事件循环，fork 出的子进程会重新创建"""
+        with cls._lock:
+            if cls._loop is None or cls._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='api_test_event_loop', daemon=True)
+                thread.start()
+                cls._loop = loop
+                cls._pid = os.getpid()
+                cls._transports = {}
+            return cls._loop
+
+    @classmethod
+    def run(cls, coroutine):
+        """在常驻事件循环中执行协程，阻塞等待结果"""
+        return asyncio.run_coroutine_threadsafe(coroutine, cls.get_loop()).result()
+
+    @classmethod
+    def get_transport(cls, base_url: str) -> httpx.AsyncHTTPTransport:
+        """获取 base_url 对应的共享连接池，只能在常驻事件循环中调用"""
+        transport = cls._transports.get(base_url)
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=cls.MAX_CONNECTIONS,
+                    max_keepalive_connections=cls.MAX_KEEPALIVE_CONNECTIONS
+                )
+            )
+            cls._transports[base_url] = transport
+        return transport
+
+    @classmethod
+    def create_client(cls, base_url: str, cookies: Optional[CookieJar] = None) -> httpx.AsyncClient:
+        """
+        创建用例独占的 AsyncClient，底层复用 base_url 的共享连接池，只能在常驻事件循环中调用
+        用完直接丢弃即可，不要调用 aclose（会关闭共享连接池）
+        :param base_url: Base URL
+        :param cookies: cookie 容器，传入 runner 会话的 cookie jar 时两种引擎读写同一份 cookie
+        :return: AsyncClient
+        """
+        return httpx.AsyncClient(
+            base_url=base_url,
+            transport=cls.get_transport(base_url),
+            cookies=cookies if cookies is not None else CookieJar(),
+            follow_redirects=True
+        )
+
+
+def get_runner_session(runner):
+    """获取 runner 的 requests 会话（没有时返回 None）"""
+    session = getattr(runner, 'session', None)
+    return session if isinstance(getattr(session, 'cookies', None), CookieJar) else None
+
+
+def build_http_request(runner, step: Dict) -> Tuple[str, str, str, Dict[str, Any], Dict[str, Any]]:
+    """
+    替换变量后构建 httpx 请求参数
+    :param runner: YAMLTestRunner 实例
+    :param step: 步骤数据
+    :return: (base_url, method, endpoint, httpx 请求参数, 报告中展示的请求信息)
+    """
+    requestConfig = runner.var_handler.replace_variables(step.get('request', {}))
+
+    method = str(requestConfig.get('method', 'GET')).upper()
+    endpoint = requestConfig.get('endpoint', '')
+    baseUrl = runner.config.get('base_url', '')
+    # runner 会话上的请求头（如登录后设置的认证头）优先级最低，步骤中的请求头优先级最高
+    session = get_runner_session(runner)
+    sessionHeaders = dict(session.headers) if session is not None else {}
+    headers = {**sessionHeaders, **(runner.config.get('headers') or {}), **(requestConfig.get('headers') or {})}
+    params = requestConfig.get('params')
+    body = requestConfig.get('body')
+
+    requestInfo = {
+        'method': method,
+        'url': baseUrl + endpoint,
+        'headers': headers,
+        'body': body or {}
+    }
+
+    requestKwargs = {
+        'headers': headers,
+        'params': params,
+        'timeout': runner.config.get('timeout') or 30
+    }
+    if session is not None and isinstance(session.auth, tuple):
+        requestKwargs['auth'] = session.auth
+    if isinstance(body, (dict, list)):
+        requestKwargs['json'] = body
+    elif body is not None:
+        requestKwargs['content'] = str(body)
+
+    return baseUrl, method, endpoint, requestKwargs, requestInfo
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+延迟直方图（HDR Histogram 风格的对数分桶）
+以微秒为单位记录延迟，每个 2 的幂区间等分为 64 个子桶，相对误差不超过 1/64，
+内存占用只与出现过的桶数有关，与请求数无关
+"""
+from typing import Dict, Iterable
+
+
+class LatencyHistogram:
+    """延迟直方图"""
+
+    # 子桶位数：小于 2^SUB_BUCKET_BITS 微秒的值精确记录，更大的值每个 2 的幂区间分为 2^(SUB_BUCKET_BITS-1) 个桶
+    SUB_BUCKET_BITS = 7
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.total_count = 0
+        self.min_value = None
+        self.max_value = None
+        self.sum_value = 0
+
+    @classmethod
+    def bucket_index(cls, value: int) -> int:
+        """计算值所在的桶序号"""
+        if value < (1 << cls.SUB_BUCKET_BITS):
+            return value
+        shift = value.bit_length() - cls.SUB_BUCKET_BITS
+        return (shift << (cls.SUB_BUCKET_BITS - 1)) + (value >> shift)
+
+    @classmethod
+    def bucket_range(cls, index: int):
+        """计算桶对应的取值区间 [lower, upper]"""
+        if index < (1 << cls.SUB_BUCKET_BITS):
+            return index, index
+        shift = (index >> (cls.SUB_BUCKET_BITS - 1)) - 1
+        mantissa = index - (shift << (cls.SUB_BUCKET_BITS - 1))
+        lower = mantissa << shift
+        return lower, lower + (1 << shift) - 1
+
+    def record(self, seconds: float):
+        """
+        记录一次延迟
+        :param seconds: 延迟（秒）
+        """
+        value = max(0, int(seconds * 1_000_000))
+        index = self.bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total_count += 1
+        self.sum_value += value
+        self.min_value = value if self.min_value is None else min(self.min_value, value)
+        self.max_value = value if self.max_value is None else max(self.max_value, value)
+
+    def merge(self, other: "LatencyHistogram"):
+        """合并另一个直方图"""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += other.total_count
+        self.sum_value += other.sum_value
+        if other.min_value is not None:
+            self.min_value = other.min_value if self.min_value is None else min(self.min_value, other.min_value)
+            self.max_value = other.max_value if self.max_value is None else max(self.max_value, other.max_value)
+
+    def percentile(self, percent: float) -> float:
+        """
+        计算百分位延迟
+        :param percent: 百分位，如 99 表示 p99
+        :return: 延迟（毫秒），无数据时返回 0
+        """
+        if not self.total_count:
+            return 0
+
+        target = max(1, int(self.total_count * percent / 100 + 0.5))
+        accumulated = 0
+        for index in sorted(self.counts):
+            accumulated += self.counts[index]
+            if accumulated >= target:
+                lower, upper = self.bucket_range(index)
+                # 取桶中点，并限制在实际观测到的最小值和最大值之间
+                return max(min((lower + upper) / 2, self.max_value), self.min_value) / 1000
+        return self.max_value / 1000
+
+    def summary(self, percents: Iterable[float] = (50, 90, 99)) -> Dict[str, float]:
+        """
+        汇总延迟统计
+        :return: {"min": ..., "mean": ..., "p50": ..., "max": ...}，单位毫秒
+        """
+        result = {
+            'min': round((self.min_value or 0) / 1000, 3),
+            'mean': round(self.sum_value / self.total_count / 1000, 3) if self.total_count else 0
+        }
+        for percent in percents:
+            result[f"p{percent:g}"] = round(self.percentile(percent), 3)
+        result['max'] = round((self.max_value or 0) / 1000, 3)
+        return result
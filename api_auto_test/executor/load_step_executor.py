@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+压测步骤（type: load）执行器
+在常驻事件循环中按目标 RPS 或固定并发数持续发送同一个请求，延迟记录到 LatencyHistogram，
+输出 p50/p90/p99、错误率和实际 RPS
+
+步骤示例：
+- name: 压测查询接口
+  type: load
+  request:
+    method: GET
+    endpoint: /v1/links
+  load:
+    duration: 30          # 持续时间（秒）
+    rps: 50               # 目标 RPS（开环模型），与 concurrency 二选一
+    concurrency: 10       # 固定并发数（闭环模型）；指定 rps 时为最大在途请求数
+    expect_status: [200]  # 视为成功的状态码，默认 < 400
+    max_error_rate: 0.01  # 可选阈值，超过时步骤失败
+    max_p99_ms: 500       # 可选阈值，超过时步骤失败
+"""
+import asyncio
+from typing import Any, Dict
+
+import httpx
+
+from .http_client import AsyncClientPool, build_http_request
+from .latency_histogram import LatencyHistogram
+
+
+class LoadStepExecutor:
+    """压测步骤执行器"""
+
+    # 单个压测步骤允许的最大持续时间（秒）、最大 RPS 和最大并发数
+    MAX_DURATION = 600
+    MAX_RPS = 2000
+    MAX_CONCURRENCY = 500
+
+    def run(self, runner, step: Dict) -> Dict[str, Any]:
+        """在同步执行器中调用：提交到常驻事件循环并阻塞等待"""
+        return AsyncClientPool.run(self.run_async(runner, step))
+
+    async def run_async(self, runner, step: Dict) -> Dict[str, Any]:
+        """
+        执行压测步骤
+        :param runner: YAMLTestRunner 实例
+        :param step: 步骤数据
+        :return: 步骤执行结果，压测统计位于 load 字段，同时作为响应体展示
+        """
+        stepResult = {
+            'name': step.get('name', 'unknown_step'),
+            'status': 'PASS',
+            'error_message': '',
+            'request': {},
+            'response': {}
+        }
+
+        try:
+            loadConfig = step.get('load') or {}
+            baseUrl, method, endpoint, requestKwargs, stepResult['request'] = build_http_request(runner, step)
+
+            duration = min(float(loadConfig.get('duration', 10)), self.MAX_DURATION)
+            rps = min(float(loadConfig['rps']), self.MAX_RPS) if loadConfig.get('rps') else None
+            concurrency = max(1, min(int(loadConfig.get('concurrency') or 10), self.MAX_CONCURRENCY))
+            expectStatus = loadConfig.get('expect_status')
+
+            stats = {
+                'mode': 'rps' if rps else 'concurrency',
+                'target_rps': rps,
+                'concurrency': concurrency,
+                'duration': duration,
+                'total_requests': 0,
+                'error_count': 0,
+                'status_codes': {}
+            }
+            histogram = LatencyHistogram()
+
+            # 压测使用独立的连接池，避免占满普通用例共用的连接
+            async with httpx.AsyncClient(
+                base_url=baseUrl,
+                limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+                follow_redirects=True
+            ) as client:
+                loop = asyncio.get_running_loop()
+
+                async def sendRequest(intendedStart: float):
+                    statusKey = 'error'
+                    try:
+                        httpResponse = await client.request(method, endpoint, **requestKwargs)
+                        statusKey = str(httpResponse.status_code)
+                        if expectStatus:
+                            success = httpResponse.status_code in expectStatus
+                        else:
+                            success = httpResponse.status_code < 400
+                    except httpx.HTTPError:
+                        success = False
+                    # 延迟从计划发送时间开始计算，避免目标服务变慢时压测端少发请求导致的延迟低估
+                    histogram.record(loop.time() - intendedStart)
+                    stats['total_requests'] += 1
+                    stats['status_codes'][statusKey] = stats['status_codes'].get(statusKey, 0) + 1
+                    if not success:
+                        stats['error_count'] += 1
+
+                loadStart = loop.time()
+                deadline = loadStart + duration
+
+                if rps:
+                    # 开环模型：按固定间隔计划请求，在途请求数不超过 concurrency
+                    semaphore = asyncio.Semaphore(concurrency)
+                    pending = set()
+
+                    async def sendWithLimit(intendedStart: float):
+                        try:
+                            await sendRequest(intendedStart)
+                        finally:
+                            semaphore.release()
+
+                    requestIndex = 0
+                    while True:
+                        intendedStart = loadStart + requestIndex / rps
+                        if intendedStart >= deadline:
+                            break
+                        delay = intendedStart - loop.time()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                        await semaphore.acquire()
+                        task = asyncio.ensure_future(sendWithLimit(intendedStart))
+                        pending.add(task)
+                        task.add_done_callback(pending.discard)
+                        requestIndex += 1
+
+                    if pending:
+                        await asyncio.gather(*pending)
+                else:
+                    # 闭环模型：concurrency 个并发循环持续发送，直到持续时间结束
+                    async def worker():
+                        while loop.time() < deadline:
+                            await sendRequest(loop.time())
+
+                    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+                elapsed = loop.time() - loadStart
+
+            stats['elapsed'] = round(elapsed, 3)
+            stats['achieved_rps'] = round(stats['total_requests'] / elapsed, 2) if elapsed > 0 else 0
+            stats['error_rate'] = round(stats['error_count'] / stats['total_requests'], 4) if stats['total_requests'] else 0
+            stats['latency_ms'] = histogram.summary()
+
+            stepResult['load'] = stats
+            stepResult['response'] = {
+                'status_code': 200 if stats['error_count'] < stats['total_requests'] else 0,
+                'body': stats
+            }
+
+            error = self.check_thresholds(loadConfig, stats)
+            if error:
+                stepResult['status'] = 'FAIL'
+                stepResult['error_message'] = error
+
+        except Exception as e:
+            stepResult['status'] = 'FAIL'
+            stepResult['error_message'] = str(e)
+            stepResult['response'] = {
+                'status_code': 0,
+                'body': None,
+                'error': str(e)
+            }
+
+        return stepResult
+
+    @staticmethod
+    def check_thresholds(loadConfig: Dict, stats: Dict) -> str:
+        """
+        检查压测阈值
+        :return: 错误信息，未超过阈值时返回空字符串
+        """
+        if not stats['total_requests']:
+            return '压测期间未完成任何请求'
+
+        errors = []
+        maxErrorRate = loadConfig.get('max_error_rate')
+        if maxErrorRate is not None and stats['error_rate'] > float(maxErrorRate):
+            errors.append(f"错误率 {stats['error_rate']:.2%} 超过阈值 {float(maxErrorRate):.2%}")
+
+        for percent in (50, 90, 99):
+            threshold = loadConfig.get(f"max_p{percent}_ms")
+            actual = stats['latency_ms'][f"p{percent}"]
+            if threshold is not None and actual > float(threshold):
+                errors.append(f"p{percent} 延迟 {actual}ms 超过阈值 {threshold}ms")
+
+        return '; '.join(errors)
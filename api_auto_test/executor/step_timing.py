@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+请求网络耗时
+RequestTimer 通过 httpx 的 trace 扩展记录 httpcore 各阶段事件的时间点（异步引擎），拆分出
+连接（含 DNS 解析，httpcore 不单独上报 DNS 事件）、TLS 握手、发送、首字节、下载耗时；
+复用 keep-alive 连接的请求没有连接和 TLS 阶段，对应耗时为 0
+
+SessionRequestTimer 通过 requests 会话的 response 钩子记录 runner 发出的请求（同步引擎），
+requests 不上报连接阶段事件，只能拆分出首字节（含连接、TLS、发送）、下载和总耗时，其余阶段为 None
+
+StepTimingAggregator 按接口汇总一次执行中各阶段耗时的 min / avg / p95，没有采样的阶段不出现在汇总中
+"""
+import re
+import time
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+from .latency_histogram import LatencyHistogram
+
+
+class RequestTimer:
+    """单个请求的耗时记录器，作为 httpx 请求的 trace 扩展使用"""
+
+    # 阶段 -> (开始事件, 结束事件)，事件名省略 http11 / http2 协议前缀
+    PHASES = {
+        'connect': ('connection.connect_tcp.started', 'connection.connect_tcp.complete'),
+        'tls': ('connection.start_tls.started', 'connection.start_tls.complete'),
+        'send': ('send_request_headers.started', 'send_request_body.complete'),
+        'ttfb': ('send_request_body.complete', 'receive_response_headers.complete'),
+        'download': ('receive_response_body.started', 'receive_response_body.complete'),
+    }
+
+    def __init__(self):
+        self.events: Dict[str, float] = {}
+        self.started_at = time.perf_counter()
+
+    async def trace(self, event_name: str, info: Dict[str, Any]):
+        """httpx trace 回调，只记录每个事件第一次出现的时间"""
+        for prefix in ('http11.', 'http2.'):
+            if event_name.startswith(prefix):
+                event_name = event_name[len(prefix):]
+                break
+        self.events.setdefault(event_name, time.perf_counter())
+
+    def timings(self) -> Dict[str, Optional[float]]:
+        """
+        计算各阶段耗时
+        :return: {"connect": ..., "tls": ..., "send": ..., "ttfb": ..., "download": ..., "total": ...}，单位毫秒
+        """
+        # 读取响应体的结束事件在 response.aclose 时才上报，未收到时以当前时间为准
+        finishedAt = self.events.get('response_closed.complete') or time.perf_counter()
+
+        result: Dict[str, Optional[float]] = {}
+        for phase, (startEvent, endEvent) in self.PHASES.items():
+            start = self.events.get(startEvent)
+            end = self.events.get(endEvent)
+            if phase == 'download' and start is not None and end is None:
+                end = finishedAt
+            result[phase] = round((end - start) * 1000, 3) if start is not None and end is not None else 0
+        result['total'] = round((finishedAt - self.started_at) * 1000, 3)
+        return result
+
+
+class SessionRequestTimer:
+    """
+    runner 的 requests 会话的耗时记录器，安装为会话的 response 钩子
+    每个 runner 副本的会话各自安装一个（runner 副本同一时间只在一个线程中使用），记录当前步骤中最后一个响应的耗时
+    """
+
+    # 记录器在会话上的属性名
+    SESSION_ATTR = '_api_test_request_timer'
+
+    def __init__(self):
+        self.last_timings: Optional[Dict[str, Optional[float]]] = None
+
+    @classmethod
+    def attach(cls, session) -> 'SessionRequestTimer':
+        """
+        获取会话上的记录器，首次调用时安装 response 钩子
+        :param session: requests.Session
+        :return: SessionRequestTimer
+        """
+        timer = getattr(session, cls.SESSION_ATTR, None)
+        if timer is None:
+            timer = cls()
+            session.hooks.setdefault('response', []).append(timer.on_response)
+            setattr(session, cls.SESSION_ATTR, timer)
+        return timer
+
+    def reset(self):
+        """开始记录一个步骤"""
+        self.last_timings = None
+
+    def on_response(self, response, *args, **kwargs):
+        """
+        requests response 钩子，在响应头收到后、读取响应体前调用
+        非流式请求在此读取响应体（requests 随后也会立即读取），以拆分出下载耗时
+        """
+        ttfb = response.elapsed.total_seconds() * 1000
+        download = 0.0
+        if not kwargs.get('stream'):
+            downloadStart = time.perf_counter()
+            response.content
+            download = (time.perf_counter() - downloadStart) * 1000
+
+        self.last_timings = {
+            'connect': None,
+            'tls': None,
+            'send': None,
+            'ttfb': round(ttfb, 3),
+            'download': round(download, 3),
+            'total': round(ttfb + download, 3)
+        }
+
+    def timings(self) -> Optional[Dict[str, Optional[float]]]:
+        """
+        :return: 当前步骤最后一个响应的耗时（单位毫秒），没有发出请求时返回 None
+        """
+        return self.last_timings
+
+
+class StepTimingAggregator:
+    """按接口汇总步骤网络耗时"""
+
+    PHASES = ('connect', 'tls', 'send', 'ttfb', 'download', 'total')
+
+    # 路径中的数字 ID、UUID、长十六进制串归一为占位符，避免同一接口因参数不同被拆成多组
+    ID_SEGMENT_PATTERN = re.compile(r'^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-fA-F]{24,})$')
+
+    def __init__(self):
+        # endpoint -> phase -> LatencyHistogram
+        self.histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+
+    @classmethod
+    def endpoint_key(cls, method: str, url: str) -> str:
+        """生成接口标识，如 GET /v1/links/{id}"""
+        path = urlsplit(url or '').path or '/'
+        segments = ['{id}' if cls.ID_SEGMENT_PATTERN.match(segment) else segment for segment in path.split('/')]
+        return f"{(method or 'GET').upper()} {'/'.join(segments)}"
+
+    def add_steps(self, steps: Iterable[Dict[str, Any]]):
+        """汇总一个用例中带有 timings 的步骤"""
+        for step in steps:
+            timings = step.get('timings')
+            if not timings:
+                continue
+
+            request = step.get('request') or {}
+            endpoint = self.endpoint_key(request.get('method'), request.get('url'))
+            phaseHistograms = self.histograms.setdefault(endpoint, {})
+            for phase in self.PHASES:
+                # 未测量的阶段（如同步引擎的连接、TLS 阶段）不计入
+                if timings.get(phase) is None:
+                    continue
+                phaseHistograms.setdefault(phase, LatencyHistogram()).record(timings[phase] / 1000)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        :return: {"GET /v1/links": {"count": 10, "ttfb": {"min": ..., "avg": ..., "p95": ...}, ...}}，单位毫秒，
+                 只包含有采样的阶段
+        """
+        result = {}
+        for endpoint, phaseHistograms in self.histograms.items():
+            if 'total' not in phaseHistograms:
+                continue
+            item: Dict[str, Any] = {'count': phaseHistograms['total'].total_count}
+            for phase, histogram in phaseHistograms.items():
+                stats = histogram.summary(percents=(95,))
+                item[phase] = {'min': stats['min'], 'avg': stats['mean'], 'p95': stats['p95']}
+            result[endpoint] = item
+        return result
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+测试套件 runner 构建
+测试用例 YAML 按文件只下载、解析一次（见 TestCaseFileCache），缓存为 SuiteDefinition；
+SuiteDefinition 按环境配置缓存已初始化的 runner 原型，每次执行复制原型，
+同一文件版本、同一环境的重复执行不再写文件、不再解析 YAML，也不切换进程工作目录
+
+YAMLTestRunner 只提供以文件路径初始化的接口，且初始化时会根据 config 派生状态（如会话、请求头），
+因此每个 (文件版本, 环境配置) 首次使用时仍需将叠加环境配置后的 YAML 写入临时文件交给 runner 初始化
+"""
+import copy
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+import yaml
+
+
+class SuiteDefinition:
+    """
+    测试套件定义：YAML 解析结果与按环境配置缓存的 runner 原型
+    作为 TestCaseFileCache 的缓存值，文件 ETag 变化时整体失效
+    """
+
+    # 每个文件最多缓存的环境配置数
+    MAX_PROTOTYPES = int(os.environ.get('API_TEST_RUNNER_PROTOTYPES', 8))
+
+    def __init__(self, yaml_path: str):
+        """
+        :param yaml_path: 本地 YAML 文件路径
+        """
+        with open(yaml_path, 'r', encoding='utf-8') as f:
+            self.data: Dict[str, Any] = yaml.safe_load(f) or {}
+        self._lock = threading.Lock()
+        # 环境配置摘要 -> runner 原型
+        self._prototypes: "OrderedDict[str, Any]" = OrderedDict()
+
+    def get_runner(self, overlay: Dict[str, Any]):
+        """
+        获取叠加环境配置后的 runner，每次调用返回独立的副本
+        :param overlay: 环境配置覆盖项
+        :return: YAMLTestRunner 实例
+        """
+        digest = hashlib.sha256(
+            json.dumps(overlay, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+        ).hexdigest()
+
+        with self._lock:
+            prototype = self._prototypes.get(digest)
+            if prototype is None:
+                prototype = SuiteRunner.create_runner(SuiteRunner.merge_config(self.data, overlay))
+                self._prototypes[digest] = prototype
+                while len(self._prototypes) > self.MAX_PROTOTYPES:
+                    self._prototypes.popitem(last=False)
+            else:
+                self._prototypes.move_to_end(digest)
+
+        return SuiteRunner.copy_runner(prototype)
+
+
+class SuiteRunner:
+    """测试套件 runner 构建工具"""
+
+    # 步骤中引用本地文件的请求字段，相对路径按 runner 目录解析
+    FILE_REFERENCE_KEYS = ('files',)
+
+    @staticmethod
+    def get_runner_class():
+        """获取 YAMLTestRunner 类"""
+        from src.test_cases_parser import YAMLTestRunner  # type: ignore
+
+        return YAMLTestRunner
+
+    @staticmethod
+    def load_definition(yaml_path: str) -> SuiteDefinition:
+        """
+        解析 YAML 文件，作为 TestCaseFileCache 的 loader
+        :param yaml_path: 本地 YAML 文件路径
+        :return: SuiteDefinition（在多次执行间共享）
+        """
+        return SuiteDefinition(yaml_path)
+
+    @staticmethod
+    def build_overlay(environment) -> Dict[str, Any]:
+        """
+        将环境配置转换为 config 覆盖项
+        :param environment: ApiTestEnvironmentModel 实例
+        :return: 覆盖到 YAML config 上的配置
+        """
+        overlay = {'base_url': environment.base_url}
+        if environment.timeout:
+            overlay['timeout'] = environment.timeout
+        if environment.headers:
+            overlay['headers'] = environment.headers
+
+        # 合并环境变量到 config
+        if environment.variables:
+            overlay.update(environment.variables)
+
+        return overlay
+
+    @staticmethod
+    def merge_config(yaml_data: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        返回叠加环境配置后的 YAML 数据副本，原数据不被修改
+        :param yaml_data: YAML 解析结果
+        :param overlay: 环境配置覆盖项
+        :return: 新的 YAML 数据
+        """
+        merged = copy.deepcopy(yaml_data)
+        config = merged.get('config') or {}
+        config.update(overlay)
+        merged['config'] = config
+        return merged
+
+    @classmethod
+    def create_runner(cls, yaml_data: Dict[str, Any]):
+        """
+        由 YAML 数据初始化 runner
+        YAMLTestRunner 只接受文件路径，数据写入临时文件，初始化完成后删除
+        :param yaml_data: 已叠加环境配置的 YAML 数据
+        :return: YAMLTestRunner 实例
+        """
+        work_dir = tempfile.mkdtemp(prefix='api_test_suite_')
+        try:
+            yaml_path = os.path.join(work_dir, 'suite.yaml')
+            with open(yaml_path, 'w', encoding='utf-8') as f:
+                yaml.dump(yaml_data, f, allow_unicode=True, default_flow_style=False)
+            return cls.get_runner_class()(yaml_path)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    @staticmethod
+    def copy_runner(runner):
+        """
+        复制 runner 供另一次执行、另一个线程或用例使用
+        除用例数据（只读，可能很大）外全部深拷贝，会话（cookie、认证头、连接池）、缓存等状态互不共享，
+        var_handler 基于副本的 config 重新创建
+        :param runner: YAMLTestRunner 实例
+        :return: YAMLTestRunner 副本
+        """
+        cases = runner.get_cases()
+        runner_copy = copy.deepcopy(runner, {id(cases): cases})
+        runner_copy.var_handler = runner_copy.var_handler.__class__(runner_copy.config)
+        return runner_copy
+
+    @classmethod
+    def resolve_file_references(cls, cases: List[Dict], base_dir: str) -> List[Dict]:
+        """
+        将步骤中引用的相对文件路径转换为 base_dir 下的绝对路径
+        不切换进程工作目录，YAML 中的相对路径需按 runner 目录解析；返回新的用例列表，原数据不被修改
+        :param cases: 用例列表
+        :param base_dir: 相对路径的基准目录
+        :return: 用例列表
+        """
+        def resolve(value):
+            if isinstance(value, str) and value and not os.path.isabs(value):
+                return os.path.join(base_dir, value)
+            if isinstance(value, (list, tuple)) and value:
+                # files 也可以写成 [路径, 类型] 形式
+                return [resolve(value[0]), *value[1:]]
+            return value
+
+        def has_references(case):
+            return any(isinstance((step.get('request') or {}).get(key), dict)
+                       for step in case.get('steps') or [] for key in cls.FILE_REFERENCE_KEYS)
+
+        resolved_cases = []
+        for case in cases:
+            if has_references(case):
+                case = copy.deepcopy(case)
+                for step in case['steps']:
+                    request = step.get('request') or {}
+                    for key in cls.FILE_REFERENCE_KEYS:
+                        if isinstance(request.get(key), dict):
+                            request[key] = {name: resolve(path) for name, path in request[key].items()}
+            resolved_cases.append(case)
+        return resolved_cases
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+测试用例 YAML 文件缓存
+worker 进程内按 COS Key 缓存已下载并解析的测试用例，以 ETag 作为版本标识，
+每次使用前通过 HEAD 请求校验 ETag，未变化时跳过下载和解析
+"""
+import logging
+import os
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class TestCaseFileCache:
+    """
+    测试用例缓存（LRU，按条目数和文件总大小限制）
+    缓存的是 loader 解析 YAML 文件后得到的对象（如 SuiteDefinition），
+    对应的 YAML 文件在条目被淘汰前一直保留在本地缓存目录中
+    """
+
+    # 最大缓存条目数
+    MAX_ENTRIES = int(os.environ.get('API_TEST_CASE_CACHE_ENTRIES', 64))
+    # 缓存文件总大小上限（字节）
+    MAX_BYTES = int(os.environ.get('API_TEST_CASE_CACHE_BYTES', 64 * 1024 * 1024))
+    # 本地缓存目录
+    CACHE_DIR = os.environ.get(
+        'API_TEST_CASE_CACHE_DIR',
+        os.path.join(tempfile.gettempdir(), 'api_test_case_cache')
+    )
+
+    _lock = threading.Lock()
+    # cos_key -> {"etag": str, "value": Any, "path": str, "size": int}
+    _entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    _total_bytes = 0
+
+    @classmethod
+    def load(cls, cos_client, cos_key: str, loader: Callable[[str], Any]):
+        """
+        获取测试用例解析结果
+        返回的对象在多次执行间共享，调用方不得修改
+        :param cos_client: CosClient 实例
+        :param cos_key: COS 对象键
+        :param loader: 解析函数，入参为本地 YAML 文件路径
+        :return: loader 的返回值
+        """
+        etag = cls.head_etag(cos_client, cos_key)
+
+        if etag:
+            with cls._lock:
+                entry = cls._entries.get(cos_key)
+                if entry and entry['etag'] == etag:
+                    cls._entries.move_to_end(cos_key)
+                    logger.info(f"测试用例缓存命中: {cos_key}")
+                    return entry['value']
+
+        local_path = cls.download(cos_client, cos_key)
+        try:
+            value = loader(local_path)
+        except Exception:
+            cls.remove_file(local_path)
+            raise
+
+        # 未获取到 ETag 的条目不会被命中，只借助 LRU 淘汰来清理本地文件
+        cls.put(cos_key, etag or '', value, local_path)
+
+        return value
+
+    @staticmethod
+    def head_etag(cos_client, cos_key: str):
+        """通过 HEAD 请求获取对象 ETag，失败时返回 None（不使用缓存）"""
+        try:
+            head = cos_client.client.head_object(Bucket=cos_client.bucket, Key=cos_key)
+            return head.get('ETag')
+        except Exception as e:
+            logger.warning(f"获取测试用例 ETag 失败，跳过缓存: {cos_key}, 错误: {e}")
+            return None
+
+    @classmethod
+    def download(cls, cos_client, cos_key: str) -> str:
+        """
+        下载 YAML 文件到本地缓存目录
+        :return: 本地文件路径
+        """
+        cache_dir = os.path.join(cls.CACHE_DIR, str(os.getpid()))
+        os.makedirs(cache_dir, exist_ok=True)
+
+        extension = os.path.splitext(cos_key)[1] or '.yaml'
+        local_path = os.path.join(cache_dir, f"{uuid.uuid4().hex}{extension}")
+        cos_client.client.download_file(
+            Bucket=cos_client.bucket,
+            Key=cos_key,
+            DestFilePath=local_path
+        )
+        return local_path
+
+    @classmethod
+    def put(cls, cos_key: str, etag: str, value: Any, local_path: str):
+        """写入缓存，超出限制时按最近最少使用淘汰"""
+        size = os.path.getsize(local_path)
+
+        evicted_paths = []
+        with cls._lock:
+            old_entry = cls._entries.pop(cos_key, None)
+            if old_entry:
+                cls._total_bytes -= old_entry['size']
+                evicted_paths.append(old_entry['path'])
+
+            cls._entries[cos_key] = {'etag': etag, 'value': value, 'path': local_path, 'size': size}
+            cls._total_bytes += size
+
+            while cls._entries and (len(cls._entries) > cls.MAX_ENTRIES or cls._total_bytes > cls.MAX_BYTES):
+                _, evicted = cls._entries.popitem(last=False)
+                cls._total_bytes -= evicted['size']
+                evicted_paths.append(evicted['path'])
+
+        for path in evicted_paths:
+            cls.remove_file(path)
+
+    @staticmethod
+    def remove_file(path: str):
+        """删除本地缓存文件"""
+        try:
+            if path and os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            logger.warning(f"删除测试用例缓存文件失败: {path}, 错误: {e}")
+
+    @classmethod
+    def clear(cls):
+        """清空缓存"""
+        with cls._lock:
+            paths = [entry['path'] for entry in cls._entries.values()]
+            cls._entries.clear()
+            cls._total_bytes = 0
+
+        for path in paths:
+            cls.remove_file(path)
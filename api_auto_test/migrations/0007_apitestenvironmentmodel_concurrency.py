@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-17 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0006_apitestcasemodel_module'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apitestenvironmentmodel',
+            name='concurrency',
+            field=models.IntegerField(db_comment='用例并发数，1 表示串行执行', default=1),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-17 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0007_apitestenvironmentmodel_concurrency'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apitestenvironmentmodel',
+            name='execution_engine',
+            field=models.SmallIntegerField(choices=[(0, '同步执行'), (1, '异步执行')], db_comment='执行引擎: 0-同步执行, 1-异步执行', default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-17 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0008_apitestenvironmentmodel_execution_engine'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apitestexecutionmodel',
+            name='shard_count',
+            field=models.IntegerField(db_comment='分片数，大于 1 时拆分到多个 worker 并行执行', default=1),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.27 on 2026-10-17 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0009_apitestexecutionmodel_shard_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiTestCaseResultModel',
+            fields=[
+                ('id', models.BigAutoField(db_comment='id', primary_key=True, serialize=False)),
+                ('execution_id', models.IntegerField(db_comment='关联执行记录id')),
+                ('case_index', models.IntegerField(db_comment='用例在 YAML 中的序号')),
+                ('case_id', models.CharField(db_comment='用例编号', max_length=255)),
+                ('case_name', models.CharField(blank=True, db_comment='用例名称', max_length=500, null=True)),
+                ('status', models.SmallIntegerField(choices=[(0, '通过'), (1, '失败')], db_comment='执行状态: 0-通过, 1-失败', default=0)),
+                ('duration', models.FloatField(db_comment='执行耗时（秒）', default=0)),
+                ('error_message', models.TextField(blank=True, db_comment='错误信息', null=True)),
+                ('steps', models.JSONField(blank=True, db_comment='步骤执行结果，包含请求/响应信息', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_comment='创建时间')),
+            ],
+            options={
+                'verbose_name': '接口测试用例执行结果',
+                'verbose_name_plural': '接口测试用例执行结果',
+                'db_table': 'api_test_case_result',
+                'ordering': ['execution_id', 'case_index'],
+                'indexes': [models.Index(fields=['execution_id', 'case_index'], name='idx_case_result_execution')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-17 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0010_apitestcaseresultmodel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apitestenvironmentmodel',
+            name='capture_policy',
+            field=models.JSONField(blank=True, db_comment='请求/响应体采集策略，JSON格式，如：{"max_body_size": 65536, "head_size": 8192, "tail_size": 2048, "spill_to_cos": false}', null=True),
+        ),
+    ]
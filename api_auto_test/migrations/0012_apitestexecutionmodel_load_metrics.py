@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-17 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0011_apitestenvironmentmodel_capture_policy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apitestexecutionmodel',
+            name='load_metrics',
+            field=models.JSONField(blank=True, db_comment='压测步骤统计，包含 p50/p90/p99 延迟、错误率、实际 RPS', null=True),
+        ),
+    ]
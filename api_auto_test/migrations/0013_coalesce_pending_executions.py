@@ -0,0 +1,27 @@
+# Generated by Django 4.2.27 on 2026-10-17 13:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0012_apitestexecutionmodel_load_metrics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apitestenvironmentmodel',
+            name='coalesce_pending',
+            field=models.BooleanField(db_comment='是否合并重复的待执行任务：同一测试用例在该环境已有待执行记录时，新的执行请求复用该记录', default=False),
+        ),
+        migrations.AddField(
+            model_name='apitestexecutionmodel',
+            name='coalesced_count',
+            field=models.IntegerField(db_comment='合并到本记录的重复执行请求数', default=0),
+        ),
+        migrations.AddIndex(
+            model_name='apitestexecutionmodel',
+            index=models.Index(fields=['test_case_id', 'env_id', 'status'], name='idx_execution_case_env_status'),
+        ),
+    ]
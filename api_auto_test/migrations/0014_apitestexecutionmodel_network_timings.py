@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-17 14:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0013_coalesce_pending_executions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apitestexecutionmodel',
+            name='network_timings',
+            field=models.JSONField(blank=True, db_comment='按接口汇总的网络耗时，包含连接、TLS、发送、首字节、下载、总耗时的 min/avg/p95（毫秒）', null=True),
+        ),
+    ]
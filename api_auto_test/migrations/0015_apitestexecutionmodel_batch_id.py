@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-17 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0014_apitestexecutionmodel_network_timings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apitestexecutionmodel',
+            name='batch_id',
+            field=models.CharField(blank=True, db_comment='批量执行批次id', db_index=True, max_length=32, null=True),
+        ),
+    ]
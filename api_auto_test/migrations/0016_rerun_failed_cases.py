@@ -0,0 +1,23 @@
+# Generated by Django 4.2.27 on 2026-10-17 15:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0015_apitestexecutionmodel_batch_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apitestexecutionmodel',
+            name='parent_execution_id',
+            field=models.IntegerField(blank=True, db_comment='父执行记录id，重跑失败用例时关联原执行记录', db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='apitestexecutionmodel',
+            name='case_filter',
+            field=models.JSONField(blank=True, db_comment='只执行的用例编号列表，为空时执行全部用例', null=True),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.27 on 2026-10-17 16:10
+
+from datetime import datetime, timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_next_execution_time(apps, schema_editor):
+    """调度器只查询 next_execution_time 已到期的任务，为缺少下次执行时间的已启用任务补齐"""
+    ApiTestScheduleModel = apps.get_model('api_auto_test', 'ApiTestScheduleModel')
+    local_now = timezone.localtime(timezone.now())
+
+    schedules = ApiTestScheduleModel.objects.filter(
+        is_enabled=True,
+        deleted_at__isnull=True,
+        next_execution_time__isnull=True
+    )
+    for schedule in schedules:
+        if schedule.schedule_type == 0:
+            days_until = 0 if local_now.time() < schedule.schedule_time else 1
+        else:
+            days_until = ((schedule.schedule_weekday or 1) - local_now.isoweekday()) % 7
+            if days_until == 0 and local_now.time() >= schedule.schedule_time:
+                days_until = 7
+        next_date = local_now.date() + timedelta(days=days_until)
+        schedule.next_execution_time = timezone.make_aware(datetime.combine(next_date, schedule.schedule_time))
+        schedule.save(update_fields=['next_execution_time'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0016_rerun_failed_cases'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='apitestschedulemodel',
+            index=models.Index(fields=['is_enabled', 'next_execution_time'], name='idx_schedule_enabled_next_time'),
+        ),
+        migrations.RunPython(backfill_next_execution_time, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-17 16:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0017_schedule_next_execution_time_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apitestschedulemodel',
+            name='spread_window',
+            field=models.SmallIntegerField(db_comment='错峰窗口（分钟），大于 0 时在执行时间后的窗口内按固定偏移触发', default=0),
+        ),
+    ]
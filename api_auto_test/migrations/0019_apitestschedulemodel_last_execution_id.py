@@ -0,0 +1,34 @@
+# Generated by Django 4.2.27 on 2026-10-17 16:40
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_last_execution_id(apps, schema_editor):
+    """为已有定时任务关联最近一次执行记录"""
+    ApiTestScheduleModel = apps.get_model('api_auto_test', 'ApiTestScheduleModel')
+    ApiTestExecutionModel = apps.get_model('api_auto_test', 'ApiTestExecutionModel')
+
+    latest_execution = ApiTestExecutionModel.objects.filter(
+        scheduled_task_id=OuterRef('id')
+    ).order_by('-created_at').values('id')[:1]
+
+    ApiTestScheduleModel.objects.filter(
+        last_execution_time__isnull=False
+    ).update(last_execution_id=Subquery(latest_execution))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0018_apitestschedulemodel_spread_window'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apitestschedulemodel',
+            name='last_execution_id',
+            field=models.IntegerField(blank=True, db_comment='最近一次执行记录id', null=True),
+        ),
+        migrations.RunPython(backfill_last_execution_id, migrations.RunPython.noop),
+    ]
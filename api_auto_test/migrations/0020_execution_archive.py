@@ -0,0 +1,60 @@
+# Generated by Django 4.2.27 on 2026-10-17 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0019_apitestschedulemodel_last_execution_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiTestExecutionArchiveModel',
+            fields=[
+                ('id', models.IntegerField(db_comment='原执行记录id', primary_key=True, serialize=False)),
+                ('test_case_id', models.IntegerField(db_comment='关联测试用例id')),
+                ('env_id', models.IntegerField(db_comment='关联环境配置id')),
+                ('status', models.SmallIntegerField(choices=[(0, '待执行'), (1, '执行中'), (2, '成功'), (3, '失败')], db_comment='执行状态: 0-待执行, 1-执行中, 2-成功, 3-失败', default=0)),
+                ('trigger_type', models.SmallIntegerField(choices=[(0, '手动触发'), (1, '定时触发')], db_comment='触发类型: 0-手动触发, 1-定时触发', default=0)),
+                ('scheduled_task_id', models.IntegerField(blank=True, db_comment='关联定时任务id', null=True)),
+                ('celery_task_id', models.CharField(blank=True, db_comment='Celery任务id', max_length=100, null=True)),
+                ('batch_id', models.CharField(blank=True, db_comment='批量执行批次id', max_length=32, null=True)),
+                ('parent_execution_id', models.IntegerField(blank=True, db_comment='父执行记录id，重跑失败用例时关联原执行记录', null=True)),
+                ('case_filter', models.JSONField(blank=True, db_comment='只执行的用例编号列表，为空时执行全部用例', null=True)),
+                ('shard_count', models.IntegerField(db_comment='分片数，大于 1 时拆分到多个 worker 并行执行', default=1)),
+                ('coalesced_count', models.IntegerField(db_comment='合并到本记录的重复执行请求数', default=0)),
+                ('total_cases', models.IntegerField(blank=True, db_comment='总用例数', default=0, null=True)),
+                ('passed_cases', models.IntegerField(blank=True, db_comment='通过用例数', default=0, null=True)),
+                ('failed_cases', models.IntegerField(blank=True, db_comment='失败用例数', default=0, null=True)),
+                ('pass_rate', models.DecimalField(blank=True, db_comment='通过率（百分比）', decimal_places=2, max_digits=5, null=True)),
+                ('report_url', models.URLField(blank=True, db_comment='测试报告COS访问URL', max_length=500, null=True)),
+                ('load_metrics', models.JSONField(blank=True, db_comment='压测步骤统计，包含 p50/p90/p99 延迟、错误率、实际 RPS', null=True)),
+                ('network_timings', models.JSONField(blank=True, db_comment='按接口汇总的网络耗时，包含连接、TLS、发送、首字节、下载、总耗时的 min/avg/p95（毫秒）', null=True)),
+                ('error_message', models.TextField(blank=True, db_comment='错误信息', null=True)),
+                ('started_at', models.DateTimeField(blank=True, db_comment='开始执行时间', null=True)),
+                ('finished_at', models.DateTimeField(blank=True, db_comment='执行完成时间', null=True)),
+                ('duration', models.IntegerField(blank=True, db_comment='执行耗时（秒）', null=True)),
+                ('executed_user_id', models.IntegerField(db_comment='执行人id', null=True)),
+                ('executed_user', models.CharField(db_comment='执行人', max_length=255, null=True)),
+                ('created_at', models.DateTimeField(db_comment='创建时间')),
+                ('updated_at', models.DateTimeField(db_comment='更新时间')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, db_comment='归档时间')),
+            ],
+            options={
+                'verbose_name': '接口测试执行记录归档',
+                'verbose_name_plural': '接口测试执行记录归档',
+                'db_table': 'api_test_execution_archive',
+                'ordering': ['-created_at'],
+                'indexes': [
+                    models.Index(fields=['created_at'], name='idx_exec_archive_created_at'),
+                    models.Index(fields=['test_case_id', 'created_at'], name='idx_exec_archive_case_created'),
+                ],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='apitestexecutionmodel',
+            index=models.Index(fields=['created_at'], name='idx_execution_created_at'),
+        ),
+    ]
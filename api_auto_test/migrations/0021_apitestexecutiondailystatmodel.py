@@ -0,0 +1,79 @@
+# Generated by Django 4.2.27 on 2026-10-17 17:30
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_daily_stat(apps, schema_editor):
+    """按已结束的执行记录生成每日统计（重跑失败用例的执行不计入）"""
+    ApiTestCaseModel = apps.get_model('api_auto_test', 'ApiTestCaseModel')
+    ApiTestExecutionModel = apps.get_model('api_auto_test', 'ApiTestExecutionModel')
+    ApiTestExecutionDailyStatModel = apps.get_model('api_auto_test', 'ApiTestExecutionDailyStatModel')
+
+    project_map = dict(ApiTestCaseModel.objects.values_list('id', 'project_id'))
+
+    stats = {}
+    executions = ApiTestExecutionModel.objects.filter(
+        status__in=[2, 3],
+        finished_at__isnull=False,
+        parent_execution_id__isnull=True
+    ).values_list('test_case_id', 'env_id', 'status', 'finished_at', 'duration', 'total_cases', 'passed_cases')
+    for test_case_id, env_id, status, finished_at, duration, total_cases, passed_cases in executions.iterator():
+        project_id = project_map.get(test_case_id)
+        if project_id is None:
+            continue
+        key = (project_id, timezone.localtime(finished_at).date(), test_case_id, env_id)
+        stat = stats.setdefault(key, {
+            'run_count': 0, 'passed_count': 0, 'failed_count': 0,
+            'total_cases': 0, 'passed_cases': 0, 'total_duration': 0
+        })
+        stat['run_count'] += 1
+        if status == 2:
+            stat['passed_count'] += 1
+        else:
+            stat['failed_count'] += 1
+        stat['total_cases'] += total_cases or 0
+        stat['passed_cases'] += passed_cases or 0
+        stat['total_duration'] += duration or 0
+
+    ApiTestExecutionDailyStatModel.objects.bulk_create([
+        ApiTestExecutionDailyStatModel(
+            project_id=project_id, stat_date=stat_date, test_case_id=test_case_id, env_id=env_id, **stat
+        )
+        for (project_id, stat_date, test_case_id, env_id), stat in stats.items()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0020_execution_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiTestExecutionDailyStatModel',
+            fields=[
+                ('id', models.BigAutoField(db_comment='id', primary_key=True, serialize=False)),
+                ('project_id', models.IntegerField(db_comment='所属项目id')),
+                ('stat_date', models.DateField(db_comment='统计日期（执行完成时间所在日期）')),
+                ('test_case_id', models.IntegerField(db_comment='关联测试用例id')),
+                ('env_id', models.IntegerField(db_comment='关联环境配置id')),
+                ('run_count', models.IntegerField(db_comment='执行次数', default=0)),
+                ('passed_count', models.IntegerField(db_comment='成功次数', default=0)),
+                ('failed_count', models.IntegerField(db_comment='失败次数', default=0)),
+                ('total_cases', models.IntegerField(db_comment='总用例数（各次执行之和）', default=0)),
+                ('passed_cases', models.IntegerField(db_comment='通过用例数（各次执行之和）', default=0)),
+                ('total_duration', models.IntegerField(db_comment='总执行耗时（秒），平均耗时 = 总执行耗时 / 执行次数', default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_comment='更新时间')),
+            ],
+            options={
+                'verbose_name': '接口测试执行每日统计',
+                'verbose_name_plural': '接口测试执行每日统计',
+                'db_table': 'api_test_execution_daily_stat',
+                'ordering': ['stat_date'],
+                'constraints': [models.UniqueConstraint(fields=('project_id', 'stat_date', 'test_case_id', 'env_id'), name='uniq_daily_stat_project_date_case_env')],
+            },
+        ),
+        migrations.RunPython(backfill_daily_stat, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.27 on 2026-10-17 17:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0021_apitestexecutiondailystatmodel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiTestCaseFlakinessModel',
+            fields=[
+                ('id', models.BigAutoField(db_comment='id', primary_key=True, serialize=False)),
+                ('project_id', models.IntegerField(db_comment='所属项目id')),
+                ('test_case_id', models.IntegerField(db_comment='关联测试用例id')),
+                ('case_id', models.CharField(db_comment='用例编号', max_length=255)),
+                ('case_name', models.CharField(blank=True, db_comment='用例名称', max_length=500, null=True)),
+                ('env_id', models.IntegerField(db_comment='关联环境配置id')),
+                ('outcome_bits', models.PositiveBigIntegerField(db_comment='最近执行结果位图，最低位为最近一次，1-失败, 0-通过', default=0)),
+                ('window_size', models.SmallIntegerField(db_comment='位图中的有效结果数（最多 64）', default=0)),
+                ('run_count', models.IntegerField(db_comment='累计执行次数', default=0)),
+                ('fail_count', models.IntegerField(db_comment='累计失败次数', default=0)),
+                ('flakiness_score', models.FloatField(db_comment='不稳定分数（0-100），最近结果中通过/失败切换次数占比', default=0)),
+                ('last_execution_id', models.IntegerField(blank=True, db_comment='最近一次执行记录id', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_comment='更新时间')),
+            ],
+            options={
+                'verbose_name': '接口测试用例稳定性',
+                'verbose_name_plural': '接口测试用例稳定性',
+                'db_table': 'api_test_case_flakiness',
+                'ordering': ['-flakiness_score'],
+                'indexes': [models.Index(fields=['project_id', 'flakiness_score'], name='idx_flakiness_project_score')],
+                'constraints': [models.UniqueConstraint(fields=('test_case_id', 'env_id', 'case_id'), name='uniq_flakiness_case_env_case_id')],
+            },
+        ),
+    ]
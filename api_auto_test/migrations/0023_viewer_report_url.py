@@ -0,0 +1,23 @@
+# Generated by Django 4.2.27 on 2026-10-17 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0022_apitestcaseflakinessmodel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apitestexecutionmodel',
+            name='viewer_report_url',
+            field=models.URLField(blank=True, db_comment='按需加载报告（查看器）COS访问URL', max_length=500, null=True),
+        ),
+        migrations.AddField(
+            model_name='apitestexecutionarchivemodel',
+            name='viewer_report_url',
+            field=models.URLField(blank=True, db_comment='按需加载报告（查看器）COS访问URL', max_length=500, null=True),
+        ),
+    ]
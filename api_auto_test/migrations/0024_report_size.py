@@ -0,0 +1,33 @@
+# Generated by Django 4.2.27 on 2026-10-17 18:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0023_viewer_report_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apitestexecutionmodel',
+            name='report_size',
+            field=models.BigIntegerField(blank=True, db_comment='测试报告大小（压缩前，字节）', null=True),
+        ),
+        migrations.AddField(
+            model_name='apitestexecutionmodel',
+            name='report_compressed_size',
+            field=models.BigIntegerField(blank=True, db_comment='测试报告大小（gzip 压缩后，字节）', null=True),
+        ),
+        migrations.AddField(
+            model_name='apitestexecutionarchivemodel',
+            name='report_size',
+            field=models.BigIntegerField(blank=True, db_comment='测试报告大小（压缩前，字节）', null=True),
+        ),
+        migrations.AddField(
+            model_name='apitestexecutionarchivemodel',
+            name='report_compressed_size',
+            field=models.BigIntegerField(blank=True, db_comment='测试报告大小（gzip 压缩后，字节）', null=True),
+        ),
+    ]
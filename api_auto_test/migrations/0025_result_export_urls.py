@@ -0,0 +1,33 @@
+# Generated by Django 4.2.27 on 2026-10-17 19:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_auto_test', '0024_report_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apitestexecutionmodel',
+            name='junit_report_url',
+            field=models.URLField(blank=True, db_comment='JUnit XML 结果COS访问URL', max_length=500, null=True),
+        ),
+        migrations.AddField(
+            model_name='apitestexecutionmodel',
+            name='json_report_url',
+            field=models.URLField(blank=True, db_comment='JSON 结果COS访问URL', max_length=500, null=True),
+        ),
+        migrations.AddField(
+            model_name='apitestexecutionarchivemodel',
+            name='junit_report_url',
+            field=models.URLField(blank=True, db_comment='JUnit XML 结果COS访问URL', max_length=500, null=True),
+        ),
+        migrations.AddField(
+            model_name='apitestexecutionarchivemodel',
+            name='json_report_url',
+            field=models.URLField(blank=True, db_comment='JSON 结果COS访问URL', max_length=500, null=True),
+        ),
+    ]
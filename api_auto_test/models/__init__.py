@@ -1,16 +1,24 @@
 from .api_document_model import ApiDocumentsModel
 from .api_interface_model import ApiInterfaceModel
+from .api_test_case_flakiness_model import ApiTestCaseFlakinessModel
 from .api_test_case_model import ApiTestCaseModel
+from .api_test_case_result_model import ApiTestCaseResultModel
 from .api_test_environment_model import ApiTestEnvironmentModel
+from .api_test_execution_daily_stat_model import ApiTestExecutionDailyStatModel
 from .api_test_execution_model import ApiTestExecutionModel
+from .api_test_execution_archive_model import ApiTestExecutionArchiveModel
 from .api_test_schedule_model import ApiTestScheduleModel
 
 __all__ = [
     'ApiDocumentsModel',
     'ApiInterfaceModel',
+    'ApiTestCaseFlakinessModel',
     'ApiTestCaseModel',
+    'ApiTestCaseResultModel',
     'ApiTestEnvironmentModel',
+    'ApiTestExecutionDailyStatModel',
     'ApiTestExecutionModel',
+    'ApiTestExecutionArchiveModel',
     'ApiTestScheduleModel'
 ]
 
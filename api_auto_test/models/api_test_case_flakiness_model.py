@@ -0,0 +1,108 @@
+from django.db import models
+
+
+class ApiTestCaseFlakinessModel(models.Model):
+    """接口测试用例稳定性模型（按测试用例、用例编号、环境记录最近的执行结果序列，执行结束时增量更新）"""
+
+    # id
+    id = models.BigAutoField(
+        primary_key=True,
+        db_comment="id"
+    )
+
+    # 所属项目id
+    project_id = models.IntegerField(
+        null=False,
+        db_comment="所属项目id"
+    )
+
+    # 关联测试用例id
+    test_case_id = models.IntegerField(
+        null=False,
+        db_comment="关联测试用例id"
+    )
+
+    # 用例编号（YAML 中的用例）
+    case_id = models.CharField(
+        max_length=255,
+        null=False,
+        db_comment="用例编号"
+    )
+
+    # 用例名称
+    case_name = models.CharField(
+        max_length=500,
+        null=True,
+        blank=True,
+        db_comment="用例名称"
+    )
+
+    # 关联环境配置id
+    env_id = models.IntegerField(
+        null=False,
+        db_comment="关联环境配置id"
+    )
+
+    # 最近执行结果位图
+    outcome_bits = models.PositiveBigIntegerField(
+        null=False,
+        default=0,
+        db_comment="最近执行结果位图，最低位为最近一次，1-失败, 0-通过"
+    )
+
+    # 位图中的有效结果数
+    window_size = models.SmallIntegerField(
+        null=False,
+        default=0,
+        db_comment="位图中的有效结果数（最多 64）"
+    )
+
+    # 累计执行次数
+    run_count = models.IntegerField(
+        null=False,
+        default=0,
+        db_comment="累计执行次数"
+    )
+
+    # 累计失败次数
+    fail_count = models.IntegerField(
+        null=False,
+        default=0,
+        db_comment="累计失败次数"
+    )
+
+    # 不稳定分数
+    flakiness_score = models.FloatField(
+        null=False,
+        default=0,
+        db_comment="不稳定分数（0-100），最近结果中通过/失败切换次数占比"
+    )
+
+    # 最近一次执行记录id
+    last_execution_id = models.IntegerField(
+        null=True,
+        blank=True,
+        db_comment="最近一次执行记录id"
+    )
+
+    # 更新时间
+    updated_at = models.DateTimeField(
+        null=False,
+        auto_now=True,
+        db_comment="更新时间"
+    )
+
+    class Meta:
+        db_table = 'api_test_case_flakiness'
+        verbose_name = '接口测试用例稳定性'
+        verbose_name_plural = '接口测试用例稳定性'
+        ordering = ['-flakiness_score']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['test_case_id', 'env_id', 'case_id'],
+                name='uniq_flakiness_case_env_case_id'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['project_id', 'flakiness_score'], name='idx_flakiness_project_score'),
+        ]
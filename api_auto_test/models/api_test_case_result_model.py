@@ -0,0 +1,86 @@
+from django.db import models
+
+
+class ApiTestCaseResultModel(models.Model):
+    """接口测试用例执行结果模型（每个执行记录下的单个用例结果）"""
+
+    class CaseStatus(models.IntegerChoices):
+        PASS = 0, "通过"
+        FAIL = 1, "失败"
+
+    # id
+    id = models.BigAutoField(
+        primary_key=True,
+        db_comment="id"
+    )
+
+    # 关联执行记录id
+    execution_id = models.IntegerField(
+        null=False,
+        db_comment="关联执行记录id"
+    )
+
+    # 用例在 YAML 中的序号
+    case_index = models.IntegerField(
+        null=False,
+        db_comment="用例在 YAML 中的序号"
+    )
+
+    # 用例编号
+    case_id = models.CharField(
+        max_length=255,
+        null=False,
+        db_comment="用例编号"
+    )
+
+    # 用例名称
+    case_name = models.CharField(
+        max_length=500,
+        null=True,
+        blank=True,
+        db_comment="用例名称"
+    )
+
+    # 执行状态
+    status = models.SmallIntegerField(
+        choices=CaseStatus.choices,
+        default=CaseStatus.PASS,
+        db_comment="执行状态: 0-通过, 1-失败"
+    )
+
+    # 执行耗时（秒）
+    duration = models.FloatField(
+        null=False,
+        default=0,
+        db_comment="执行耗时（秒）"
+    )
+
+    # 错误信息
+    error_message = models.TextField(
+        null=True,
+        blank=True,
+        db_comment="错误信息"
+    )
+
+    # 步骤执行结果（JSON格式）
+    steps = models.JSONField(
+        null=True,
+        blank=True,
+        db_comment="步骤执行结果，包含请求/响应信息"
+    )
+
+    # 创建时间
+    created_at = models.DateTimeField(
+        null=False,
+        auto_now_add=True,
+        db_comment="创建时间"
+    )
+
+    class Meta:
+        db_table = 'api_test_case_result'
+        verbose_name = '接口测试用例执行结果'
+        verbose_name_plural = '接口测试用例执行结果'
+        ordering = ['execution_id', 'case_index']
+        indexes = [
+            models.Index(fields=['execution_id', 'case_index'], name='idx_case_result_execution'),
+        ]
@@ -4,6 +4,10 @@ from django.db import models
 class ApiTestEnvironmentModel(models.Model):
     """接口测试环境配置模型"""
 
+    class ExecutionEngine(models.IntegerChoices):
+        SYNC = 0, "同步执行"
+        ASYNC = 1, "异步执行"
+
     # id
     id = models.AutoField(
         primary_key=True,
@@ -59,6 +63,34 @@ class ApiTestEnvironmentModel(models.Model):
         db_comment="环境变量，JSON格式，如：{\"token\": \"xxx\", \"user_id\": 123}"
     )
 
+    # 用例并发数
+    concurrency = models.IntegerField(
+        null=False,
+        default=1,
+        db_comment="用例并发数，1 表示串行执行"
+    )
+
+    # 执行引擎
+    execution_engine = models.SmallIntegerField(
+        choices=ExecutionEngine.choices,
+        default=ExecutionEngine.SYNC,
+        db_comment="执行引擎: 0-同步执行, 1-异步执行"
+    )
+
+    # 请求/响应体采集策略（JSON格式）
+    capture_policy = models.JSONField(
+        null=True,
+        blank=True,
+        db_comment="请求/响应体采集策略，JSON格式，如：{\"max_body_size\": 65536, \"head_size\": 8192, \"tail_size\": 2048, \"spill_to_cos\": false}"
+    )
+
+    # 是否合并重复的待执行任务
+    coalesce_pending = models.BooleanField(
+        null=False,
+        default=False,
+        db_comment="是否合并重复的待执行任务：同一测试用例在该环境已有待执行记录时，新的执行请求复用该记录"
+    )
+
     # 是否为默认环境
     is_default = models.BooleanField(
         null=False,
@@ -0,0 +1,42 @@
+from django.db import models
+
+from .api_test_execution_base_model import ApiTestExecutionBaseModel
+
+
+class ApiTestExecutionArchiveModel(ApiTestExecutionBaseModel):
+    """接口测试执行记录归档模型（超过保留天数的执行记录，字段与执行记录一致）"""
+
+    # 原执行记录id
+    id = models.IntegerField(
+        primary_key=True,
+        db_comment="原执行记录id"
+    )
+
+    # 创建时间
+    created_at = models.DateTimeField(
+        null=False,
+        db_comment="创建时间"
+    )
+
+    # 更新时间
+    updated_at = models.DateTimeField(
+        null=False,
+        db_comment="更新时间"
+    )
+
+    # 归档时间
+    archived_at = models.DateTimeField(
+        null=False,
+        auto_now_add=True,
+        db_comment="归档时间"
+    )
+
+    class Meta:
+        db_table = 'api_test_execution_archive'
+        verbose_name = '接口测试执行记录归档'
+        verbose_name_plural = '接口测试执行记录归档'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='idx_exec_archive_created_at'),
+            models.Index(fields=['test_case_id', 'created_at'], name='idx_exec_archive_case_created'),
+        ]
@@ -0,0 +1,232 @@
+from django.db import models
+
+
+class ApiTestExecutionBaseModel(models.Model):
+    """
+    接口测试执行记录公共字段
+    执行记录表和归档表共用，各自定义主键、创建/更新时间、索引
+    """
+
+    class ExecutionStatus(models.IntegerChoices):
+        PENDING = 0, "待执行"
+        RUNNING = 1, "执行中"
+        SUCCESS = 2, "成功"
+        FAILED = 3, "失败"
+
+    class TriggerType(models.IntegerChoices):
+        MANUAL = 0, "手动触发"
+        SCHEDULED = 1, "定时触发"
+
+    # 关联测试用例id
+    test_case_id = models.IntegerField(
+        null=False,
+        db_comment="关联测试用例id"
+    )
+
+    # 关联环境配置id
+    env_id = models.IntegerField(
+        null=False,
+        db_comment="关联环境配置id"
+    )
+
+    # 执行状态
+    status = models.SmallIntegerField(
+        choices=ExecutionStatus.choices,
+        default=ExecutionStatus.PENDING,
+        db_comment="执行状态: 0-待执行, 1-执行中, 2-成功, 3-失败"
+    )
+
+    # 触发类型
+    trigger_type = models.SmallIntegerField(
+        choices=TriggerType.choices,
+        default=TriggerType.MANUAL,
+        db_comment="触发类型: 0-手动触发, 1-定时触发"
+    )
+
+    # 关联定时任务id（定时触发时）
+    scheduled_task_id = models.IntegerField(
+        null=True,
+        blank=True,
+        db_comment="关联定时任务id"
+    )
+
+    # Celery任务id
+    celery_task_id = models.CharField(
+        max_length=100,
+        null=True,
+        blank=True,
+        db_comment="Celery任务id"
+    )
+
+    # 批量执行批次id
+    batch_id = models.CharField(
+        max_length=32,
+        null=True,
+        blank=True,
+        db_comment="批量执行批次id"
+    )
+
+    # 父执行记录id（重跑失败用例时关联原执行记录）
+    parent_execution_id = models.IntegerField(
+        null=True,
+        blank=True,
+        db_comment="父执行记录id，重跑失败用例时关联原执行记录"
+    )
+
+    # 用例过滤（只执行列表中的用例编号，为空时执行全部用例）
+    case_filter = models.JSONField(
+        null=True,
+        blank=True,
+        db_comment="只执行的用例编号列表，为空时执行全部用例"
+    )
+
+    # 分片数（大于 1 时拆分到多个 worker 并行执行）
+    shard_count = models.IntegerField(
+        null=False,
+        default=1,
+        db_comment="分片数，大于 1 时拆分到多个 worker 并行执行"
+    )
+
+    # 合并到本记录的重复执行请求数
+    coalesced_count = models.IntegerField(
+        null=False,
+        default=0,
+        db_comment="合并到本记录的重复执行请求数"
+    )
+
+    # 总用例数
+    total_cases = models.IntegerField(
+        null=True,
+        blank=True,
+        default=0,
+        db_comment="总用例数"
+    )
+
+    # 通过用例数
+    passed_cases = models.IntegerField(
+        null=True,
+        blank=True,
+        default=0,
+        db_comment="通过用例数"
+    )
+
+    # 失败用例数
+    failed_cases = models.IntegerField(
+        null=True,
+        blank=True,
+        default=0,
+        db_comment="失败用例数"
+    )
+
+    # 通过率（百分比）
+    pass_rate = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        db_comment="通过率（百分比）"
+    )
+
+    # 测试报告COS访问URL
+    report_url = models.URLField(
+        max_length=500,
+        null=True,
+        blank=True,
+        db_comment="测试报告COS访问URL"
+    )
+
+    # 测试报告大小（压缩前，字节）
+    report_size = models.BigIntegerField(
+        null=True,
+        blank=True,
+        db_comment="测试报告大小（压缩前，字节）"
+    )
+
+    # 测试报告大小（gzip 压缩后，字节）
+    report_compressed_size = models.BigIntegerField(
+        null=True,
+        blank=True,
+        db_comment="测试报告大小（gzip 压缩后，字节）"
+    )
+
+    # 按需加载报告（查看器）COS访问URL
+    viewer_report_url = models.URLField(
+        max_length=500,
+        null=True,
+        blank=True,
+        db_comment="按需加载报告（查看器）COS访问URL"
+    )
+
+    # JUnit XML 结果COS访问URL
+    junit_report_url = models.URLField(
+        max_length=500,
+        null=True,
+        blank=True,
+        db_comment="JUnit XML 结果COS访问URL"
+    )
+
+    # JSON 结果COS访问URL
+    json_report_url = models.URLField(
+        max_length=500,
+        null=True,
+        blank=True,
+        db_comment="JSON 结果COS访问URL"
+    )
+
+    # 压测步骤统计（JSON格式）
+    load_metrics = models.JSONField(
+        null=True,
+        blank=True,
+        db_comment="压测步骤统计，包含 p50/p90/p99 延迟、错误率、实际 RPS"
+    )
+
+    # 按接口汇总的网络耗时（JSON格式）
+    network_timings = models.JSONField(
+        null=True,
+        blank=True,
+        db_comment="按接口汇总的网络耗时，包含连接、TLS、发送、首字节、下载、总耗时的 min/avg/p95（毫秒）"
+    )
+
+    # 错误信息
+    error_message = models.TextField(
+        null=True,
+        blank=True,
+        db_comment="错误信息"
+    )
+
+    # 开始执行时间
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_comment="开始执行时间"
+    )
+
+    # 执行完成时间
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_comment="执行完成时间"
+    )
+
+    # 执行耗时（秒）
+    duration = models.IntegerField(
+        null=True,
+        blank=True,
+        db_comment="执行耗时（秒）"
+    )
+
+    # 执行人id
+    executed_user_id = models.IntegerField(
+        null=True,
+        db_comment="执行人id"
+    )
+
+    # 执行人
+    executed_user = models.CharField(
+        max_length=255,
+        null=True,
+        db_comment="执行人"
+    )
+
+    class Meta:
+        abstract = True
@@ -0,0 +1,97 @@
+from django.db import models
+
+
+class ApiTestExecutionDailyStatModel(models.Model):
+    """接口测试执行每日统计模型（按项目、测试用例、环境、日期汇总，执行结束时增量更新）"""
+
+    # id
+    id = models.BigAutoField(
+        primary_key=True,
+        db_comment="id"
+    )
+
+    # 所属项目id
+    project_id = models.IntegerField(
+        null=False,
+        db_comment="所属项目id"
+    )
+
+    # 统计日期
+    stat_date = models.DateField(
+        null=False,
+        db_comment="统计日期（执行完成时间所在日期）"
+    )
+
+    # 关联测试用例id
+    test_case_id = models.IntegerField(
+        null=False,
+        db_comment="关联测试用例id"
+    )
+
+    # 关联环境配置id
+    env_id = models.IntegerField(
+        null=False,
+        db_comment="关联环境配置id"
+    )
+
+    # 执行次数
+    run_count = models.IntegerField(
+        null=False,
+        default=0,
+        db_comment="执行次数"
+    )
+
+    # 成功次数
+    passed_count = models.IntegerField(
+        null=False,
+        default=0,
+        db_comment="成功次数"
+    )
+
+    # 失败次数
+    failed_count = models.IntegerField(
+        null=False,
+        default=0,
+        db_comment="失败次数"
+    )
+
+    # 总用例数
+    total_cases = models.IntegerField(
+        null=False,
+        default=0,
+        db_comment="总用例数（各次执行之和）"
+    )
+
+    # 通过用例数
+    passed_cases = models.IntegerField(
+        null=False,
+        default=0,
+        db_comment="通过用例数（各次执行之和）"
+    )
+
+    # 总执行耗时（秒）
+    total_duration = models.IntegerField(
+        null=False,
+        default=0,
+        db_comment="总执行耗时（秒），平均耗时 = 总执行耗时 / 执行次数"
+    )
+
+    # 更新时间
+    updated_at = models.DateTimeField(
+        null=False,
+        auto_now=True,
+        db_comment="更新时间"
+    )
+
+    class Meta:
+        db_table = 'api_test_execution_daily_stat'
+        verbose_name = '接口测试执行每日统计'
+        verbose_name_plural = '接口测试执行每日统计'
+        ordering = ['stat_date']
+        constraints = [
+            # 按项目 + 日期范围查询趋势时走该唯一索引
+            models.UniqueConstraint(
+                fields=['project_id', 'stat_date', 'test_case_id', 'env_id'],
+                name='uniq_daily_stat_project_date_case_env'
+            ),
+        ]
@@ -72,6 +72,13 @@ class ApiTestScheduleModel(models.Model):
         db_comment="执行星期（1-7，周一到周日）"
     )
 
+    # 错峰窗口（分钟）
+    spread_window = models.SmallIntegerField(
+        null=False,
+        default=0,
+        db_comment="错峰窗口（分钟），大于 0 时在执行时间后的窗口内按固定偏移触发"
+    )
+
     # 是否启用
     is_enabled = models.BooleanField(
         null=False,
@@ -94,6 +101,13 @@ class ApiTestScheduleModel(models.Model):
         db_comment="上次执行状态: 0-待执行, 1-执行中, 2-成功, 3-失败"
     )
 
+    # 最近一次执行记录id
+    last_execution_id = models.IntegerField(
+        null=True,
+        blank=True,
+        db_comment="最近一次执行记录id"
+    )
+
     # 下次执行时间
     next_execution_time = models.DateTimeField(
         null=True,
@@ -140,3 +154,6 @@ class ApiTestScheduleModel(models.Model):
         verbose_name = '接口测试定时任务'
         verbose_name_plural = '接口测试定时任务'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_enabled', 'next_execution_time'], name='idx_schedule_enabled_next_time'),
+        ]
@@ -1,26 +1,32 @@
 import os
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 import yaml
 from django.core.files.storage import FileSystemStorage
 from django.core.paginator import Paginator
 from django.db import transaction
-from django.db.models import Count
+from django.db.models import Count, Sum
 from django.utils import timezone
 from qcloud_cos import CosClientError
 
 from api_auto_test.models import (
     ApiDocumentsModel,
     ApiInterfaceModel,
+    ApiTestCaseFlakinessModel,
     ApiTestCaseModel,
+    ApiTestCaseResultModel,
     ApiTestEnvironmentModel,
+    ApiTestExecutionArchiveModel,
+    ApiTestExecutionDailyStatModel,
     ApiTestExecutionModel,
     ApiTestScheduleModel
 )
+from api_auto_test.executor import BodyCapture, CaseExecutor, AsyncCaseExecutor, CaseFlakinessTracker
 from api_auto_test.parser.api_document_parser import ApiDocumentParser
 from constant.error_code import ErrorCode
 from project_decorator.request_decorators import valid_params_blank
 from tasks.api_test_tasks import ApiTestTaskService
+from tasks.schedule_tasks import ScheduleTaskService
 from utils.cos.cos_client import CosClient
 
 
@@ -817,7 +823,9 @@ class Service:
 
     @valid_params_blank(required_params_list=["project_id", "env_name", "base_url", "created_user_id", "created_user"])
     def create_api_test_environment(self, project_id, env_name, base_url, created_user_id, created_user,
-                                     description=None, timeout=30, headers=None, variables=None, is_default=False):
+                                     description=None, timeout=30, headers=None, variables=None, is_default=False,
+                                     concurrency=1, execution_engine=None, capture_policy=None,
+                                     coalesce_pending=False):
         """
         创建接口测试环境配置
         :param project_id: 所属项目id
@@ -830,6 +838,10 @@ class Service:
         :param headers: 公共请求头
         :param variables: 环境变量
         :param is_default: 是否为默认环境
+        :param concurrency: 用例并发数，1 表示串行执行
+        :param execution_engine: 执行引擎（0-同步执行，1-异步执行）
+        :param capture_policy: 请求/响应体采集策略，为空时使用默认策略
+        :param coalesce_pending: 是否合并重复的待执行任务
         :return:
         """
         response = {
@@ -839,6 +851,31 @@ class Service:
             "status_code": 200
         }
 
+        if execution_engine is None:
+            execution_engine = ApiTestEnvironmentModel.ExecutionEngine.SYNC
+        if execution_engine not in ApiTestEnvironmentModel.ExecutionEngine.values:
+            response["code"] = ErrorCode.PARAM_INVALID
+            response["message"] = "执行引擎无效"
+            response["status_code"] = 400
+            return response
+
+        if concurrency is None:
+            concurrency = 1
+        max_concurrency = self.get_max_concurrency(execution_engine)
+        if not isinstance(concurrency, int) or concurrency < 1 or concurrency > max_concurrency:
+            response["code"] = ErrorCode.PARAM_INVALID
+            response["message"] = f"用例并发数必须在 1-{max_concurrency} 之间"
+            response["status_code"] = 400
+            return response
+
+        if capture_policy is not None:
+            policy_error = BodyCapture.validate_policy(capture_policy)
+            if policy_error:
+                response["code"] = ErrorCode.PARAM_INVALID
+                response["message"] = policy_error
+                response["status_code"] = 400
+                return response
+
         try:
             with transaction.atomic():
                 # 如果设置为默认环境，先将该项目的其他环境设为非默认
@@ -858,6 +895,10 @@ class Service:
                     headers=headers,
                     variables=variables,
                     is_default=is_default,
+                    concurrency=concurrency,
+                    execution_engine=execution_engine,
+                    capture_policy=capture_policy,
+                    coalesce_pending=bool(coalesce_pending),
                     created_user_id=created_user_id,
                     created_user=created_user
                 )
@@ -937,6 +978,11 @@ class Service:
                     "headers": obj.headers,
                     "variables": obj.variables,
                     "is_default": obj.is_default,
+                    "concurrency": obj.concurrency,
+                    "execution_engine": obj.execution_engine,
+                    "execution_engine_label": obj.get_execution_engine_display(),
+                    "capture_policy": obj.capture_policy,
+                    "coalesce_pending": obj.coalesce_pending,
                     "created_user_id": obj.created_user_id,
                     "created_user": obj.created_user,
                     "created_at": timezone.localtime(obj.created_at).strftime("%Y-%m-%d %H:%M:%S") if obj.created_at else None,
@@ -964,7 +1010,9 @@ class Service:
 
     @valid_params_blank(required_params_list=["environment_id"])
     def update_api_test_environment(self, environment_id, env_name=None, description=None, base_url=None,
-                                     timeout=None, headers=None, variables=None, is_default=None):
+                                     timeout=None, headers=None, variables=None, is_default=None,
+                                     concurrency=None, execution_engine=None, capture_policy=None,
+                                     coalesce_pending=None):
         """
         更新接口测试环境配置
         :param environment_id: 环境配置id
@@ -975,6 +1023,10 @@ class Service:
         :param headers: 公共请求头
         :param variables: 环境变量
         :param is_default: 是否为默认环境
+        :param concurrency: 用例并发数
+        :param execution_engine: 执行引擎
+        :param capture_policy: 请求/响应体采集策略
+        :param coalesce_pending: 是否合并重复的待执行任务
         :return:
         """
         response = {
@@ -1014,6 +1066,39 @@ class Service:
                     environment.variables = variables
                     update_fields.append('variables')
 
+                if execution_engine is not None:
+                    if execution_engine not in ApiTestEnvironmentModel.ExecutionEngine.values:
+                        response["code"] = ErrorCode.PARAM_INVALID
+                        response["message"] = "执行引擎无效"
+                        response["status_code"] = 400
+                        return response
+                    environment.execution_engine = execution_engine
+                    update_fields.append('execution_engine')
+
+                if concurrency is not None:
+                    max_concurrency = self.get_max_concurrency(environment.execution_engine)
+                    if not isinstance(concurrency, int) or concurrency < 1 or concurrency > max_concurrency:
+                        response["code"] = ErrorCode.PARAM_INVALID
+                        response["message"] = f"用例并发数必须在 1-{max_concurrency} 之间"
+                        response["status_code"] = 400
+                        return response
+                    environment.concurrency = concurrency
+                    update_fields.append('concurrency')
+
+                if capture_policy is not None:
+                    policy_error = BodyCapture.validate_policy(capture_policy)
+                    if policy_error:
+                        response["code"] = ErrorCode.PARAM_INVALID
+                        response["message"] = policy_error
+                        response["status_code"] = 400
+                        return response
+                    environment.capture_policy = capture_policy
+                    update_fields.append('capture_policy')
+
+                if coalesce_pending is not None:
+                    environment.coalesce_pending = bool(coalesce_pending)
+                    update_fields.append('coalesce_pending')
+
                 if is_default is not None:
                     # 如果设置为默认环境，先将该项目的其他环境设为非默认
                     if is_default:
@@ -1055,6 +1140,17 @@ class Service:
             response["status_code"] = 500
             return response
 
+    @staticmethod
+    def get_max_concurrency(execution_engine):
+        """
+        获取执行引擎允许的最大用例并发数
+        :param execution_engine: 执行引擎
+        :return:
+        """
+        if execution_engine == ApiTestEnvironmentModel.ExecutionEngine.ASYNC:
+            return AsyncCaseExecutor.MAX_CONCURRENCY
+        return CaseExecutor.MAX_CONCURRENCY
+
     @valid_params_blank(required_params_list=["environment_id"])
     def delete_api_test_environment(self, environment_id):
         """
@@ -1097,13 +1193,14 @@ class Service:
     # ==================== 接口测试执行管理 ====================
 
     @valid_params_blank(required_params_list=["test_case_id", "env_id", "executed_user_id", "executed_user"])
-    def execute_api_test_case(self, test_case_id, env_id, executed_user_id, executed_user):
+    def execute_api_test_case(self, test_case_id, env_id, executed_user_id, executed_user, shard_count=1):
         """
         执行接口测试用例（创建执行记录并提交异步任务）
         :param test_case_id: 测试用例id
         :param env_id: 环境配置id
         :param executed_user_id: 执行人id
         :param executed_user: 执行人
+        :param shard_count: 分片数，大于 1 时将用例拆分到多个 worker 并行执行
         :return:
         """
         response = {
@@ -1113,6 +1210,14 @@ class Service:
             "status_code": 200
         }
 
+        if shard_count is None:
+            shard_count = 1
+        if not isinstance(shard_count, int) or shard_count < 1 or shard_count > ApiTestTaskService.MAX_SHARD_COUNT:
+            response["code"] = ErrorCode.PARAM_INVALID
+            response["message"] = f"分片数必须在 1-{ApiTestTaskService.MAX_SHARD_COUNT} 之间"
+            response["status_code"] = 400
+            return response
+
         try:
             # 验证测试用例是否存在
             test_case = ApiTestCaseModel.objects.get(id=test_case_id, deleted_at__isnull=True)
@@ -1120,32 +1225,28 @@ class Service:
             # 验证环境配置是否存在
             environment = ApiTestEnvironmentModel.objects.get(id=env_id, deleted_at__isnull=True)
 
-            # 创建执行记录
-            execution = ApiTestExecutionModel.objects.create(
-                test_case_id=test_case_id,
-                env_id=env_id,
-                status=ApiTestExecutionModel.ExecutionStatus.PENDING,
-                trigger_type=ApiTestExecutionModel.TriggerType.MANUAL,
-                executed_user_id=executed_user_id,
-                executed_user=executed_user
+            # 创建执行记录并提交异步任务（环境开启合并时复用已有的待执行记录）
+            execution, coalesced = ApiTestTaskService.submitExecution(
+                test_case_id,
+                env_id,
+                ApiTestExecutionModel.TriggerType.MANUAL,
+                executed_user_id,
+                executed_user,
+                shardCount=shard_count,
+                coalesce=environment.coalesce_pending
             )
 
-            # 提交异步任务
-            task = ApiTestTaskService.executeApiTestTask.delay(execution.id)
-
-            # 更新 Celery 任务 ID
-            execution.celery_task_id = task.id
-            execution.save(update_fields=['celery_task_id'])
-
             response["code"] = ErrorCode.SUCCESS
-            response["message"] = "执行任务已提交"
+            response["message"] = "已合并到待执行的相同任务" if coalesced else "执行任务已提交"
             response["data"] = {
                 "execution_id": execution.id,
-                "celery_task_id": task.id,
+                "celery_task_id": execution.celery_task_id,
+                "coalesced": coalesced,
                 "test_case_id": test_case_id,
                 "test_case_name": test_case.case_name,
                 "env_id": env_id,
                 "env_name": environment.env_name,
+                "shard_count": execution.shard_count,
                 "status": execution.status,
                 "status_label": execution.get_status_display()
             }
@@ -1170,6 +1271,284 @@ class Service:
             response["status_code"] = 500
             return response
 
+    @valid_params_blank(required_params_list=["execution_id", "executed_user_id", "executed_user"])
+    def rerun_failed_api_test_execution(self, execution_id, executed_user_id, executed_user):
+        """
+        重跑执行记录中的失败用例（同一测试用例、同一环境，只执行失败的用例）
+        :param execution_id: 原执行记录id
+        :param executed_user_id: 执行人id
+        :param executed_user: 执行人
+        :return:
+        """
+        response = {
+            "code": "",
+            "message": "",
+            "data": {},
+            "status_code": 200
+        }
+
+        try:
+            parent_execution = ApiTestExecutionModel.objects.get(id=execution_id)
+
+            if parent_execution.status not in [
+                ApiTestExecutionModel.ExecutionStatus.SUCCESS,
+                ApiTestExecutionModel.ExecutionStatus.FAILED
+            ]:
+                response["code"] = ErrorCode.PARAM_INVALID
+                response["message"] = "执行尚未完成，无法重跑失败用例"
+                response["status_code"] = 400
+                return response
+
+            failed_case_ids = list(dict.fromkeys(ApiTestCaseResultModel.objects.filter(
+                execution_id=execution_id,
+                status=ApiTestCaseResultModel.CaseStatus.FAIL
+            ).order_by("case_index").values_list("case_id", flat=True)))
+
+            if not failed_case_ids:
+                response["code"] = ErrorCode.PARAM_INVALID
+                response["message"] = "该执行记录没有失败的用例"
+                response["status_code"] = 400
+                return response
+
+            # 验证测试用例和环境配置仍然存在
+            test_case = ApiTestCaseModel.objects.get(id=parent_execution.test_case_id, deleted_at__isnull=True)
+            environment = ApiTestEnvironmentModel.objects.get(id=parent_execution.env_id, deleted_at__isnull=True)
+
+            execution, _ = ApiTestTaskService.submitExecution(
+                parent_execution.test_case_id,
+                parent_execution.env_id,
+                ApiTestExecutionModel.TriggerType.MANUAL,
+                executed_user_id,
+                executed_user,
+                parentExecutionId=parent_execution.id,
+                caseFilter=failed_case_ids
+            )
+
+            response["code"] = ErrorCode.SUCCESS
+            response["message"] = f"已提交重跑 {len(failed_case_ids)} 个失败用例"
+            response["data"] = {
+                "execution_id": execution.id,
+                "celery_task_id": execution.celery_task_id,
+                "parent_execution_id": parent_execution.id,
+                "test_case_id": test_case.id,
+                "test_case_name": test_case.case_name,
+                "env_id": environment.id,
+                "env_name": environment.env_name,
+                "case_filter": failed_case_ids,
+                "status": execution.status,
+                "status_label": execution.get_status_display()
+            }
+
+            return response
+
+        except ApiTestExecutionModel.DoesNotExist:
+            response["code"] = ErrorCode.PARAM_INVALID
+            response["message"] = "执行记录不存在"
+            response["status_code"] = 400
+            return response
+
+        except ApiTestCaseModel.DoesNotExist:
+            response["code"] = ErrorCode.PARAM_INVALID
+            response["message"] = "测试用例不存在"
+            response["status_code"] = 400
+            return response
+
+        except ApiTestEnvironmentModel.DoesNotExist:
+            response["code"] = ErrorCode.PARAM_INVALID
+            response["message"] = "环境配置不存在"
+            response["status_code"] = 400
+            return response
+
+        except Exception as e:
+            response["code"] = ErrorCode.SERVER_ERROR
+            response["message"] = f"服务器错误：{str(e)}"
+            response["status_code"] = 500
+            return response
+
+    @valid_params_blank(required_params_list=["test_case_ids", "env_ids", "executed_user_id", "executed_user"])
+    def execute_api_test_case_batch(self, test_case_ids, env_ids, executed_user_id, executed_user):
+        """
+        批量执行接口测试用例（测试用例 × 环境，每个组合创建一条执行记录）
+        :param test_case_ids: 测试用例id列表
+        :param env_ids: 环境配置id列表
+        :param executed_user_id: 执行人id
+        :param executed_user: 执行人
+        :return:
+        """
+        response = {
+            "code": "",
+            "message": "",
+            "data": {},
+            "status_code": 200
+        }
+
+        if not isinstance(test_case_ids, list) or not isinstance(env_ids, list):
+            response["code"] = ErrorCode.PARAM_INVALID
+            response["message"] = "test_case_ids 和 env_ids 必须为列表"
+            response["status_code"] = 400
+            return response
+
+        # 去重并保持顺序
+        test_case_ids = list(dict.fromkeys(test_case_ids))
+        env_ids = list(dict.fromkeys(env_ids))
+
+        execution_count = len(test_case_ids) * len(env_ids)
+        if execution_count > ApiTestTaskService.MAX_BATCH_EXECUTION_COUNT:
+            response["code"] = ErrorCode.PARAM_INVALID
+            response["message"] = f"单次批量执行最多 {ApiTestTaskService.MAX_BATCH_EXECUTION_COUNT} 个组合，当前 {execution_count} 个"
+            response["status_code"] = 400
+            return response
+
+        try:
+            # 每类 id 一次查询完成校验
+            test_case_name_map = dict(ApiTestCaseModel.objects.filter(
+                id__in=test_case_ids,
+                deleted_at__isnull=True
+            ).values_list("id", "case_name"))
+            env_name_map = dict(ApiTestEnvironmentModel.objects.filter(
+                id__in=env_ids,
+                deleted_at__isnull=True
+            ).values_list("id", "env_name"))
+
+            missing_test_case_ids = [test_case_id for test_case_id in test_case_ids if test_case_id not in test_case_name_map]
+            missing_env_ids = [env_id for env_id in env_ids if env_id not in env_name_map]
+            if missing_test_case_ids or missing_env_ids:
+                response["code"] = ErrorCode.PARAM_INVALID
+                response["message"] = "测试用例或环境配置不存在"
+                response["data"] = {
+                    "missing_test_case_ids": missing_test_case_ids,
+                    "missing_env_ids": missing_env_ids
+                }
+                response["status_code"] = 400
+                return response
+
+            pairs = [(test_case_id, env_id) for test_case_id in test_case_ids for env_id in env_ids]
+            batch_id, executions = ApiTestTaskService.submitExecutionBatch(
+                pairs,
+                ApiTestExecutionModel.TriggerType.MANUAL,
+                executed_user_id,
+                executed_user
+            )
+
+            response["code"] = ErrorCode.SUCCESS
+            response["message"] = f"已提交 {len(executions)} 个执行任务"
+            response["data"] = {
+                "batch_id": batch_id,
+                "execution_count": len(executions),
+                "executions": [
+                    {
+                        "execution_id": execution.id,
+                        "celery_task_id": execution.celery_task_id,
+                        "test_case_id": execution.test_case_id,
+                        "test_case_name": test_case_name_map.get(execution.test_case_id),
+                        "env_id": execution.env_id,
+                        "env_name": env_name_map.get(execution.env_id)
+                    }
+                    for execution in executions
+                ]
+            }
+
+            return response
+
+        except Exception as e:
+            response["code"] = ErrorCode.SERVER_ERROR
+            response["message"] = f"服务器错误：{str(e)}"
+            response["status_code"] = 500
+            return response
+
+    @valid_params_blank(required_params_list=["batch_id"])
+    def get_api_test_execution_batch_progress(self, batch_id):
+        """
+        获取批量执行的汇总进度
+        :param batch_id: 批次id
+        :return:
+        """
+        response = {
+            "code": "",
+            "message": "",
+            "data": {},
+            "status_code": 200
+        }
+
+        try:
+            query_set = ApiTestExecutionModel.objects.filter(batch_id=batch_id)
+
+            # 按状态聚合，一次查询得到各状态的执行数和用例数
+            status_rows = query_set.values("status").annotate(
+                count=Count("id"),
+                total_cases=Sum("total_cases"),
+                passed_cases=Sum("passed_cases"),
+                failed_cases=Sum("failed_cases")
+            )
+
+            status_count_map = {status: 0 for status in ApiTestExecutionModel.ExecutionStatus.values}
+            total_cases = 0
+            passed_cases = 0
+            failed_cases = 0
+            for row in status_rows:
+                status_count_map[row["status"]] = row["count"]
+                total_cases += row["total_cases"] or 0
+                passed_cases += row["passed_cases"] or 0
+                failed_cases += row["failed_cases"] or 0
+
+            execution_count = sum(status_count_map.values())
+            if not execution_count:
+                response["code"] = ErrorCode.PARAM_INVALID
+                response["message"] = "批次不存在"
+                response["status_code"] = 400
+                return response
+
+            finished_count = (
+                status_count_map[ApiTestExecutionModel.ExecutionStatus.SUCCESS]
+                + status_count_map[ApiTestExecutionModel.ExecutionStatus.FAILED]
+            )
+            finished_cases = passed_cases + failed_cases
+
+            executions = []
+            for execution in query_set.order_by("id").values(
+                "id", "test_case_id", "env_id", "status", "total_cases",
+                "passed_cases", "failed_cases", "pass_rate", "report_url"
+            ):
+                executions.append({
+                    "execution_id": execution["id"],
+                    "test_case_id": execution["test_case_id"],
+                    "env_id": execution["env_id"],
+                    "status": execution["status"],
+                    "status_label": ApiTestExecutionModel.ExecutionStatus(execution["status"]).label,
+                    "total_cases": execution["total_cases"],
+                    "passed_cases": execution["passed_cases"],
+                    "failed_cases": execution["failed_cases"],
+                    "pass_rate": float(execution["pass_rate"]) if execution["pass_rate"] is not None else None,
+                    "report_url": execution["report_url"]
+                })
+
+            response["code"] = ErrorCode.SUCCESS
+            response["message"] = "查询成功"
+            response["data"] = {
+                "batch_id": batch_id,
+                "execution_count": execution_count,
+                "pending_count": status_count_map[ApiTestExecutionModel.ExecutionStatus.PENDING],
+                "running_count": status_count_map[ApiTestExecutionModel.ExecutionStatus.RUNNING],
+                "success_count": status_count_map[ApiTestExecutionModel.ExecutionStatus.SUCCESS],
+                "failed_count": status_count_map[ApiTestExecutionModel.ExecutionStatus.FAILED],
+                "finished_count": finished_count,
+                "is_finished": finished_count == execution_count,
+                "progress": round(finished_count / execution_count * 100, 2),
+                "total_cases": total_cases,
+                "passed_cases": passed_cases,
+                "failed_cases": failed_cases,
+                "case_progress": round(finished_cases / total_cases * 100, 2) if total_cases else 0,
+                "executions": executions
+            }
+
+            return response
+
+        except Exception as e:
+            response["code"] = ErrorCode.SERVER_ERROR
+            response["message"] = f"服务器错误：{str(e)}"
+            response["status_code"] = 500
+            return response
+
     @valid_params_blank(required_params_list=["execution_id"])
     def get_api_test_execution_status(self, execution_id):
         """
@@ -1187,6 +1566,10 @@ class Service:
         try:
             execution = ApiTestExecutionModel.objects.get(id=execution_id)
 
+            # 执行中的计数随用例结果分批写入实时更新
+            total_cases = execution.total_cases or 0
+            finished_cases = (execution.passed_cases or 0) + (execution.failed_cases or 0)
+
             response["code"] = ErrorCode.SUCCESS
             response["message"] = "查询成功"
             response["data"] = {
@@ -1196,8 +1579,11 @@ class Service:
                 "total_cases": execution.total_cases,
                 "passed_cases": execution.passed_cases,
                 "failed_cases": execution.failed_cases,
+                "finished_cases": finished_cases,
+                "progress": round(finished_cases / total_cases * 100, 2) if total_cases else 0,
                 "pass_rate": float(execution.pass_rate) if execution.pass_rate else None,
                 "report_url": execution.report_url,
+                "viewer_report_url": execution.viewer_report_url,
                 "error_message": execution.error_message,
                 "started_at": timezone.localtime(execution.started_at).strftime("%Y-%m-%d %H:%M:%S") if execution.started_at else None,
                 "finished_at": timezone.localtime(execution.finished_at).strftime("%Y-%m-%d %H:%M:%S") if execution.finished_at else None,
@@ -1219,7 +1605,8 @@ class Service:
             return response
 
     @valid_params_blank(required_params_list=["page", "page_size"])
-    def get_api_test_execution_history(self, page, page_size, test_case_id=None, project_id=None, status=None, trigger_type=None, has_report=None):
+    def get_api_test_execution_history(self, page, page_size, test_case_id=None, project_id=None, status=None, trigger_type=None, has_report=None,
+                                       archived=False):
         """
         获取执行历史记录列表
         :param page: 页码
@@ -1229,6 +1616,7 @@ class Service:
         :param status: 执行状态
         :param trigger_type: 触发类型
         :param has_report: 是否有报告
+        :param archived: 是否查询已归档的执行记录（超过保留天数的记录）
         :return:
         """
         response = {
@@ -1274,7 +1662,9 @@ class Service:
             if has_report:
                 filter_map["report_url__isnull"] = False
 
-            query_set = ApiTestExecutionModel.objects.filter(**filter_map).order_by('-created_at')
+            # 超过保留天数的执行记录已移入归档表，按需查询
+            execution_model = ApiTestExecutionArchiveModel if archived else ApiTestExecutionModel
+            query_set = execution_model.objects.filter(**filter_map).order_by('-created_at')
 
             # 如果需要有报告的记录，排除空字符串
             if has_report:
@@ -1321,17 +1711,20 @@ class Service:
                     "status_label": obj.get_status_display(),
                     "trigger_type": obj.trigger_type,
                     "trigger_type_label": obj.get_trigger_type_display(),
+                    "parent_execution_id": obj.parent_execution_id,
                     "total_cases": obj.total_cases,
                     "passed_cases": obj.passed_cases,
                     "failed_cases": obj.failed_cases,
                     "pass_rate": float(obj.pass_rate) if obj.pass_rate else None,
                     "report_url": obj.report_url,
+                    "viewer_report_url": obj.viewer_report_url,
                     "started_at": timezone.localtime(obj.started_at).strftime("%Y-%m-%d %H:%M:%S") if obj.started_at else None,
                     "finished_at": timezone.localtime(obj.finished_at).strftime("%Y-%m-%d %H:%M:%S") if obj.finished_at else None,
                     "duration": obj.duration,
                     "executed_user_id": obj.executed_user_id,
                     "executed_user": obj.executed_user,
-                    "created_at": timezone.localtime(obj.created_at).strftime("%Y-%m-%d %H:%M:%S") if obj.created_at else None
+                    "created_at": timezone.localtime(obj.created_at).strftime("%Y-%m-%d %H:%M:%S") if obj.created_at else None,
+                    "archived": bool(archived)
                 }
                 results.append(item)
 
@@ -1354,10 +1747,13 @@ class Service:
             return response
 
     @valid_params_blank(required_params_list=["execution_id"])
-    def get_api_test_execution_detail(self, execution_id):
+    def get_api_test_execution_detail(self, execution_id, case_cursor=-1, case_page_size=100):
         """
         获取执行记录详情
+        用例结果按 case_index 游标分页（case_index > case_cursor），大执行记录不会一次读取全部用例结果
         :param execution_id: 执行记录id
+        :param case_cursor: 用例结果游标，上一页返回的 next_case_cursor，首页为 -1
+        :param case_page_size: 每页用例结果数
         :return:
         """
         response = {
@@ -1367,8 +1763,27 @@ class Service:
             "status_code": 200
         }
 
+        if not isinstance(case_cursor, int) or not isinstance(case_page_size, int):
+            response["code"] = ErrorCode.PARAM_INVALID
+            response["message"] = "参数类型错误"
+            response["status_code"] = 400
+            return response
+
+        if case_page_size < 1:
+            case_page_size = 100
+        if case_page_size > 500:
+            case_page_size = 500
+
         try:
-            execution = ApiTestExecutionModel.objects.get(id=execution_id)
+            archived = False
+            try:
+                execution = ApiTestExecutionModel.objects.get(id=execution_id)
+            except ApiTestExecutionModel.DoesNotExist:
+                # 已归档的执行记录从归档表读取（用例结果明细已随归档删除）
+                execution = ApiTestExecutionArchiveModel.objects.filter(id=execution_id).first()
+                if execution is None:
+                    raise
+                archived = True
 
             # 获取关联的测试用例
             try:
@@ -1388,6 +1803,26 @@ class Service:
                 env_name = None
                 env_base_url = None
 
+            # 已完成的用例结果（不含步骤详情，步骤详情见测试报告），多取一条判断是否还有下一页
+            case_results = []
+            case_result_list = list(ApiTestCaseResultModel.objects.filter(
+                execution_id=execution.id,
+                case_index__gt=case_cursor
+            ).order_by('case_index').values(
+                'case_index', 'case_id', 'case_name', 'status', 'duration', 'error_message'
+            )[:case_page_size + 1])
+            has_more = len(case_result_list) > case_page_size
+            for case_result in case_result_list[:case_page_size]:
+                case_results.append({
+                    "case_index": case_result["case_index"],
+                    "case_id": case_result["case_id"],
+                    "case_name": case_result["case_name"],
+                    "status": case_result["status"],
+                    "status_label": ApiTestCaseResultModel.CaseStatus(case_result["status"]).label,
+                    "duration": round(case_result["duration"], 3),
+                    "error_message": case_result["error_message"]
+                })
+
             response["code"] = ErrorCode.SUCCESS
             response["message"] = "查询成功"
             response["data"] = {
@@ -1404,11 +1839,22 @@ class Service:
                 "trigger_type_label": execution.get_trigger_type_display(),
                 "scheduled_task_id": execution.scheduled_task_id,
                 "celery_task_id": execution.celery_task_id,
+                "shard_count": execution.shard_count,
+                "coalesced_count": execution.coalesced_count,
+                "parent_execution_id": execution.parent_execution_id,
+                "case_filter": execution.case_filter,
                 "total_cases": execution.total_cases,
                 "passed_cases": execution.passed_cases,
                 "failed_cases": execution.failed_cases,
                 "pass_rate": float(execution.pass_rate) if execution.pass_rate else None,
                 "report_url": execution.report_url,
+                "viewer_report_url": execution.viewer_report_url,
+                "junit_report_url": execution.junit_report_url,
+                "json_report_url": execution.json_report_url,
+                "report_size": execution.report_size,
+                "report_compressed_size": execution.report_compressed_size,
+                "load_metrics": execution.load_metrics,
+                "network_timings": execution.network_timings,
                 "error_message": execution.error_message,
                 "started_at": timezone.localtime(execution.started_at).strftime("%Y-%m-%d %H:%M:%S") if execution.started_at else None,
                 "finished_at": timezone.localtime(execution.finished_at).strftime("%Y-%m-%d %H:%M:%S") if execution.finished_at else None,
@@ -1416,7 +1862,11 @@ class Service:
                 "executed_user_id": execution.executed_user_id,
                 "executed_user": execution.executed_user,
                 "created_at": timezone.localtime(execution.created_at).strftime("%Y-%m-%d %H:%M:%S") if execution.created_at else None,
-                "updated_at": timezone.localtime(execution.updated_at).strftime("%Y-%m-%d %H:%M:%S") if execution.updated_at else None
+                "updated_at": timezone.localtime(execution.updated_at).strftime("%Y-%m-%d %H:%M:%S") if execution.updated_at else None,
+                "archived": archived,
+                "case_results": case_results,
+                "case_page_size": case_page_size,
+                "next_case_cursor": case_results[-1]["case_index"] if has_more else None
             }
 
             return response
@@ -1433,6 +1883,189 @@ class Service:
             response["status_code"] = 500
             return response
 
+    @valid_params_blank(required_params_list=["project_id"])
+    def get_api_test_execution_trend(self, project_id, days=30, test_case_id=None, env_id=None):
+        """
+        获取执行趋势（按天汇总执行次数、成功率、平均耗时）
+        数据来自执行结束时增量更新的每日统计表，不扫描执行记录
+        :param project_id: 项目id
+        :param days: 统计天数（1-365，含今天）
+        :param test_case_id: 测试用例id
+        :param env_id: 环境配置id
+        :return:
+        """
+        response = {
+            "code": "",
+            "message": "",
+            "data": {},
+            "status_code": 200
+        }
+
+        if not isinstance(days, int) or days < 1 or days > 365:
+            response["code"] = ErrorCode.PARAM_INVALID
+            response["message"] = "统计天数必须在 1-365 之间"
+            response["status_code"] = 400
+            return response
+
+        try:
+            end_date = timezone.localdate()
+            start_date = end_date - timedelta(days=days - 1)
+
+            filter_map = {
+                "project_id": project_id,
+                "stat_date__gte": start_date,
+                "stat_date__lte": end_date
+            }
+            if test_case_id:
+                filter_map["test_case_id"] = test_case_id
+            if env_id:
+                filter_map["env_id"] = env_id
+
+            day_rows = ApiTestExecutionDailyStatModel.objects.filter(**filter_map).values("stat_date").annotate(
+                run_count=Sum("run_count"),
+                passed_count=Sum("passed_count"),
+                failed_count=Sum("failed_count"),
+                total_cases=Sum("total_cases"),
+                passed_cases=Sum("passed_cases"),
+                total_duration=Sum("total_duration")
+            )
+            day_map = {row["stat_date"]: row for row in day_rows}
+
+            def build_item(row):
+                run_count = row["run_count"] or 0
+                total_cases = row["total_cases"] or 0
+                return {
+                    "run_count": run_count,
+                    "passed_count": row["passed_count"] or 0,
+                    "failed_count": row["failed_count"] or 0,
+                    "pass_rate": round((row["passed_count"] or 0) / run_count * 100, 2) if run_count else None,
+                    "case_pass_rate": round((row["passed_cases"] or 0) / total_cases * 100, 2) if total_cases else None,
+                    "avg_duration": round((row["total_duration"] or 0) / run_count, 2) if run_count else None
+                }
+
+            # 没有执行的日期补 0，前端可直接绘制连续的折线
+            empty_row = {
+                "run_count": 0, "passed_count": 0, "failed_count": 0,
+                "total_cases": 0, "passed_cases": 0, "total_duration": 0
+            }
+            summary_row = dict(empty_row)
+            trend = []
+            for offset in range(days):
+                stat_date = start_date + timedelta(days=offset)
+                row = day_map.get(stat_date, empty_row)
+                for key in summary_row:
+                    summary_row[key] += row[key] or 0
+                item = build_item(row)
+                item["date"] = stat_date.strftime("%Y-%m-%d")
+                trend.append(item)
+
+            response["code"] = ErrorCode.SUCCESS
+            response["message"] = "查询成功"
+            response["data"] = {
+                "project_id": project_id,
+                "test_case_id": test_case_id,
+                "env_id": env_id,
+                "start_date": start_date.strftime("%Y-%m-%d"),
+                "end_date": end_date.strftime("%Y-%m-%d"),
+                "summary": build_item(summary_row),
+                "trend": trend
+            }
+
+            return response
+
+        except Exception as e:
+            response["code"] = ErrorCode.SERVER_ERROR
+            response["message"] = f"服务器错误：{str(e)}"
+            response["status_code"] = 500
+            return response
+
+    @valid_params_blank(required_params_list=["project_id"])
+    def get_api_test_flaky_cases(self, project_id, limit=20, env_id=None, test_case_id=None, min_runs=5):
+        """
+        获取项目下最不稳定的用例（通过/失败频繁切换）
+        数据来自执行结束时增量更新的用例稳定性统计，按不稳定分数倒序
+        :param project_id: 项目id
+        :param limit: 返回数量（1-100）
+        :param env_id: 环境配置id
+        :param test_case_id: 测试用例id
+        :param min_runs: 最少执行次数，执行次数不足的用例不参与排序
+        :return:
+        """
+        response = {
+            "code": "",
+            "message": "",
+            "data": {},
+            "status_code": 200
+        }
+
+        if not isinstance(limit, int) or limit < 1 or limit > 100:
+            response["code"] = ErrorCode.PARAM_INVALID
+            response["message"] = "返回数量必须在 1-100 之间"
+            response["status_code"] = 400
+            return response
+
+        try:
+            filter_map = {
+                "project_id": project_id,
+                "flakiness_score__gt": 0,
+                "window_size__gte": max(min_runs or 0, 2)
+            }
+            if env_id:
+                filter_map["env_id"] = env_id
+            if test_case_id:
+                filter_map["test_case_id"] = test_case_id
+
+            flaky_list = list(
+                ApiTestCaseFlakinessModel.objects.filter(**filter_map).order_by('-flakiness_score', '-run_count')[:limit]
+            )
+
+            # 批量获取关联数据，避免 N+1 查询
+            test_cases_map = {}
+            test_case_ids = set(obj.test_case_id for obj in flaky_list)
+            if test_case_ids:
+                test_cases_map = dict(
+                    ApiTestCaseModel.objects.filter(id__in=test_case_ids).values_list('id', 'case_name')
+                )
+
+            environments_map = {}
+            env_ids = set(obj.env_id for obj in flaky_list)
+            if env_ids:
+                environments_map = dict(
+                    ApiTestEnvironmentModel.objects.filter(id__in=env_ids).values_list('id', 'env_name')
+                )
+
+            results = []
+            for obj in flaky_list:
+                results.append({
+                    "test_case_id": obj.test_case_id,
+                    "test_case_name": test_cases_map.get(obj.test_case_id),
+                    "env_id": obj.env_id,
+                    "env_name": environments_map.get(obj.env_id),
+                    "case_id": obj.case_id,
+                    "case_name": obj.case_name,
+                    "flakiness_score": obj.flakiness_score,
+                    "run_count": obj.run_count,
+                    "fail_count": obj.fail_count,
+                    "recent_outcomes": CaseFlakinessTracker.recent_outcomes(obj.outcome_bits, obj.window_size),
+                    "last_execution_id": obj.last_execution_id,
+                    "updated_at": timezone.localtime(obj.updated_at).strftime("%Y-%m-%d %H:%M:%S") if obj.updated_at else None
+                })
+
+            response["code"] = ErrorCode.SUCCESS
+            response["message"] = "查询成功"
+            response["data"] = {
+                "project_id": project_id,
+                "results": results
+            }
+
+            return response
+
+        except Exception as e:
+            response["code"] = ErrorCode.SERVER_ERROR
+            response["message"] = f"服务器错误：{str(e)}"
+            response["status_code"] = 500
+            return response
+
     # ==================== 接口测试定时任务管理 ====================
 
     @valid_params_blank(required_params_list=[
@@ -1441,7 +2074,7 @@ class Service:
     ])
     def create_api_test_schedule(self, project_id, task_name, test_case_id, env_id,
                                   schedule_type, schedule_time, created_user_id, created_user,
-                                  description=None, schedule_weekday=None, is_enabled=True):
+                                  description=None, schedule_weekday=None, is_enabled=True, spread_window=0):
         """
         创建接口测试定时任务
         :param project_id: 所属项目id
@@ -1455,6 +2088,7 @@ class Service:
         :param description: 任务描述
         :param schedule_weekday: 执行星期（1-7，仅 weekly 类型使用）
         :param is_enabled: 是否启用
+        :param spread_window: 错峰窗口（分钟），0 表示准点执行
         :return:
         """
         response = {
@@ -1484,33 +2118,15 @@ class Service:
                 response["status_code"] = 400
                 return response
 
-            # 计算下次执行时间
-            now = timezone.now()
-            local_now = timezone.localtime(now)
-
-            if schedule_type == ApiTestScheduleModel.ScheduleType.DAILY:
-                # 今天的执行时间
-                if local_now.time() >= schedule_time:
-                    # 今天已过执行时间，下次执行是明天
-                    next_date = local_now.date() + timedelta(days=1)
-                else:
-                    next_date = local_now.date()
-                next_execution_time = timezone.make_aware(
-                    datetime.combine(next_date, schedule_time)
-                )
-            else:
-                # 每周执行
-                current_weekday = local_now.isoweekday()
-                days_until = (schedule_weekday - current_weekday + 7) % 7
-                if days_until == 0 and local_now.time() >= schedule_time:
-                    days_until = 7
-                next_date = local_now.date() + timedelta(days=days_until)
-                next_execution_time = timezone.make_aware(
-                    datetime.combine(next_date, schedule_time)
-                )
+            spread_window = spread_window or 0
+            if not isinstance(spread_window, int) or spread_window < 0 or spread_window > ScheduleTaskService.MAX_SPREAD_WINDOW:
+                response["code"] = ErrorCode.PARAM_INVALID
+                response["message"] = f"错峰窗口必须在 0-{ScheduleTaskService.MAX_SPREAD_WINDOW} 分钟之间"
+                response["status_code"] = 400
+                return response
 
             # 创建定时任务
-            schedule = ApiTestScheduleModel.objects.create(
+            schedule = ApiTestScheduleModel(
                 project_id=project_id,
                 task_name=task_name,
                 description=description,
@@ -1520,10 +2136,20 @@ class Service:
                 schedule_time=schedule_time,
                 schedule_weekday=schedule_weekday,
                 is_enabled=is_enabled,
-                next_execution_time=next_execution_time if is_enabled else None,
+                spread_window=spread_window,
                 created_user_id=created_user_id,
                 created_user=created_user
             )
+            schedule.save()
+
+            # 计算下次执行时间（错峰偏移依赖定时任务 id，创建后再计算）
+            next_execution_time = None
+            if is_enabled:
+                next_execution_time = ScheduleTaskService.calculateNextExecutionTime(
+                    schedule, timezone.localtime(timezone.now())
+                )
+                schedule.next_execution_time = next_execution_time
+                schedule.save(update_fields=['next_execution_time'])
 
             response["code"] = ErrorCode.SUCCESS
             response["message"] = "创建成功"
@@ -1644,10 +2270,12 @@ class Service:
                     "schedule_type_label": obj.get_schedule_type_display(),
                     "schedule_time": obj.schedule_time.strftime("%H:%M") if obj.schedule_time else None,
                     "schedule_weekday": obj.schedule_weekday,
+                    "spread_window": obj.spread_window,
                     "is_enabled": obj.is_enabled,
                     "last_execution_time": timezone.localtime(obj.last_execution_time).strftime("%Y-%m-%d %H:%M:%S") if obj.last_execution_time else None,
                     "last_execution_status": obj.last_execution_status,
                     "last_execution_status_label": obj.get_last_execution_status_display() if obj.last_execution_status is not None else None,
+                    "last_execution_id": obj.last_execution_id,
                     "next_execution_time": timezone.localtime(obj.next_execution_time).strftime("%Y-%m-%d %H:%M:%S") if obj.next_execution_time else None,
                     "created_user_id": obj.created_user_id,
                     "created_user": obj.created_user,
@@ -1676,7 +2304,8 @@ class Service:
 
     @valid_params_blank(required_params_list=["schedule_id"])
     def update_api_test_schedule(self, schedule_id, task_name=None, description=None, test_case_id=None,
-                                  env_id=None, schedule_type=None, schedule_time=None, schedule_weekday=None):
+                                  env_id=None, schedule_type=None, schedule_time=None, schedule_weekday=None,
+                                  spread_window=None):
         """
         更新定时任务配置
         :param schedule_id: 定时任务id
@@ -1687,6 +2316,7 @@ class Service:
         :param schedule_type: 调度类型
         :param schedule_time: 执行时间
         :param schedule_weekday: 执行星期
+        :param spread_window: 错峰窗口（分钟）
         :return:
         """
         response = {
@@ -1737,6 +2367,16 @@ class Service:
                 update_fields.append('schedule_weekday')
                 need_recalc_next_time = True
 
+            if spread_window is not None:
+                if not isinstance(spread_window, int) or spread_window < 0 or spread_window > ScheduleTaskService.MAX_SPREAD_WINDOW:
+                    response["code"] = ErrorCode.PARAM_INVALID
+                    response["message"] = f"错峰窗口必须在 0-{ScheduleTaskService.MAX_SPREAD_WINDOW} 分钟之间"
+                    response["status_code"] = 400
+                    return response
+                schedule.spread_window = spread_window
+                update_fields.append('spread_window')
+                need_recalc_next_time = True
+
             if not update_fields:
                 response["code"] = ErrorCode.PARAM_BLANK
                 response["message"] = "没有需要更新的字段"
@@ -1745,28 +2385,9 @@ class Service:
 
             # 重新计算下次执行时间
             if need_recalc_next_time and schedule.is_enabled:
-                now = timezone.now()
-                local_now = timezone.localtime(now)
-                exec_time = schedule.schedule_time
-
-                if schedule.schedule_type == ApiTestScheduleModel.ScheduleType.DAILY:
-                    if local_now.time() >= exec_time:
-                        next_date = local_now.date() + timedelta(days=1)
-                    else:
-                        next_date = local_now.date()
-                    schedule.next_execution_time = timezone.make_aware(
-                        datetime.combine(next_date, exec_time)
-                    )
-                else:
-                    current_weekday = local_now.isoweekday()
-                    weekday = schedule.schedule_weekday or 1
-                    days_until = (weekday - current_weekday + 7) % 7
-                    if days_until == 0 and local_now.time() >= exec_time:
-                        days_until = 7
-                    next_date = local_now.date() + timedelta(days=days_until)
-                    schedule.next_execution_time = timezone.make_aware(
-                        datetime.combine(next_date, exec_time)
-                    )
+                schedule.next_execution_time = ScheduleTaskService.calculateNextExecutionTime(
+                    schedule, timezone.localtime(timezone.now())
+                )
                 update_fields.append('next_execution_time')
 
             schedule.save(update_fields=update_fields)
@@ -1827,28 +2448,9 @@ class Service:
 
             # 如果启用，重新计算下次执行时间
             if is_enabled:
-                now = timezone.now()
-                local_now = timezone.localtime(now)
-                exec_time = schedule.schedule_time
-
-                if schedule.schedule_type == ApiTestScheduleModel.ScheduleType.DAILY:
-                    if local_now.time() >= exec_time:
-                        next_date = local_now.date() + timedelta(days=1)
-                    else:
-                        next_date = local_now.date()
-                    schedule.next_execution_time = timezone.make_aware(
-                        datetime.combine(next_date, exec_time)
-                    )
-                else:
-                    current_weekday = local_now.isoweekday()
-                    weekday = schedule.schedule_weekday or 1
-                    days_until = (weekday - current_weekday + 7) % 7
-                    if days_until == 0 and local_now.time() >= exec_time:
-                        days_until = 7
-                    next_date = local_now.date() + timedelta(days=days_until)
-                    schedule.next_execution_time = timezone.make_aware(
-                        datetime.combine(next_date, exec_time)
-                    )
+                schedule.next_execution_time = ScheduleTaskService.calculateNextExecutionTime(
+                    schedule, timezone.localtime(timezone.now())
+                )
             else:
                 schedule.next_execution_time = None
 
@@ -1934,29 +2536,34 @@ class Service:
         try:
             schedule = ApiTestScheduleModel.objects.get(id=schedule_id, deleted_at__isnull=True)
 
-            # 创建执行记录
-            execution = ApiTestExecutionModel.objects.create(
-                test_case_id=schedule.test_case_id,
-                env_id=schedule.env_id,
-                status=ApiTestExecutionModel.ExecutionStatus.PENDING,
-                trigger_type=ApiTestExecutionModel.TriggerType.MANUAL,
-                scheduled_task_id=schedule.id,
-                executed_user_id=executed_user_id,
-                executed_user=executed_user
-            )
-
-            # 提交异步任务
-            task = ApiTestTaskService.executeApiTestTask.delay(execution.id)
+            coalesce = ApiTestEnvironmentModel.objects.filter(
+                id=schedule.env_id
+            ).values_list('coalesce_pending', flat=True).first()
 
-            # 更新 Celery 任务 ID
-            execution.celery_task_id = task.id
-            execution.save(update_fields=['celery_task_id'])
+            # 创建执行记录并提交异步任务（环境开启合并时复用已有的待执行记录），
+            # 同一事务内关联到定时任务，任务在事务提交后才投递，worker 更新状态时一定能匹配到 last_execution_id
+            with transaction.atomic():
+                execution, coalesced = ApiTestTaskService.submitExecution(
+                    schedule.test_case_id,
+                    schedule.env_id,
+                    ApiTestExecutionModel.TriggerType.MANUAL,
+                    executed_user_id,
+                    executed_user,
+                    scheduledTaskId=schedule.id,
+                    coalesce=bool(coalesce)
+                )
+                ApiTestScheduleModel.objects.filter(id=schedule.id).update(
+                    last_execution_id=execution.id,
+                    last_execution_time=timezone.now(),
+                    last_execution_status=ApiTestScheduleModel.ExecutionStatus.PENDING
+                )
 
             response["code"] = ErrorCode.SUCCESS
-            response["message"] = "触发成功"
+            response["message"] = "已合并到待执行的相同任务" if coalesced else "触发成功"
             response["data"] = {
                 "execution_id": execution.id,
-                "celery_task_id": task.id,
+                "celery_task_id": execution.celery_task_id,
+                "coalesced": coalesced,
                 "schedule_id": schedule_id,
                 "task_name": schedule.task_name
             }
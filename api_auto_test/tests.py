@@ -0,0 +1,629 @@
+import gzip
+import importlib.util
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import xml.etree.ElementTree as ElementTree
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock, skipUnless
+
+import yaml
+from django.test import SimpleTestCase, TestCase
+
+from api_auto_test.executor import (
+    AsyncCaseExecutor, AsyncClientPool, CaseExecutor, CaseFlakinessTracker, LatencyHistogram,
+    StepTimingAggregator, SuiteRunner, TestCaseFileCache
+)
+from api_auto_test.models import ApiTestCaseResultModel, ApiTestExecutionModel
+from api_auto_test.service import Service
+from utils.report import HtmlReportWriter, JsonResultWriter, JUnitXmlWriter, LazyReportWriter
+
+
+class FakeVarHandler:
+    """与 YAMLTestRunner 的 var_handler 接口一致的变量处理器"""
+
+    def __init__(self, config):
+        self.config = config
+
+    def replace_variables(self, data):
+        return data
+
+
+class FakeRunner:
+    """初始化时根据 config 派生会话状态的 runner，记录实际发出的请求"""
+
+    def __init__(self, yaml_path):
+        with open(yaml_path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f)
+        self.config = data['config']
+        self.cases = data['cases']
+        self.base_url = self.config['base_url']
+        self.session_headers = dict(self.config.get('headers') or {})
+        self.var_handler = FakeVarHandler(self.config)
+        self.sent = []
+
+    def get_cases(self):
+        return self.cases
+
+    def execute_step(self, step):
+        request = step['request']
+        time.sleep(request.get('delay', 0))
+        self.sent.append({
+            'url': self.base_url + request['endpoint'],
+            'headers': {**self.session_headers, **(request.get('headers') or {})}
+        })
+        return request.get('status_code', 200) == 200, {'status_code': request.get('status_code', 200), 'data': {}}, None
+
+
+def create_fake_runner(workDir, cases):
+    """将用例写入 YAML 文件并创建 FakeRunner"""
+    yamlPath = os.path.join(workDir, 'suite.yaml')
+    with open(yamlPath, 'w', encoding='utf-8') as f:
+        yaml.dump({'config': {'base_url': 'http://fake.example.com'}, 'cases': cases}, f)
+    return FakeRunner(yamlPath)
+
+
+def build_case_result(index, status='PASS'):
+    """构造 HtmlReportGenerator.add_case_result 格式的用例结果"""
+    return {
+        'case_id': f'C{index}',
+        'case_name': f'case {index}',
+        'status': status,
+        'duration': 0.5,
+        'error_message': '' if status == 'PASS' else 'status_code 不等于 200',
+        'steps': [{
+            'name': 'get',
+            'status': status,
+            'error_message': '' if status == 'PASS' else 'status_code 不等于 200',
+            'request': {'method': 'GET', 'url': f'http://fake.example.com/items/{index}', 'headers': {}, 'body': {}},
+            'response': {'status_code': 200 if status == 'PASS' else 500, 'body': {}},
+            'timings': {'connect': None, 'tls': None, 'send': None, 'ttfb': 10.0, 'download': 1.0, 'total': 11.0}
+        }]
+    }
+
+
+class SuiteDefinitionTest(SimpleTestCase):
+    """SuiteDefinition 叠加环境配置测试"""
+
+    YAML_DATA = {
+        'config': {'base_url': 'http://yaml.example.com', 'headers': {'X-Env': 'yaml'}},
+        'cases': [{
+            'case': 'C1',
+            'name': 'ping',
+            'steps': [{'name': 'ping', 'request': {'method': 'GET', 'endpoint': '/ping'}}]
+        }]
+    }
+
+    def setUp(self):
+        self.workDir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workDir, ignore_errors=True)
+        yamlPath = os.path.join(self.workDir, 'suite.yaml')
+        with open(yamlPath, 'w', encoding='utf-8') as f:
+            yaml.dump(self.YAML_DATA, f)
+        self.definition = SuiteRunner.load_definition(yamlPath)
+
+        self.runnerClass = mock.Mock(side_effect=FakeRunner)
+        patcher = mock.patch.object(SuiteRunner, 'get_runner_class', return_value=self.runnerClass)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_case(self, overlay):
+        runner = self.definition.get_runner(overlay)
+        caseResult = CaseExecutor(runner).run_case(runner, runner.get_cases()[0])
+        self.assertEqual(caseResult['status'], 'PASS', caseResult['error_message'])
+        return runner
+
+    def test_env_override_changes_sent_request(self):
+        runner = self.run_case({'base_url': 'http://env.example.com', 'headers': {'X-Env': 'test'}})
+
+        self.assertEqual(runner.sent, [{'url': 'http://env.example.com/ping', 'headers': {'X-Env': 'test'}}])
+
+    def test_runners_do_not_share_state(self):
+        first = self.run_case({'base_url': 'http://first.example.com'})
+        second = self.run_case({'base_url': 'http://second.example.com'})
+
+        self.assertEqual([item['url'] for item in first.sent], ['http://first.example.com/ping'])
+        self.assertEqual([item['url'] for item in second.sent], ['http://second.example.com/ping'])
+        self.assertIsNot(first.session_headers, second.session_headers)
+        self.assertEqual(self.definition.data['config']['base_url'], 'http://yaml.example.com')
+
+    def test_prototype_built_once_per_overlay(self):
+        first = self.run_case({'base_url': 'http://env.example.com'})
+        second = self.run_case({'base_url': 'http://env.example.com'})
+
+        self.assertEqual(self.runnerClass.call_count, 1)
+        self.assertIsNot(first, second)
+        self.assertEqual(len(first.sent), 1)
+        self.assertEqual(len(second.sent), 1)
+
+        self.run_case({'base_url': 'http://other.example.com'})
+        self.assertEqual(self.runnerClass.call_count, 2)
+
+
+class ResolveFileReferencesTest(SimpleTestCase):
+    """不切换工作目录时 YAML 中的相对文件路径解析测试"""
+
+    def setUp(self):
+        self.baseDir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.baseDir, ignore_errors=True)
+        os.makedirs(os.path.join(self.baseDir, 'data'))
+        with open(os.path.join(self.baseDir, 'data', 'avatar.png'), 'wb') as f:
+            f.write(b'png')
+
+    def test_relative_paths_resolve_against_base_dir(self):
+        absolutePath = os.path.join(self.baseDir, 'data', 'avatar.png')
+        cases = [
+            {'case': 'C1', 'steps': [{'name': 'upload', 'request': {
+                'method': 'POST', 'endpoint': '/upload',
+                'files': {'avatar': 'data/avatar.png', 'typed': ['data/avatar.png', 'image/png'],
+                          'absolute': absolutePath}
+            }}]},
+            {'case': 'C2', 'steps': [{'name': 'ping', 'request': {'method': 'GET', 'endpoint': '/ping'}}]}
+        ]
+        cwd = os.getcwd()
+
+        resolved = SuiteRunner.resolve_file_references(cases, self.baseDir)
+
+        files = resolved[0]['steps'][0]['request']['files']
+        self.assertEqual(files['avatar'], absolutePath)
+        self.assertEqual(files['typed'], [absolutePath, 'image/png'])
+        self.assertEqual(files['absolute'], absolutePath)
+        for value in (files['avatar'], files['typed'][0]):
+            with open(value, 'rb') as f:
+                self.assertEqual(f.read(), b'png')
+
+        # 原用例不被修改，未引用文件的用例原样复用，工作目录不变
+        self.assertEqual(cases[0]['steps'][0]['request']['files']['avatar'], 'data/avatar.png')
+        self.assertIs(resolved[1], cases[1])
+        self.assertEqual(os.getcwd(), cwd)
+
+
+class JsonHandler(BaseHTTPRequestHandler):
+    """返回固定 JSON 的测试服务"""
+
+    BODY = {'code': 0, 'message': 'ok', 'count': 3, 'items': [{'id': 7}], 'empty': None}
+
+    def do_GET(self):
+        content = json.dumps(self.BODY).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@skipUnless(importlib.util.find_spec('src') is not None, 'YAMLTestRunner 不可用')
+class EngineParityTest(SimpleTestCase):
+    """同一步骤分别由 runner（同步引擎）和 httpx（异步引擎）执行，断言结果一致"""
+
+    VALIDATORS = [
+        {'eq': ['status_code', 200]},
+        {'eq': ['status_code', '200']},
+        {'eq': ['data.code', 0]},
+        {'eq': ['data.code', '0']},
+        {'ne': ['data.code', 1]},
+        {'gt': ['data.count', 2]},
+        {'gt': ['data.count', '2']},
+        {'lt': ['data.count', 3]},
+        {'contains': ['data.message', 'o']},
+        {'contains': ['data.message', 'x']},
+        {'not_null': ['data.message']},
+        {'not_null': ['data.empty']},
+        {'eq': ['$.items.0.id', 7]},
+        {'eq': ['headers.Content-Type', 'application/json']},
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), JsonHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        yamlData = {'config': {'base_url': f'http://127.0.0.1:{cls.server.server_port}'}, 'cases': []}
+        cls.runner = SuiteRunner.create_runner(yamlData)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        super().tearDownClass()
+
+    def test_validators_match_between_engines(self):
+        for validator in self.VALIDATORS:
+            step = {'name': 'get', 'request': {'method': 'GET', 'endpoint': '/'}, 'validate': [validator]}
+            case = {'case': 'C1', 'name': 'parity', 'steps': [step]}
+            self.assertTrue(AsyncCaseExecutor.is_async_step(step), validator)
+
+            syncResult = CaseExecutor(self.runner).run_case(SuiteRunner.copy_runner(self.runner), case)
+            asyncResult = AsyncClientPool.run(
+                AsyncCaseExecutor(self.runner).run_case_async(SuiteRunner.copy_runner(self.runner), case)
+            )
+            self.assertEqual(syncResult['status'], asyncResult['status'], validator)
+
+
+class CaseExecutorConcurrencyTest(SimpleTestCase):
+    """并发执行用例测试"""
+
+    def setUp(self):
+        self.workDir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.workDir, ignore_errors=True)
+
+    def build_cases(self, count):
+        # 靠前的用例耗时更长，并发执行时按完成顺序产出的结果与用例顺序不同
+        return [{
+            'case': f'C{index}',
+            'name': f'case {index}',
+            'steps': [{'name': 'get', 'request': {
+                'method': 'GET', 'endpoint': f'/items/{index}', 'delay': (count - index) * 0.02,
+                'status_code': 500 if index % 3 == 0 else 200
+            }}]
+        } for index in range(count)]
+
+    def test_results_keep_case_order(self):
+        cases = self.build_cases(6)
+        runner = create_fake_runner(self.workDir, cases)
+
+        caseResults = CaseExecutor(runner).run_cases(cases, concurrency=3)
+
+        self.assertEqual([item['case_id'] for item in caseResults], [f'C{index}' for index in range(6)])
+        self.assertEqual(
+            [item['status'] for item in caseResults],
+            ['FAIL' if index % 3 == 0 else 'PASS' for index in range(6)]
+        )
+
+    def test_iter_cases_yields_in_completion_order(self):
+        cases = self.build_cases(4)
+        runner = create_fake_runner(self.workDir, cases)
+
+        indexes = [index for index, _ in CaseExecutor(runner).iter_cases(cases, concurrency=4)]
+
+        self.assertEqual(sorted(indexes), [0, 1, 2, 3])
+        self.assertEqual(indexes[0], 3)
+
+    def test_worker_threads_use_own_runner_copies(self):
+        cases = self.build_cases(4)
+        runner = create_fake_runner(self.workDir, cases)
+        executor = CaseExecutor(runner)
+        usedRunners = []
+        runCase = executor.run_case
+
+        def recordRunner(caseRunner, case):
+            usedRunners.append(caseRunner)
+            return runCase(caseRunner, case)
+
+        with mock.patch.object(executor, 'run_case', side_effect=recordRunner):
+            list(executor.iter_cases(cases, concurrency=2))
+
+        self.assertEqual(runner.sent, [])
+        self.assertNotIn(runner, usedRunners)
+        self.assertEqual(sum(len(item.sent) for item in set(usedRunners)), 4)
+
+    def test_normalize_concurrency(self):
+        self.assertEqual(CaseExecutor.normalize_concurrency(None, 10), 1)
+        self.assertEqual(CaseExecutor.normalize_concurrency('abc', 10), 1)
+        self.assertEqual(CaseExecutor.normalize_concurrency(8, 3), 3)
+        self.assertEqual(CaseExecutor.normalize_concurrency(1000, 1000), CaseExecutor.MAX_CONCURRENCY)
+
+
+class AsyncStepSelectionTest(SimpleTestCase):
+    """异步引擎可直接执行的步骤判断测试"""
+
+    def test_plain_http_step_runs_on_httpx(self):
+        step = {
+            'name': 'get',
+            'request': {'method': 'GET', 'endpoint': '/items', 'params': {'page': 1}},
+            'validate': [{'eq': ['status_code', 200]}, {'contains': ['data.message', 'ok']}]
+        }
+        self.assertTrue(AsyncCaseExecutor.is_async_step(step))
+
+    def test_unsupported_fields_fall_back_to_runner(self):
+        request = {'method': 'GET', 'endpoint': '/items'}
+        for step in [
+            {'name': 'get', 'request': request, 'extract': {'token': 'data.token'}},
+            {'name': 'get', 'request': {**request, 'files': {'file': 'a.txt'}}},
+            {'name': 'get', 'request': request, 'validate': [{'regex': ['data.message', 'o+']}]},
+            {'name': 'get', 'request': request, 'validate': [{'eq': ['body.code', 0]}]},
+            {'name': 'get', 'request': request, 'validate': [{'eq': ['status_code']}, 'status_code']},
+        ]:
+            self.assertFalse(AsyncCaseExecutor.is_async_step(step), step)
+
+
+class FakeCosClient:
+    """记录 HEAD 和下载次数的 COS 客户端"""
+
+    def __init__(self, content):
+        self.bucket = 'test-bucket'
+        self.content = content
+        self.etag = '"v1"'
+        self.client = mock.Mock()
+        self.client.head_object.side_effect = lambda Bucket, Key: {'ETag': self.etag}
+        self.client.download_file.side_effect = self.download_file
+
+    def download_file(self, Bucket, Key, DestFilePath):
+        with open(DestFilePath, 'w', encoding='utf-8') as f:
+            f.write(self.content)
+
+
+class TestCaseFileCacheTest(SimpleTestCase):
+    """测试用例文件缓存测试"""
+
+    def setUp(self):
+        self.cacheDir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cacheDir, ignore_errors=True)
+        patcher = mock.patch.object(TestCaseFileCache, 'CACHE_DIR', self.cacheDir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        TestCaseFileCache.clear()
+        self.addCleanup(TestCaseFileCache.clear)
+        self.cosClient = FakeCosClient('config: {}\ncases: []\n')
+        self.loader = mock.Mock(side_effect=SuiteRunner.load_definition)
+
+    def test_same_etag_hits_cache(self):
+        first = TestCaseFileCache.load(self.cosClient, 'cases/a.yaml', self.loader)
+        second = TestCaseFileCache.load(self.cosClient, 'cases/a.yaml', self.loader)
+
+        self.assertIs(first, second)
+        self.assertEqual(self.loader.call_count, 1)
+        self.assertEqual(self.cosClient.client.download_file.call_count, 1)
+        self.assertEqual(self.cosClient.client.head_object.call_count, 2)
+
+    def test_changed_etag_reloads_and_removes_old_file(self):
+        first = TestCaseFileCache.load(self.cosClient, 'cases/a.yaml', self.loader)
+        oldPath = self.loader.call_args[0][0]
+
+        self.cosClient.etag = '"v2"'
+        self.cosClient.content = 'config: {base_url: "http://v2.example.com"}\ncases: []\n'
+        second = TestCaseFileCache.load(self.cosClient, 'cases/a.yaml', self.loader)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.data['config']['base_url'], 'http://v2.example.com')
+        self.assertEqual(self.loader.call_count, 2)
+        self.assertFalse(os.path.exists(oldPath))
+
+    def test_head_failure_skips_cache(self):
+        self.cosClient.client.head_object.side_effect = Exception('timeout')
+
+        TestCaseFileCache.load(self.cosClient, 'cases/a.yaml', self.loader)
+        TestCaseFileCache.load(self.cosClient, 'cases/a.yaml', self.loader)
+
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_lru_eviction_by_entry_count(self):
+        with mock.patch.object(TestCaseFileCache, 'MAX_ENTRIES', 1):
+            TestCaseFileCache.load(self.cosClient, 'cases/a.yaml', self.loader)
+            TestCaseFileCache.load(self.cosClient, 'cases/b.yaml', self.loader)
+            TestCaseFileCache.load(self.cosClient, 'cases/a.yaml', self.loader)
+
+        self.assertEqual(self.loader.call_count, 3)
+
+
+class LatencyHistogramTest(SimpleTestCase):
+    """延迟直方图测试"""
+
+    def test_percentiles_within_bucket_precision(self):
+        histogram = LatencyHistogram()
+        for millisecond in range(1, 1001):
+            histogram.record(millisecond / 1000)
+
+        summary = histogram.summary()
+        for percent in (50, 90, 99):
+            self.assertAlmostEqual(summary[f'p{percent}'], percent * 10, delta=percent * 10 / 64)
+        self.assertEqual(summary['min'], 1.0)
+        self.assertEqual(summary['max'], 1000.0)
+        self.assertAlmostEqual(summary['mean'], 500.5, places=3)
+
+    def test_merge_equals_recording_all_values(self):
+        merged = LatencyHistogram()
+        combined = LatencyHistogram()
+        for part in range(3):
+            histogram = LatencyHistogram()
+            for value in range(part * 100, (part + 1) * 100):
+                histogram.record(value / 10000)
+                combined.record(value / 10000)
+            merged.merge(histogram)
+
+        self.assertEqual(merged.summary(), combined.summary())
+        self.assertEqual(merged.total_count, 300)
+
+    def test_empty_histogram(self):
+        self.assertEqual(LatencyHistogram().summary(percents=(95,)), {'min': 0, 'mean': 0, 'p95': 0, 'max': 0})
+
+    def test_small_values_are_exact(self):
+        for value in range(1 << LatencyHistogram.SUB_BUCKET_BITS):
+            self.assertEqual(LatencyHistogram.bucket_range(LatencyHistogram.bucket_index(value)), (value, value))
+
+
+class StepTimingAggregatorTest(SimpleTestCase):
+    """网络耗时汇总测试"""
+
+    def test_groups_by_endpoint_and_skips_unmeasured_phases(self):
+        aggregator = StepTimingAggregator()
+        aggregator.add_steps(build_case_result(1)['steps'] + build_case_result(2)['steps'])
+        aggregator.add_steps([{'request': {'method': 'GET', 'url': 'http://fake.example.com/ping'}}])
+
+        summary = aggregator.summary()
+
+        self.assertEqual(list(summary), ['GET /items/{id}'])
+        self.assertEqual(summary['GET /items/{id}']['count'], 2)
+        self.assertEqual(summary['GET /items/{id}']['ttfb'], {'min': 10.0, 'avg': 10.0, 'p95': 10.0})
+        self.assertNotIn('connect', summary['GET /items/{id}'])
+
+
+class CaseFlakinessScoreTest(SimpleTestCase):
+    """用例不稳定分数测试（位图最低位为最近一次结果，1 表示失败）"""
+
+    def test_stable_results_score_zero(self):
+        self.assertEqual(CaseFlakinessTracker.score(0b0000, 4), 0.0)
+        self.assertEqual(CaseFlakinessTracker.score(0b1111, 4), 0.0)
+        self.assertEqual(CaseFlakinessTracker.score(0b1, 1), 0.0)
+
+    def test_alternating_results_score_hundred(self):
+        self.assertEqual(CaseFlakinessTracker.score(0b0101, 4), 100.0)
+
+    def test_single_flip(self):
+        self.assertEqual(CaseFlakinessTracker.score(0b0011, 4), 33.33)
+
+    def test_bits_outside_window_are_ignored(self):
+        self.assertEqual(CaseFlakinessTracker.score(0b10000, 4), 0.0)
+
+    def test_recent_outcomes_oldest_first(self):
+        self.assertEqual(CaseFlakinessTracker.recent_outcomes(0b001, 3), 'PPF')
+        self.assertEqual(CaseFlakinessTracker.recent_outcomes(0b110, 3), 'FFP')
+        self.assertEqual(CaseFlakinessTracker.recent_outcomes(0, 0), '')
+
+
+class ResultExportWriterTest(SimpleTestCase):
+    """JUnit XML / JSON 结果导出测试"""
+
+    START_TIME = datetime(2026, 10, 17, 10, 0, 0)
+    END_TIME = datetime(2026, 10, 17, 10, 0, 5)
+
+    def write(self, writerClass, caseResults):
+        output = io.StringIO()
+        writer = writerClass(output, test_name='订单接口', environment='test', base_url='http://fake.example.com',
+                             start_time=self.START_TIME, end_time=self.END_TIME)
+        writer.write_header()
+        for caseResult in caseResults:
+            writer.write_case(caseResult)
+        writer.write_footer()
+        return output.getvalue()
+
+    def test_junit_xml(self):
+        failedCase = build_case_result(2, 'FAIL')
+        failedCase['error_message'] = 'bad\x01 <value>'
+        content = self.write(JUnitXmlWriter, [build_case_result(1), failedCase])
+
+        root = ElementTree.fromstring(content.encode('utf-8'))
+        suite = root.find('testsuite')
+        self.assertEqual(suite.get('tests'), '2')
+        self.assertEqual(suite.get('failures'), '1')
+        self.assertEqual(suite.get('time'), '5.000')
+        testcases = suite.findall('testcase')
+        self.assertEqual([item.get('name') for item in testcases], ['C1 case 1', 'C2 case 2'])
+        self.assertIsNone(testcases[0].find('failure'))
+        self.assertEqual(testcases[1].find('failure').get('message'), 'bad <value>')
+
+    def test_junit_xml_without_cases(self):
+        root = ElementTree.fromstring(self.write(JUnitXmlWriter, []).encode('utf-8'))
+        self.assertEqual(root.find('testsuite').get('tests'), '0')
+
+    def test_json_result(self):
+        data = json.loads(self.write(JsonResultWriter, [build_case_result(1), build_case_result(2, 'FAIL')]))
+
+        self.assertEqual(data['summary'], {'total': 2, 'passed': 1, 'failed': 1, 'pass_rate': 50.0})
+        self.assertEqual([item['case_id'] for item in data['cases']], ['C1', 'C2'])
+        step = data['cases'][1]['steps'][0]
+        self.assertEqual(step['status_code'], 500)
+        self.assertNotIn('headers', step)
+        self.assertEqual(step['timings']['ttfb'], 10.0)
+
+    def test_json_result_without_cases(self):
+        data = json.loads(self.write(JsonResultWriter, []))
+        self.assertEqual(data['cases'], [])
+        self.assertEqual(data['summary']['pass_rate'], 0)
+
+
+class ReportWriterTest(SimpleTestCase):
+    """流式 HTML 报告和按需加载报告测试"""
+
+    def setUp(self):
+        self.outputDir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.outputDir, ignore_errors=True)
+
+    def write_html(self, assetBaseUrl=None):
+        output = io.StringIO()
+        writer = HtmlReportWriter(output, test_name='<订单>', asset_base_url=assetBaseUrl)
+        writer.write_header()
+        writer.write_case(build_case_result(1))
+        writer.write_case(build_case_result(2, 'FAIL'))
+        writer.write_footer()
+        return writer, output.getvalue()
+
+    def test_html_report_streams_cases(self):
+        writer, content = self.write_html()
+
+        self.assertEqual((writer.total, writer.passed), (2, 1))
+        self.assertIn('&lt;订单&gt;', content)
+        self.assertIn('<style>', content)
+        self.assertLess(content.index('C1'), content.index('C2'))
+        # 未测量的阶段不显示
+        self.assertIn('首字节(含连接、发送) 10.0 ms', content)
+        self.assertNotIn('TLS None', content)
+
+    def test_html_report_references_shared_assets(self):
+        _, content = self.write_html('https://cdn.example.com/assets/')
+
+        self.assertNotIn('<style>', content)
+        self.assertIn('href="https://cdn.example.com/assets/', content)
+        self.assertIn('<script src="https://cdn.example.com/assets/', content)
+
+    def test_lazy_report_chunks(self):
+        with mock.patch.object(LazyReportWriter, 'CHUNK_SIZE', 2):
+            writer = LazyReportWriter(self.outputDir, test_name='订单接口')
+            for index in range(5):
+                writer.write_case(build_case_result(index, 'FAIL' if index == 3 else 'PASS'))
+            files = writer.close()
+
+        fileNames = [item['file_name'] for item in files]
+        self.assertEqual(fileNames, [
+            'index.html', 'index.json', 'cases_00000.json', 'cases_00001.json', 'cases_00002.json'
+        ])
+        for item in files:
+            self.assertTrue(os.path.exists(item['file_path']), item['file_name'])
+
+        with gzip.open(os.path.join(self.outputDir, 'index.json'), 'rt', encoding='utf-8') as f:
+            index = json.load(f)
+        self.assertEqual(index['summary'], {'total': 5, 'passed': 4, 'failed': 1, 'pass_rate': 80.0})
+        self.assertEqual([(chunk['start'], chunk['count'], chunk['failed']) for chunk in index['chunks']],
+                         [(0, 2, 0), (2, 2, 1), (4, 1, 0)])
+
+        with gzip.open(os.path.join(self.outputDir, 'cases_00001.json'), 'rt', encoding='utf-8') as f:
+            self.assertEqual([item['case_id'] for item in json.load(f)], ['C2', 'C3'])
+
+    def test_lazy_report_shared_assets(self):
+        writer = LazyReportWriter(self.outputDir, asset_base_url='https://cdn.example.com/assets/')
+        files = writer.close()
+
+        with open(files[0]['file_path'], 'r', encoding='utf-8') as f:
+            content = f.read()
+        self.assertIn('<script src="https://cdn.example.com/assets/', content)
+        self.assertNotIn('<style>', content)
+
+
+class ExecutionDetailPaginationTest(TestCase):
+    """执行记录详情中用例结果的游标分页测试"""
+
+    def setUp(self):
+        self.execution = ApiTestExecutionModel.objects.create(test_case_id=0, env_id=0)
+        ApiTestCaseResultModel.objects.bulk_create([
+            ApiTestCaseResultModel(execution_id=self.execution.id, case_index=index, case_id=f'C{index}')
+            for index in range(5)
+        ])
+
+    def test_pages_follow_next_cursor(self):
+        caseIds = []
+        cursor = -1
+        pages = 0
+        while cursor is not None:
+            response = Service().get_api_test_execution_detail(
+                self.execution.id, case_cursor=cursor, case_page_size=2
+            )
+            self.assertEqual(response['status_code'], 200, response['message'])
+            caseIds += [item['case_id'] for item in response['data']['case_results']]
+            cursor = response['data']['next_case_cursor']
+            pages += 1
+
+        self.assertEqual(caseIds, ['C0', 'C1', 'C2', 'C3', 'C4'])
+        self.assertEqual(pages, 3)
+
+    def test_last_full_page_has_no_next_cursor(self):
+        response = Service().get_api_test_execution_detail(self.execution.id, case_cursor=2, case_page_size=2)
+
+        self.assertEqual([item['case_index'] for item in response['data']['case_results']], [3, 4])
+        self.assertIsNone(response['data']['next_case_cursor'])
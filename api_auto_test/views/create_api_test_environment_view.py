@@ -32,7 +32,11 @@ class CreateApiTestEnvironmentView(View):
             "timeout": "integer",
             "headers": "object",
             "variables": "object",
-            "is_default": "boolean"
+            "is_default": "boolean",
+            "concurrency": "integer",
+            "execution_engine": "integer",
+            "capture_policy": "object",
+            "coalesce_pending": "boolean"
         }
         :return:
         """
@@ -53,12 +57,20 @@ class CreateApiTestEnvironmentView(View):
             headers = request_data.get("headers")
             variables = request_data.get("variables")
             is_default = request_data.get("is_default", False)
+            concurrency = request_data.get("concurrency")
+            execution_engine = request_data.get("execution_engine")
+            capture_policy = request_data.get("capture_policy")
+            coalesce_pending = request_data.get("coalesce_pending")
             created_user_id = request.user.id
             created_user = request.user.username
 
             service_response = self.service.create_api_test_environment(
                 project_id, env_name, base_url, created_user_id, created_user,
-                description, timeout, headers, variables, is_default
+                description, timeout, headers, variables, is_default,
+                concurrency=concurrency,
+                execution_engine=execution_engine,
+                capture_policy=capture_policy,
+                coalesce_pending=coalesce_pending
             )
             response["code"] = service_response["code"]
             response["message"] = service_response["message"]
@@ -34,7 +34,8 @@ class CreateApiTestScheduleView(View):
             "schedule_time": "string",  # "HH:MM" 格式
             "description": "string",
             "schedule_weekday": "integer",  # 1-7
-            "is_enabled": "boolean"
+            "is_enabled": "boolean",
+            "spread_window": "integer"  # 错峰窗口（分钟），0-60
         }
         :return:
         """
@@ -56,6 +57,7 @@ class CreateApiTestScheduleView(View):
             description = request_data.get("description")
             schedule_weekday = request_data.get("schedule_weekday")
             is_enabled = request_data.get("is_enabled", True)
+            spread_window = request_data.get("spread_window", 0)
             created_user_id = request.user.id
             created_user = request.user.username
 
@@ -71,7 +73,7 @@ class CreateApiTestScheduleView(View):
             service_response = self.service.create_api_test_schedule(
                 project_id, task_name, test_case_id, env_id,
                 schedule_type, schedule_time, created_user_id, created_user,
-                description, schedule_weekday, is_enabled
+                description, schedule_weekday, is_enabled, spread_window
             )
             response["code"] = service_response["code"]
             response["message"] = service_response["message"]
@@ -26,7 +26,8 @@ class ExecuteApiTestCaseView(View):
         :param
         request: {
             "test_case_id": "integer",
-            "env_id": "integer"
+            "env_id": "integer",
+            "shard_count": "integer"
         }
         :return:
         """
@@ -41,11 +42,13 @@ class ExecuteApiTestCaseView(View):
             request_data = json.loads(request.body)
             test_case_id = request_data.get("test_case_id")
             env_id = request_data.get("env_id")
+            shard_count = request_data.get("shard_count")
             executed_user_id = request.user.id
             executed_user = request.user.username
 
             service_response = self.service.execute_api_test_case(
-                test_case_id, env_id, executed_user_id, executed_user
+                test_case_id, env_id, executed_user_id, executed_user,
+                shard_count=shard_count
             )
             response["code"] = service_response["code"]
             response["message"] = service_response["message"]
@@ -0,0 +1,47 @@
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.http import require_http_methods
+
+from api_auto_test.service import Service
+from constant.error_code import ErrorCode
+from project_decorator.request_decorators import valid_login_required
+
+
+class GetApiTestExecutionBatchProgressView(View):
+    """
+    获取批量执行汇总进度
+    """
+
+    def __init__(self):
+        self.service = Service()
+
+    @method_decorator(valid_login_required)
+    @method_decorator(require_http_methods(["GET"]))
+    def get(self, request):
+        """
+        获取批量执行汇总进度接口（用于轮询）
+        :param request:
+        :return:
+        """
+
+        response = {
+            "code": "",
+            "message": "",
+            "data": {}
+        }
+
+        try:
+            batch_id = request.GET.get("batch_id")
+
+            service_response = self.service.get_api_test_execution_batch_progress(batch_id)
+            response['code'] = service_response['code']
+            response['message'] = service_response['message']
+            response['data'] = service_response['data']
+
+            return JsonResponse(status=service_response.get('status_code', 400), data=response)
+
+        except Exception as e:
+            response['code'] = ErrorCode.SERVER_ERROR
+            response['message'] = str(e)
+            return JsonResponse(status=500, data=response)
@@ -33,8 +33,12 @@ class GetApiTestExecutionDetailView(View):
 
         try:
             execution_id = int(request.GET.get("execution_id"))
+            case_cursor = int(request.GET.get("case_cursor", -1))
+            case_page_size = int(request.GET.get("case_page_size", 100))
 
-            service_response = self.service.get_api_test_execution_detail(execution_id)
+            service_response = self.service.get_api_test_execution_detail(
+                execution_id, case_cursor=case_cursor, case_page_size=case_page_size
+            )
             response['code'] = service_response['code']
             response['message'] = service_response['message']
             response['data'] = service_response['data']
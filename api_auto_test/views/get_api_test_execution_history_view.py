@@ -49,9 +49,10 @@ class GetApiTestExecutionHistoryView(View):
             has_report = request.GET.get("has_report")
             if has_report:
                 has_report = has_report.lower() in ('true', '1', 'yes')
+            archived = request.GET.get("archived", "").lower() in ('true', '1', 'yes')
 
             service_response = self.service.get_api_test_execution_history(
-                page, page_size, test_case_id, project_id, status, trigger_type, has_report
+                page, page_size, test_case_id, project_id, status, trigger_type, has_report, archived
             )
             response['code'] = service_response['code']
             response['message'] = service_response['message']
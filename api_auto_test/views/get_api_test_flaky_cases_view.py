@@ -0,0 +1,64 @@
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.http import require_http_methods
+
+from api_auto_test.service import Service
+from constant.error_code import ErrorCode
+from project_decorator.request_decorators import valid_login_required
+
+
+class GetApiTestFlakyCasesView(View):
+    """
+    获取接口测试不稳定用例排行
+    """
+
+    def __init__(self):
+        self.service = Service()
+
+    @method_decorator(valid_login_required)
+    @method_decorator(require_http_methods(["GET"]))
+    def get(self, request):
+        """
+        获取不稳定用例排行接口
+        :param request:
+        :return:
+        """
+
+        response = {
+            "code": "",
+            "message": "",
+            "data": {}
+        }
+
+        try:
+            project_id = request.GET.get("project_id")
+            if project_id:
+                project_id = int(project_id)
+            limit = int(request.GET.get("limit", 20))
+            min_runs = int(request.GET.get("min_runs", 5))
+            test_case_id = request.GET.get("test_case_id")
+            if test_case_id:
+                test_case_id = int(test_case_id)
+            env_id = request.GET.get("env_id")
+            if env_id:
+                env_id = int(env_id)
+
+            service_response = self.service.get_api_test_flaky_cases(
+                project_id, limit, env_id, test_case_id, min_runs
+            )
+            response['code'] = service_response['code']
+            response['message'] = service_response['message']
+            response['data'] = service_response['data']
+
+            return JsonResponse(status=service_response.get('status_code', 400), data=response)
+
+        except (ValueError, TypeError) as e:
+            response["code"] = ErrorCode.PARAM_INVALID
+            response["message"] = str(e)
+            return JsonResponse(status=400, data=response)
+
+        except Exception as e:
+            response['code'] = ErrorCode.SERVER_ERROR
+            response['message'] = str(e)
+            return JsonResponse(status=500, data=response)
@@ -32,7 +32,11 @@ class UpdateApiTestEnvironmentView(View):
             "timeout": "integer",
             "headers": "object",
             "variables": "object",
-            "is_default": "boolean"
+            "is_default": "boolean",
+            "concurrency": "integer",
+            "execution_engine": "integer",
+            "capture_policy": "object",
+            "coalesce_pending": "boolean"
         }
         :return:
         """
@@ -53,10 +57,18 @@ class UpdateApiTestEnvironmentView(View):
             headers = request_data.get("headers")
             variables = request_data.get("variables")
             is_default = request_data.get("is_default")
+            concurrency = request_data.get("concurrency")
+            execution_engine = request_data.get("execution_engine")
+            capture_policy = request_data.get("capture_policy")
+            coalesce_pending = request_data.get("coalesce_pending")
 
             service_response = self.service.update_api_test_environment(
                 environment_id, env_name, base_url, description,
-                timeout, headers, variables, is_default
+                timeout, headers, variables, is_default,
+                concurrency=concurrency,
+                execution_engine=execution_engine,
+                capture_policy=capture_policy,
+                coalesce_pending=coalesce_pending
             )
             response["code"] = service_response["code"]
             response["message"] = service_response["message"]
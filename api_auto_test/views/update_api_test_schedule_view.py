@@ -33,7 +33,8 @@ class UpdateApiTestScheduleView(View):
             "schedule_type": "integer",
             "schedule_time": "string",
             "description": "string",
-            "schedule_weekday": "integer"
+            "schedule_weekday": "integer",
+            "spread_window": "integer"
         }
         :return:
         """
@@ -54,6 +55,7 @@ class UpdateApiTestScheduleView(View):
             schedule_type = request_data.get("schedule_type")
             schedule_time_str = request_data.get("schedule_time")
             schedule_weekday = request_data.get("schedule_weekday")
+            spread_window = request_data.get("spread_window")
 
             # 解析时间字符串
             schedule_time = None
@@ -63,7 +65,7 @@ class UpdateApiTestScheduleView(View):
 
             service_response = self.service.update_api_test_schedule(
                 schedule_id, task_name, description, test_case_id,
-                env_id, schedule_type, schedule_time, schedule_weekday
+                env_id, schedule_type, schedule_time, schedule_weekday, spread_window
             )
             response["code"] = service_response["code"]
             response["message"] = service_response["message"]
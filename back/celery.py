@@ -5,6 +5,7 @@ Celery 配置文件
 """
 import os
 from celery import Celery
+from celery.signals import celeryd_init
 
 # 设置 Django settings 模块
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'back.settings')
@@ -20,3 +21,50 @@ app.autodiscover_tasks(['tasks'])
 
 # 定时任务配置已移至 settings.py 的 CELERY_BEAT_SCHEDULE
 # 无需在此重复配置
+
+# worker 配置档：按 CELERY_WORKER_PROFILE 环境变量选择，决定消费的队列、并发数和预取数
+# 队列与任务路由见 settings.py 的 CELERY_TASK_QUEUES / CELERY_TASK_ROUTES
+# 启动示例：CELERY_WORKER_PROFILE=api_test celery -A back worker
+WORKER_PROFILES = {
+    # 接口测试：预取 1 个，保证高优先级任务不会被已预取的低优先级任务挡住
+    'api_test': {
+        'queues': ['api_test'],
+        'concurrency': 8,
+        'prefetch_multiplier': 1,
+    },
+    # LLM 任务：单个任务耗时长，低并发、不预取
+    'llm': {
+        'queues': ['llm'],
+        'concurrency': 2,
+        'prefetch_multiplier': 1,
+    },
+    # 定时任务检查与未路由的任务：任务轻量，允许多预取
+    'schedule': {
+        'queues': ['schedule', 'celery'],
+        'concurrency': 2,
+        'prefetch_multiplier': 4,
+    },
+}
+
+
+@celeryd_init.connect
+def applyWorkerProfile(sender=None, conf=None, options=None, **kwargs):
+    """
+    worker 启动时应用 CELERY_WORKER_PROFILE 对应的配置档
+    命令行显式指定的 -Q / -c 优先于配置档
+    """
+    profileName = os.environ.get('CELERY_WORKER_PROFILE')
+    if not profileName:
+        return
+
+    profile = WORKER_PROFILES.get(profileName)
+    if profile is None:
+        raise ValueError(f"未知的 worker 配置档: {profileName}，可选值: {', '.join(WORKER_PROFILES)}")
+
+    if options is not None:
+        if not options.get('queues'):
+            options['queues'] = profile['queues']
+        if not options.get('concurrency'):
+            options['concurrency'] = profile['concurrency']
+
+    conf.worker_prefetch_multiplier = profile['prefetch_multiplier']
@@ -195,16 +195,48 @@ CELERY_TASK_TRACK_STARTED = True
 # 任务超时时间（1 小时）
 CELERY_TASK_TIME_LIMIT = 3600
 
+# ==================== Celery 队列与路由配置 ====================
+# 按负载类型拆分队列，避免耗时的 LLM 生成任务占满 worker 导致接口测试排队
+# - api_test: 接口测试执行（支持优先级，手动触发优先于定时触发）
+# - llm: 需求解析、向量化、功能测试用例生成等 LLM 任务
+# - schedule: 定时任务检查与状态同步、执行记录归档
+# 各队列的 worker 并发数、预取数见 back/celery.py 中的 WORKER_PROFILES
+from kombu import Queue
+
+CELERY_TASK_DEFAULT_QUEUE = 'celery'
+CELERY_TASK_QUEUES = (
+    Queue('celery', routing_key='celery'),
+    Queue('api_test', routing_key='api_test', queue_arguments={'x-max-priority': 10}),
+    Queue('llm', routing_key='llm'),
+    Queue('schedule', routing_key='schedule'),
+)
+CELERY_TASK_ROUTES = {
+    'tasks.api_test_tasks.*': {'queue': 'api_test'},
+    'tasks.requirement_tasks.*': {'queue': 'llm'},
+    'tasks.functional_test_case_tasks.*': {'queue': 'llm'},
+    'tasks.schedule_tasks.*': {'queue': 'schedule'},
+    'tasks.archive_tasks.*': {'queue': 'schedule'},
+}
+CELERY_TASK_QUEUE_MAX_PRIORITY = 10
+# 只由 beat 触发的任务模块不会被业务代码导入，显式加载以便 worker 注册
+CELERY_IMPORTS = ('tasks.schedule_tasks', 'tasks.archive_tasks')
+CELERY_TASK_DEFAULT_PRIORITY = 5
+
 # ==================== Celery Beat 定时任务配置 ====================
 CELERY_BEAT_SCHEDULE = {
     # 每分钟检查接口测试定时任务
     'check-api-test-scheduled-tasks': {
-        'task': 'tasks.schedule_tasks.check_scheduled_tasks',
+        'task': 'tasks.schedule_tasks.checkScheduledTasks',
         'schedule': 60.0,  # 每 60 秒执行一次
     },
     # 每 5 分钟更新定时任务执行状态
     'update-schedule-execution-status': {
-        'task': 'tasks.schedule_tasks.update_execution_status',
+        'task': 'tasks.schedule_tasks.updateExecutionStatus',
         'schedule': 300.0,  # 每 300 秒执行一次
     },
+    # 每天归档超过保留天数的执行记录
+    'archive-api-test-executions': {
+        'task': 'tasks.archive_tasks.archiveExecutions',
+        'schedule': 86400.0,  # 每 86400 秒执行一次
+    },
 }
\ No newline at end of file
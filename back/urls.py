@@ -40,9 +40,14 @@ from api_auto_test.views.delete_api_test_environment_view import DeleteApiTestEn
 
 # 接口测试执行相关视图
 from api_auto_test.views.execute_api_test_case_view import ExecuteApiTestCaseView
+from api_auto_test.views.execute_api_test_case_batch_view import ExecuteApiTestCaseBatchView
+from api_auto_test.views.rerun_failed_api_test_execution_view import RerunFailedApiTestExecutionView
 from api_auto_test.views.get_api_test_execution_status_view import GetApiTestExecutionStatusView
 from api_auto_test.views.get_api_test_execution_history_view import GetApiTestExecutionHistoryView
 from api_auto_test.views.get_api_test_execution_detail_view import GetApiTestExecutionDetailView
+from api_auto_test.views.get_api_test_execution_batch_progress_view import GetApiTestExecutionBatchProgressView
+from api_auto_test.views.get_api_test_execution_trend_view import GetApiTestExecutionTrendView
+from api_auto_test.views.get_api_test_flaky_cases_view import GetApiTestFlakyCasesView
 
 # 接口测试定时任务相关视图
 from api_auto_test.views.create_api_test_schedule_view import CreateApiTestScheduleView
@@ -146,6 +151,11 @@ urlpatterns = [
     path("api/api_test_execution/status/", GetApiTestExecutionStatusView.as_view()),
     path("api/api_test_execution/history/", GetApiTestExecutionHistoryView.as_view()),
     path("api/api_test_execution/detail/", GetApiTestExecutionDetailView.as_view()),
+    path("api/api_test_execution/batch_execute/", ExecuteApiTestCaseBatchView.as_view()),
+    path("api/api_test_execution/batch_progress/", GetApiTestExecutionBatchProgressView.as_view()),
+    path("api/api_test_execution/rerun_failed/", RerunFailedApiTestExecutionView.as_view()),
+    path("api/api_test_execution/trend/", GetApiTestExecutionTrendView.as_view()),
+    path("api/api_test_execution/flaky_cases/", GetApiTestFlakyCasesView.as_view()),
 
     # 接口测试定时任务相关接口
     path("api/api_test_schedule/create/", CreateApiTestScheduleView.as_view()),
@@ -4,5 +4,6 @@
 统一管理所有异步任务，按业务域划分文件：
 - api_test_tasks.py: 接口测试相关任务
 - schedule_tasks.py: 定时任务调度
+- archive_tasks.py: 执行记录归档
 - requirement_tasks.py: 需求解析相关任务（预留）
 """
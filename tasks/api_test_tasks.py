@@ -7,12 +7,14 @@ import os
 import sys
 import shutil
 import tempfile
-import time
+import threading
+import uuid
 from datetime import datetime
 
-import yaml
-from celery import shared_task
+from celery import shared_task, chord, group
 from celery.utils.log import get_task_logger
+from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 
 # 使用 Celery 任务日志
@@ -37,16 +39,169 @@ if API_AUTO_TEST_DIR not in sys.path:
 from api_auto_test.models import (
     ApiTestExecutionModel,
     ApiTestCaseModel,
-    ApiTestEnvironmentModel
+    ApiTestEnvironmentModel,
+    ApiTestExecutionDailyStatModel,
+    ApiTestScheduleModel
+)
+from api_auto_test.executor import (
+    BodyCapture,
+    CaseExecutor,
+    CaseFlakinessTracker,
+    AsyncCaseExecutor,
+    CaseResultRecorder,
+    StepTimingAggregator,
+    SuiteRunner,
+    TestCaseFileCache
 )
 from utils.cos.cos_client import CosClient
-from utils.report.html_report_generator import HtmlReportGenerator
+from utils.report.compressed_report_file import CompressedReportFile
+from utils.report.html_report_generator import HtmlReportWriter
+from utils.report.lazy_report_writer import LazyReportWriter
+from utils.report.report_assets import ReportAssetPublisher
+from utils.report.result_export_writer import JsonResultWriter, JUnitXmlWriter
 from constant.error_code import ErrorCode
 
 
 class ApiTestTaskService:
     """接口测试任务服务类"""
 
+    # 单个执行记录允许拆分的最大分片数
+    MAX_SHARD_COUNT = 32
+
+    # 单次批量执行允许的最大执行记录数
+    MAX_BATCH_EXECUTION_COUNT = 500
+
+    # 任务优先级（0-10，越大越优先）：手动触发优先于定时触发，见 settings.CELERY_TASK_QUEUES 的 api_test 队列
+    TRIGGER_PRIORITIES = {
+        ApiTestExecutionModel.TriggerType.MANUAL: 8,
+        ApiTestExecutionModel.TriggerType.SCHEDULED: 3,
+    }
+
+    @staticmethod
+    def getTaskPriority(triggerType: int) -> int:
+        """获取触发类型对应的任务优先级"""
+        return ApiTestTaskService.TRIGGER_PRIORITIES.get(triggerType, 5)
+
+    @staticmethod
+    def submitExecution(testCaseId: int, envId: int, triggerType: int,
+                        executedUserId=None, executedUser=None, scheduledTaskId=None,
+                        shardCount: int = 1, coalesce: bool = False,
+                        parentExecutionId=None, caseFilter=None):
+        """
+        创建执行记录并提交异步任务
+
+        开启合并（环境配置 coalesce_pending）时，若同一测试用例在该环境已有待执行记录，
+        不再创建新记录和任务，而是将本次请求合并到已有记录（coalesced_count 加 1）
+
+        :param testCaseId: 测试用例 ID
+        :param envId: 环境配置 ID
+        :param triggerType: 触发类型
+        :param executedUserId: 执行人 ID
+        :param executedUser: 执行人
+        :param scheduledTaskId: 关联定时任务 ID
+        :param shardCount: 分片数
+        :param coalesce: 是否合并重复的待执行任务（只执行部分用例时不合并）
+        :param parentExecutionId: 父执行记录 ID（重跑失败用例时）
+        :param caseFilter: 只执行的用例编号列表
+        :return: (执行记录, 是否合并到已有记录)
+        """
+        priority = ApiTestTaskService.getTaskPriority(triggerType)
+
+        with transaction.atomic():
+            if coalesce and not caseFilter:
+                # 锁定测试用例行（始终存在），同一测试用例的并发提交在此串行执行，
+                # 没有待执行记录时也不会各自创建一条，查询和创建在同一事务内完成
+                ApiTestCaseModel.objects.select_for_update().filter(id=testCaseId).first()
+
+                pendingExecution = ApiTestExecutionModel.objects.filter(
+                    test_case_id=testCaseId,
+                    env_id=envId,
+                    status=ApiTestExecutionModel.ExecutionStatus.PENDING,
+                    case_filter__isnull=True
+                ).order_by('id').first()
+
+                if pendingExecution:
+                    updateFields = {'coalesced_count': F('coalesced_count') + 1}
+                    # 定时任务合并到手动执行时关联定时任务，保证定时任务的执行状态能够被更新
+                    if scheduledTaskId and not pendingExecution.scheduled_task_id:
+                        updateFields['scheduled_task_id'] = scheduledTaskId
+                    ApiTestExecutionModel.objects.filter(id=pendingExecution.id).update(**updateFields)
+                    pendingExecution.refresh_from_db()
+
+                    logger.info(f"执行请求已合并到待执行记录 {pendingExecution.id} (test_case_id={testCaseId}, env_id={envId})")
+                    return pendingExecution, True
+
+            # Celery 任务 ID 随记录一起创建，事务提交后再派发任务，避免 worker 读取到未提交的记录
+            execution = ApiTestExecutionModel.objects.create(
+                test_case_id=testCaseId,
+                env_id=envId,
+                status=ApiTestExecutionModel.ExecutionStatus.PENDING,
+                trigger_type=triggerType,
+                scheduled_task_id=scheduledTaskId,
+                shard_count=shardCount,
+                parent_execution_id=parentExecutionId,
+                case_filter=caseFilter,
+                celery_task_id=str(uuid.uuid4()),
+                executed_user_id=executedUserId,
+                executed_user=executedUser
+            )
+
+            transaction.on_commit(lambda: ApiTestTaskService.executeApiTestTask.apply_async(
+                args=[execution.id],
+                task_id=execution.celery_task_id,
+                priority=priority
+            ))
+
+        return execution, False
+
+    @staticmethod
+    def submitExecutionBatch(pairs: list, triggerType: int, executedUserId=None, executedUser=None):
+        """
+        批量创建执行记录并以一个 group 提交异步任务
+
+        Celery 任务 ID 在创建记录前生成，随记录一起 bulk_create，
+        事务提交后再派发任务，避免 worker 读取到未提交或缺少任务 ID 的记录
+
+        :param pairs: [(测试用例 ID, 环境配置 ID), ...]
+        :param triggerType: 触发类型
+        :param executedUserId: 执行人 ID
+        :param executedUser: 执行人
+        :return: (批次 ID, 执行记录列表)
+        """
+        batchId = uuid.uuid4().hex
+        priority = ApiTestTaskService.getTaskPriority(triggerType)
+
+        with transaction.atomic():
+            ApiTestExecutionModel.objects.bulk_create([
+                ApiTestExecutionModel(
+                    test_case_id=testCaseId,
+                    env_id=envId,
+                    status=ApiTestExecutionModel.ExecutionStatus.PENDING,
+                    trigger_type=triggerType,
+                    celery_task_id=str(uuid.uuid4()),
+                    batch_id=batchId,
+                    executed_user_id=executedUserId,
+                    executed_user=executedUser
+                )
+                for testCaseId, envId in pairs
+            ], batch_size=500)
+
+            # MySQL 的 bulk_create 不回填主键，按批次 ID 重新查询
+            executions = list(ApiTestExecutionModel.objects.filter(batch_id=batchId).order_by('id'))
+
+            taskGroup = group(
+                ApiTestTaskService.executeApiTestTask.s(execution.id).set(
+                    task_id=execution.celery_task_id,
+                    priority=priority
+                )
+                for execution in executions
+            )
+            transaction.on_commit(taskGroup.apply_async)
+
+        logger.info(f"批量执行批次 {batchId} 已提交 {len(executions)} 个执行任务")
+
+        return batchId, executions
+
     @staticmethod
     @shared_task(bind=True, max_retries=3)
     def executeApiTestTask(task, executionId: int) -> dict:
@@ -55,13 +210,17 @@ class ApiTestTaskService:
 
         流程：
         1. 从数据库获取执行记录和相关配置
-        2. 从 COS 下载 YAML 测试用例文件
-        3. 解析环境配置，覆盖 YAML 中的 config
-        4. 使用 YAMLTestRunner 执行测试，收集每个步骤的详细请求/响应信息
-        5. 生成自制 HTML 报告（单文件，包含所有 CSS/JS）
+        2. 获取 YAML 测试用例的解析结果（worker 内按 ETag 缓存）
+        3. 复制叠加了环境配置的 runner 原型（按环境配置缓存）
+        4. 使用 YAMLTestRunner 执行测试（按环境配置的并发数），收集每个步骤的详细请求/响应信息，
+           每完成一批用例写入 api_test_case_result 并更新执行记录上的实时计数
+        5. 从 api_test_case_result 分批读取用例结果，流式写入自制 HTML 报告（单文件，包含所有 CSS/JS）
         6. 将报告上传到 COS
         7. 更新执行记录状态
 
+        分片执行（shard_count > 1）时，本任务只负责将用例拆分为多个分片，
+        以 chord 形式派发到多个 worker 执行，由 mergeApiTestShardsTask 汇总结果后完成第 5-7 步
+
         :param task: Celery 任务实例
         :param executionId: 执行记录 ID
         :return: 执行结果
@@ -81,259 +240,33 @@ class ApiTestTaskService:
             execution.status = ApiTestExecutionModel.ExecutionStatus.RUNNING
             execution.started_at = timezone.now()
             execution.save(update_fields=['status', 'started_at'])
+            ApiTestTaskService.updateScheduleStatus(execution)
+
+            # 重试时清空上次执行写入的用例结果和计数
+            CaseResultRecorder.reset(executionId)
 
             # 获取测试用例和环境配置
             testCase = ApiTestCaseModel.objects.get(id=execution.test_case_id, deleted_at__isnull=True)
             environment = ApiTestEnvironmentModel.objects.get(id=execution.env_id, deleted_at__isnull=True)
 
-            # 2. 创建临时目录并从 COS 下载 YAML 文件
+            # 分片执行：拆分后派发，由合并任务完成报告和执行记录更新
+            if (execution.shard_count or 1) > 1:
+                return ApiTestTaskService.dispatchShards(execution)
+
             tempDir = tempfile.mkdtemp(prefix='api_test_')
             cosClient = CosClient()
 
-            # 下载 YAML 文件
-            yamlFilename = os.path.basename(testCase.cos_access_url.split('?')[0])
-            yamlPath = os.path.join(tempDir, yamlFilename)
+            # 2-4. 加载 runner、叠加环境配置并执行全部用例
+            executionStart = datetime.now()
+            ApiTestTaskService.runCases(execution, testCase, environment, cosClient)
+            executionEnd = datetime.now()
 
-            # 解析 COS Key
-            cosKey = testCase.cos_access_url.split('.com/')[-1].split('?')[0]
-            cosClient.client.download_file(
-                Bucket=cosClient.bucket,
-                Key=cosKey,
-                DestFilePath=yamlPath
+            # 5-7. 生成报告、上传 COS、更新执行记录
+            response = ApiTestTaskService.finalizeExecution(
+                execution, testCase, environment,
+                executionStart, executionEnd, tempDir, cosClient
             )
 
-            # 3. 加载 YAML 并覆盖环境配置
-            with open(yamlPath, 'r', encoding='utf-8') as f:
-                yamlData = yaml.safe_load(f)
-
-            # 确保 config 存在
-            if 'config' not in yamlData:
-                yamlData['config'] = {}
-
-            # 覆盖环境配置
-            yamlData['config']['base_url'] = environment.base_url
-            if environment.timeout:
-                yamlData['config']['timeout'] = environment.timeout
-            if environment.headers:
-                yamlData['config']['headers'] = environment.headers
-
-            # 合并环境变量到 config
-            if environment.variables:
-                for key, value in environment.variables.items():
-                    yamlData['config'][key] = value
-
-            # 保存修改后的 YAML
-            with open(yamlPath, 'w', encoding='utf-8') as f:
-                yaml.dump(yamlData, f, allow_unicode=True, default_flow_style=False)
-
-            # 4. 直接使用 YAMLTestRunner 执行测试
-            logger.info(f"开始执行测试，YAML 路径: {yamlPath}")
-
-            from src.test_cases_parser import YAMLTestRunner  # type: ignore
-
-            originalCwd = os.getcwd()
-            os.chdir(API_AUTO_TEST_DIR)
-
-            try:
-                runner = YAMLTestRunner(yamlPath)
-                cases = runner.get_cases()
-                totalCases = len(cases)
-
-                reportGenerator = HtmlReportGenerator()
-                reportGenerator.set_test_info(
-                    name=testCase.case_name,
-                    environment=environment.env_name,
-                    base_url=environment.base_url
-                )
-
-                executionStart = datetime.now()
-                passedCases = 0
-                failedCases = 0
-
-                for case in cases:
-                    caseId = case.get('case', 'UNKNOWN')
-                    caseName = case.get('name', caseId)
-
-                    logger.info(f"执行用例: {caseId} - {caseName}")
-
-                    caseStart = time.time()
-                    caseResult = {
-                        'case_id': caseId,
-                        'case_name': caseName,
-                        'status': 'PASS',
-                        'duration': 0,
-                        'error_message': '',
-                        'steps': []
-                    }
-
-                    try:
-                        runner.var_handler = runner.var_handler.__class__(runner.config)
-
-                        for step in case.get('steps', []):
-                            stepName = step.get('name', 'unknown_step')
-                            stepType = step.get('type', 'http_request')
-
-                            stepResult = {
-                                'name': stepName,
-                                'status': 'PASS',
-                                'error_message': '',
-                                'request': {},
-                                'response': {}
-                            }
-
-                            try:
-                                requestConfig = runner.var_handler.replace_variables(step.get('request', {}))
-
-                                method = requestConfig.get('method', 'GET')
-                                endpoint = requestConfig.get('endpoint', '')
-                                fullUrl = runner.config.get('base_url', '') + endpoint
-
-                                stepResult['request'] = {
-                                    'method': method,
-                                    'url': fullUrl,
-                                    'headers': requestConfig.get('headers', {}),
-                                    'body': requestConfig.get('body', {})
-                                }
-
-                                if stepType == 'polling':
-                                    success, stepResponse, error = runner.execute_polling(step)
-                                elif stepType == 'repeat':
-                                    success, stepResponse, error = runner.execute_repeat(step)
-                                else:
-                                    success, stepResponse, error = runner.execute_step(step)
-
-                                # 无论成功失败都记录响应信息
-                                if stepResponse:
-                                    if isinstance(stepResponse, dict):
-                                        stepResult['response'] = {
-                                            'status_code': stepResponse.get('status_code', 0),
-                                            'body': stepResponse.get('data', stepResponse)
-                                        }
-                                    else:
-                                        stepResult['response'] = {
-                                            'status_code': 0,
-                                            'body': stepResponse
-                                        }
-                                else:
-                                    stepResult['response'] = {
-                                        'status_code': 0,
-                                        'body': None,
-                                        'error': str(error) if error else '无响应'
-                                    }
-
-                                if not success:
-                                    stepResult['status'] = 'FAIL'
-                                    stepResult['error_message'] = str(error) if error else '步骤执行失败'
-                                    caseResult['status'] = 'FAIL'
-                                    caseResult['error_message'] = f"{stepName}: {error}"
-                                    caseResult['steps'].append(stepResult)
-                                    break
-
-                            except Exception as e:
-                                stepResult['status'] = 'FAIL'
-                                stepResult['error_message'] = str(e)
-                                # 确保异常时也记录请求信息（如果还未记录）
-                                if not stepResult['request']:
-                                    rawRequest = step.get('request', {})
-                                    stepResult['request'] = {
-                                        'method': rawRequest.get('method', 'GET'),
-                                        'url': runner.config.get('base_url', '') + rawRequest.get('endpoint', ''),
-                                        'headers': rawRequest.get('headers', {}),
-                                        'body': rawRequest.get('body', {})
-                                    }
-                                # 记录异常响应
-                                stepResult['response'] = {
-                                    'status_code': 0,
-                                    'body': None,
-                                    'error': str(e)
-                                }
-                                caseResult['status'] = 'FAIL'
-                                caseResult['error_message'] = f"{stepName}: {str(e)}"
-                                caseResult['steps'].append(stepResult)
-                                break
-
-                            caseResult['steps'].append(stepResult)
-
-                    except Exception as e:
-                        caseResult['status'] = 'FAIL'
-                        caseResult['error_message'] = str(e)
-                        logger.error(f"用例执行异常: {caseId}, 错误: {e}")
-
-                    caseResult['duration'] = time.time() - caseStart
-
-                    if caseResult['status'] == 'PASS':
-                        passedCases += 1
-                        logger.info(f"用例通过: {caseId}")
-                    else:
-                        failedCases += 1
-                        logger.warning(f"用例失败: {caseId} - {caseResult['error_message']}")
-
-                    reportGenerator.add_case_result(caseResult)
-
-                executionEnd = datetime.now()
-                reportGenerator.set_time(executionStart, executionEnd)
-
-            finally:
-                os.chdir(originalCwd)
-
-            passRate = (passedCases / totalCases * 100) if totalCases > 0 else 0
-            logger.info(f"测试完成: {passedCases}/{totalCases} 通过，通过率: {passRate:.1f}%")
-
-            # 5. 生成 HTML 报告并上传到 COS
-            reportUrl = None
-            reportHtmlPath = os.path.join(tempDir, f'report_{executionId}.html')
-            reportGenerator.save_to_file(reportHtmlPath)
-
-            reportCosDir = f"webtest/webtest_api_test_reports/{testCase.project_id}/"
-            reportFilename = f"report_{executionId}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.html"
-
-            try:
-                cosRes = cosClient.upload_file_to_cos_bucket(
-                    reportCosDir,
-                    reportFilename,
-                    reportHtmlPath,
-                    content_type='text/html; charset=utf-8'
-                )
-                if cosRes and 'ETag' in cosRes:
-                    reportUrl = f"https://{cosClient.bucket}.cos.ap-guangzhou.myqcloud.com/{reportCosDir}{reportFilename}"
-                    logger.info(f"报告上传成功: {reportUrl}")
-            except Exception as e:
-                logger.error(f"上传报告失败: {e}")
-
-            # 6. 更新执行记录
-            execution.status = ApiTestExecutionModel.ExecutionStatus.SUCCESS if failedCases == 0 else ApiTestExecutionModel.ExecutionStatus.FAILED
-            execution.total_cases = totalCases
-            execution.passed_cases = passedCases
-            execution.failed_cases = failedCases
-            execution.pass_rate = passRate
-            execution.report_url = reportUrl
-            execution.finished_at = timezone.now()
-            execution.duration = int((execution.finished_at - execution.started_at).total_seconds())
-            execution.save()
-
-            # 更新测试用例统计
-            testCase.last_execution_status = ApiTestCaseModel.ExecutionStatus.SUCCESS if failedCases == 0 else ApiTestCaseModel.ExecutionStatus.FAILED
-            testCase.last_execution_time = execution.finished_at
-            testCase.total_executions = (testCase.total_executions or 0) + 1
-            if failedCases == 0:
-                testCase.success_count = (testCase.success_count or 0) + 1
-            testCase.save(update_fields=[
-                'last_execution_status', 'last_execution_time',
-                'total_executions', 'success_count'
-            ])
-
-            response['code'] = ErrorCode.SUCCESS
-            response['message'] = f'执行完成: {passedCases}/{totalCases} 通过'
-            response['data'] = {
-                'execution_id': executionId,
-                'status': execution.status,
-                'total_cases': totalCases,
-                'passed_cases': passedCases,
-                'failed_cases': failedCases,
-                'pass_rate': passRate,
-                'report_url': reportUrl
-            }
-
         except ApiTestExecutionModel.DoesNotExist:
             response['code'] = ErrorCode.PARAM_INVALID
             response['message'] = f'执行记录不存在: {executionId}'
@@ -355,9 +288,11 @@ class ApiTestTaskService:
             response['code'] = ErrorCode.SERVER_ERROR
             response['message'] = f'执行失败: {str(e)}'
             response['status_code'] = 500
-            ApiTestTaskService.updateExecutionToFailed(executionId, str(e))
+            # 还会重试时不计入每日统计，避免重试成功后同一次执行被统计两次
+            willRetry = bool(task and task.request.retries < task.max_retries)
+            ApiTestTaskService.updateExecutionToFailed(executionId, str(e), recordStat=not willRetry)
 
-            if task and task.request.retries < task.max_retries:
+            if willRetry:
                 raise task.retry(exc=e, countdown=60)
 
         finally:
@@ -367,19 +302,591 @@ class ApiTestTaskService:
         return response
 
     @staticmethod
-    def updateExecutionToFailed(executionId: int, errorMessage: str):
-        """更新执行记录为失败状态"""
+    def dispatchShards(execution) -> dict:
+        """
+        将一次执行拆分为多个分片，以 chord 形式派发
+        每个分片执行 YAML 中连续的一段用例，用例结果按 YAML 中的序号写入 api_test_case_result，
+        合并任务按序号读取，保证报告中的用例顺序不变
+
+        :param execution: 执行记录
+        :return: 派发结果
+        """
+        shardCount = min(execution.shard_count, ApiTestTaskService.MAX_SHARD_COUNT)
+        priority = ApiTestTaskService.getTaskPriority(execution.trigger_type)
+
+        header = [
+            ApiTestTaskService.executeApiTestShardTask.s(execution.id, shardIndex, shardCount).set(priority=priority)
+            for shardIndex in range(shardCount)
+        ]
+        chordResult = chord(header)(ApiTestTaskService.mergeApiTestShardsTask.s(execution.id).set(priority=priority))
+
+        logger.info(f"执行记录 {execution.id} 已拆分为 {shardCount} 个分片派发, 合并任务: {chordResult.id}")
+
+        return {
+            "code": ErrorCode.SUCCESS,
+            "message": f"已拆分为 {shardCount} 个分片执行",
+            "data": {
+                "execution_id": execution.id,
+                "shard_count": shardCount,
+                "merge_task_id": chordResult.id
+            },
+            "status_code": 200
+        }
+
+    @staticmethod
+    @shared_task
+    def executeApiTestShardTask(executionId: int, shardIndex: int, shardCount: int) -> dict:
+        """
+        执行单个分片的用例（Celery 任务入口）
+
+        用例结果直接写入 api_test_case_result，返回值只包含用例数和错误信息，避免经结果后端传递大量数据；
+        分片内的异常不会向上抛出，而是记录在返回结果的 error 中，
+        保证 chord 的合并任务始终能够执行并更新执行记录
+
+        :param executionId: 执行记录 ID
+        :param shardIndex: 分片序号（从 0 开始）
+        :param shardCount: 分片总数
+        :return: 分片执行结果
+        """
+        shardResult = {
+            'shard_index': shardIndex,
+            'case_count': 0,
+            'error': ''
+        }
+
+        try:
+            execution = ApiTestExecutionModel.objects.get(id=executionId)
+            testCase = ApiTestCaseModel.objects.get(id=execution.test_case_id, deleted_at__isnull=True)
+            environment = ApiTestEnvironmentModel.objects.get(id=execution.env_id, deleted_at__isnull=True)
+
+            cosClient = CosClient()
+
+            shardResult['case_count'] = ApiTestTaskService.runCases(
+                execution, testCase, environment, cosClient,
+                shardIndex=shardIndex, shardCount=shardCount
+            )
+            logger.info(f"执行记录 {executionId} 分片 {shardIndex + 1}/{shardCount} 完成, 用例数: {shardResult['case_count']}")
+
+        except Exception as e:
+            shardResult['error'] = f"分片 {shardIndex + 1}/{shardCount} 执行失败: {str(e)}"
+            logger.error(f"执行记录 {executionId} {shardResult['error']}")
+
+        return shardResult
+
+    @staticmethod
+    @shared_task
+    def mergeApiTestShardsTask(shardResults: list, executionId: int) -> dict:
+        """
+        合并分片执行结果（chord 回调任务）
+        汇总各分片写入的用例结果，生成一份 HTML 报告并更新执行记录
+
+        :param shardResults: 各分片的执行结果
+        :param executionId: 执行记录 ID
+        :return: 执行结果
+        """
+        response = {
+            "code": "",
+            "message": "",
+            "data": {},
+            "status_code": 200
+        }
+
+        tempDir = None
+
         try:
             execution = ApiTestExecutionModel.objects.get(id=executionId)
+            testCase = ApiTestCaseModel.objects.get(id=execution.test_case_id)
+            environment = ApiTestEnvironmentModel.objects.get(id=execution.env_id)
+
+            shardErrors = []
+            for shardResult in sorted(shardResults, key=lambda item: item['shard_index']):
+                if shardResult['error']:
+                    shardErrors.append(shardResult['error'])
+
+            tempDir = tempfile.mkdtemp(prefix='api_test_merge_')
+            cosClient = CosClient()
+
+            response = ApiTestTaskService.finalizeExecution(
+                execution, testCase, environment,
+                timezone.localtime(execution.started_at).replace(tzinfo=None), datetime.now(),
+                tempDir, cosClient,
+                errorMessage='; '.join(shardErrors) or None
+            )
+
+        except Exception as e:
+            response['code'] = ErrorCode.SERVER_ERROR
+            response['message'] = f'合并分片结果失败: {str(e)}'
+            response['status_code'] = 500
+            ApiTestTaskService.updateExecutionToFailed(executionId, response['message'])
+
+        finally:
+            if tempDir and os.path.exists(tempDir):
+                shutil.rmtree(tempDir, ignore_errors=True)
+
+        return response
+
+    @staticmethod
+    def loadRunner(testCase, environment, cosClient):
+        """
+        获取测试用例对应的 YAMLTestRunner，并叠加环境配置
+
+        测试套件定义在 worker 内按 COS Key + ETag 缓存，ETag 未变化时跳过下载和解析；
+        套件定义内按环境配置缓存 runner 原型，本次执行使用原型的独立副本，不回写缓存的 YAML 文件
+
+        :param testCase: 测试用例
+        :param environment: 环境配置
+        :param cosClient: COS 客户端
+        :return: YAMLTestRunner 实例
+        """
+        cosKey = testCase.cos_access_url.split('.com/')[-1].split('?')[0]
+        definition = TestCaseFileCache.load(cosClient, cosKey, SuiteRunner.load_definition)
+
+        logger.info(f"开始执行测试，测试用例: {cosKey}")
+
+        return definition.get_runner(SuiteRunner.build_overlay(environment))
+
+    @staticmethod
+    def runCases(execution, testCase, environment, cosClient, shardIndex: int = 0, shardCount: int = 1) -> int:
+        """
+        执行 YAML 中的用例（或其中一个分片），用例完成后分批写入 api_test_case_result
+        执行记录指定了 case_filter 时只执行其中的用例，分片在过滤后的用例上拆分
+
+        :param execution: 执行记录
+        :param testCase: 测试用例
+        :param environment: 环境配置
+        :param cosClient: COS 客户端
+        :param shardIndex: 分片序号
+        :param shardCount: 分片总数，1 表示执行全部用例
+        :return: 执行的用例数
+        """
+        runner = ApiTestTaskService.loadRunner(testCase, environment, cosClient)
+        cases = runner.get_cases()
+
+        # 只执行指定的用例（如重跑失败用例）
+        if execution.case_filter:
+            caseFilter = set(execution.case_filter)
+            cases = [case for case in cases if case.get('case', 'UNKNOWN') in caseFilter]
+
+        start = 0
+        if shardCount > 1:
+            # 按连续区间拆分，各分片用例数最多相差 1
+            start = len(cases) * shardIndex // shardCount
+            end = len(cases) * (shardIndex + 1) // shardCount
+            cases = cases[start:end]
+
+        # 不切换工作目录，步骤中引用的相对文件路径按 runner 目录解析
+        cases = SuiteRunner.resolve_file_references(cases, API_AUTO_TEST_DIR)
+
+        CaseResultRecorder.add_total(execution.id, len(cases))
+
+        # 按环境配置的执行引擎和并发数执行用例，按环境的采集策略截断过大的请求/响应体
+        bodyCapture = ApiTestTaskService.buildBodyCapture(execution, testCase, environment, cosClient)
+        if environment.execution_engine == ApiTestEnvironmentModel.ExecutionEngine.ASYNC:
+            caseExecutor = AsyncCaseExecutor(runner, logger, body_capture=bodyCapture)
+        else:
+            caseExecutor = CaseExecutor(runner, logger, body_capture=bodyCapture)
+
+        # 用例序号使用在 YAML 中的序号，写入顺序与完成顺序无关
+        recorder = CaseResultRecorder(execution.id, index_offset=start, logger=logger)
+        for index, caseResult in caseExecutor.iter_cases(cases, environment.concurrency):
+            if caseResult['status'] == 'PASS':
+                logger.info(f"用例通过: {caseResult['case_id']}")
+            else:
+                logger.warning(f"用例失败: {caseResult['case_id']} - {caseResult['error_message']}")
+            recorder.add(index, caseResult)
+        recorder.flush()
+
+        return len(cases)
+
+    @staticmethod
+    def buildBodyCapture(execution, testCase, environment, cosClient) -> BodyCapture:
+        """
+        按环境配置的 capture_policy 创建 body 采集器
+        开启 spill_to_cos 时，超过上限的完整 body 以 SHA-256 命名上传到 COS，同一执行内相同内容只上传一次
+
+        :param execution: 执行记录
+        :param testCase: 测试用例
+        :param environment: 环境配置
+        :param cosClient: COS 客户端
+        :return: BodyCapture 实例
+        """
+        bodyCosDir = f"webtest/webtest_api_test_bodies/{testCase.project_id}/{execution.id}/"
+        uploadedKeys = set()
+        uploadLock = threading.Lock()
+
+        def spillBody(content: bytes, sha256: str) -> str:
+            key = f"{bodyCosDir}{sha256}"
+            with uploadLock:
+                uploaded = key in uploadedKeys
+            if not uploaded:
+                cosClient.client.put_object(
+                    Bucket=cosClient.bucket,
+                    Key=key,
+                    Body=content,
+                    ContentType='text/plain; charset=utf-8'
+                )
+                with uploadLock:
+                    uploadedKeys.add(key)
+            return f"https://{cosClient.bucket}.cos.ap-guangzhou.myqcloud.com/{key}"
+
+        return BodyCapture(environment.capture_policy, spill=spillBody, logger=logger)
+
+    @staticmethod
+    def finalizeExecution(execution, testCase, environment,
+                          executionStart: datetime, executionEnd: datetime,
+                          tempDir: str, cosClient, errorMessage: str = None) -> dict:
+        """
+        汇总用例结果：从 api_test_case_result 读取用例结果生成 HTML 报告并上传 COS，更新执行记录和测试用例统计
+
+        :param execution: 执行记录
+        :param testCase: 测试用例
+        :param environment: 环境配置
+        :param executionStart: 执行开始时间
+        :param executionEnd: 执行结束时间
+        :param tempDir: 临时目录
+        :param cosClient: COS 客户端
+        :param errorMessage: 执行过程中的错误信息（如分片失败），非空时执行记录置为失败
+        :return: 执行结果
+        """
+        executionId = execution.id
+
+        totalCases = 0
+        passedCases = 0
+        failedCases = 0
+        loadMetrics = []
+        timingAggregator = StepTimingAggregator()
+        flakinessTracker = CaseFlakinessTracker(
+            executionId, testCase.project_id, execution.test_case_id, execution.env_id, logger=logger
+        )
+
+        # 边读取用例结果边写入 HTML 报告（写入时 gzip 压缩），内存中只保留当前一批用例
+        reportUrl = None
+        reportHtmlPath = os.path.join(tempDir, f'report_{executionId}.html.gz')
+        # 启用共享静态文件时报告和查看器只引用 COS 上的 CSS/JS，发布失败则回退为内联
+        assetBaseUrl = None
+        if ReportAssetPublisher.ENABLED:
+            assetBaseUrl = ReportAssetPublisher.publish(cosClient, tempDir, logger=logger)
+        junitPath = os.path.join(tempDir, f'report_{executionId}.xml')
+        jsonPath = os.path.join(tempDir, f'report_{executionId}.json')
+        with CompressedReportFile(reportHtmlPath) as reportFile, \
+                open(junitPath, 'w', encoding='utf-8') as junitFile, \
+                open(jsonPath, 'w', encoding='utf-8') as jsonFile:
+            reportWriter = HtmlReportWriter(
+                reportFile,
+                test_name=testCase.case_name,
+                environment=environment.env_name,
+                base_url=environment.base_url,
+                start_time=executionStart,
+                end_time=executionEnd,
+                asset_base_url=assetBaseUrl
+            )
+            reportWriter.write_header()
+
+            # 同时写入按需加载报告（查看器 + 分块 JSON），用例较多时单文件报告在浏览器中打开缓慢
+            viewerWriter = LazyReportWriter(
+                os.path.join(tempDir, 'viewer'),
+                test_name=testCase.case_name,
+                environment=environment.env_name,
+                base_url=environment.base_url,
+                start_time=executionStart,
+                end_time=executionEnd,
+                asset_base_url=assetBaseUrl
+            )
+
+            # 机器可读的结果导出（JUnit XML、精简 JSON），供 CI 系统解析
+            exportWriters = [
+                writerClass(
+                    exportFile,
+                    test_name=testCase.case_name,
+                    environment=environment.env_name,
+                    base_url=environment.base_url,
+                    start_time=executionStart,
+                    end_time=executionEnd
+                )
+                for writerClass, exportFile in ((JUnitXmlWriter, junitFile), (JsonResultWriter, jsonFile))
+            ]
+            for exportWriter in exportWriters:
+                exportWriter.write_header()
+
+            for caseResult in CaseResultRecorder.iter_results(executionId):
+                totalCases += 1
+                if caseResult['status'] == 'PASS':
+                    passedCases += 1
+                else:
+                    failedCases += 1
+
+                # 收集压测步骤统计
+                for stepResult in caseResult['steps']:
+                    if stepResult.get('load'):
+                        loadMetrics.append({
+                            'case_id': caseResult['case_id'],
+                            'step_name': stepResult['name'],
+                            'status': stepResult['status'],
+                            **stepResult['load']
+                        })
+
+                timingAggregator.add_steps(caseResult['steps'])
+                flakinessTracker.add(caseResult)
+                reportWriter.write_case(caseResult)
+                viewerWriter.write_case(caseResult)
+                for exportWriter in exportWriters:
+                    exportWriter.write_case(caseResult)
+
+            reportWriter.write_footer()
+            for exportWriter in exportWriters:
+                exportWriter.write_footer()
+            viewerFiles = viewerWriter.close()
+
+        passRate = (passedCases / totalCases * 100) if totalCases > 0 else 0
+        logger.info(f"测试完成: {passedCases}/{totalCases} 通过，通过率: {passRate:.1f}%")
+
+        # 上传 HTML 报告到 COS
+        reportCosDir = f"webtest/webtest_api_test_reports/{testCase.project_id}/"
+        reportFilename = f"report_{executionId}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.html"
+
+        try:
+            cosRes = cosClient.upload_file_to_cos_bucket(
+                reportCosDir,
+                reportFilename,
+                reportHtmlPath,
+                content_type='text/html; charset=utf-8',
+                content_encoding='gzip'
+            )
+            if cosRes and 'ETag' in cosRes:
+                reportUrl = f"https://{cosClient.bucket}.cos.ap-guangzhou.myqcloud.com/{reportCosDir}{reportFilename}"
+                logger.info(
+                    f"报告上传成功: {reportUrl}, 压缩前 {reportFile.raw_size} 字节, 压缩后 {reportFile.compressed_size} 字节"
+                )
+        except Exception as e:
+            logger.error(f"上传报告失败: {e}")
+
+        reportBaseName = reportFilename[:-len('.html')]
+        junitReportUrl = ApiTestTaskService.uploadReportFile(
+            cosClient, reportCosDir, f"{reportBaseName}.xml", junitPath, 'application/xml; charset=utf-8'
+        )
+        jsonReportUrl = ApiTestTaskService.uploadReportFile(
+            cosClient, reportCosDir, f"{reportBaseName}.json", jsonPath, 'application/json; charset=utf-8'
+        )
+
+        viewerReportUrl = ApiTestTaskService.uploadViewerReport(
+            cosClient, f"{reportCosDir}viewer_{executionId}_{timezone.now().strftime('%Y%m%d_%H%M%S')}/", viewerFiles
+        )
+
+        # 更新执行记录
+        isSuccess = failedCases == 0 and not errorMessage
+        execution.status = ApiTestExecutionModel.ExecutionStatus.SUCCESS if isSuccess else ApiTestExecutionModel.ExecutionStatus.FAILED
+        execution.total_cases = totalCases
+        execution.passed_cases = passedCases
+        execution.failed_cases = failedCases
+        execution.pass_rate = passRate
+        execution.report_url = reportUrl
+        execution.viewer_report_url = viewerReportUrl
+        execution.junit_report_url = junitReportUrl
+        execution.json_report_url = jsonReportUrl
+        execution.report_size = reportFile.raw_size
+        execution.report_compressed_size = reportFile.compressed_size
+        execution.load_metrics = loadMetrics or None
+        execution.network_timings = timingAggregator.summary() or None
+        if errorMessage:
+            execution.error_message = errorMessage
+        execution.finished_at = timezone.now()
+        execution.duration = int((execution.finished_at - execution.started_at).total_seconds())
+        # 只写入本方法修改的字段，不覆盖执行期间合并请求更新的 coalesced_count 等字段
+        execution.save(update_fields=[
+            'status', 'total_cases', 'passed_cases', 'failed_cases', 'pass_rate',
+            'report_url', 'viewer_report_url', 'junit_report_url', 'json_report_url',
+            'report_size', 'report_compressed_size', 'load_metrics', 'network_timings',
+            'error_message', 'finished_at', 'duration', 'updated_at'
+        ])
+        ApiTestTaskService.updateScheduleStatus(execution)
+
+        # 更新测试用例统计，只执行部分用例（重跑失败用例）的执行不计入执行次数和成功次数
+        isPartial = ApiTestTaskService.isPartialExecution(execution)
+        testCase.last_execution_status = ApiTestCaseModel.ExecutionStatus.SUCCESS if isSuccess else ApiTestCaseModel.ExecutionStatus.FAILED
+        testCase.last_execution_time = execution.finished_at
+        updateFields = ['last_execution_status', 'last_execution_time']
+        if not isPartial:
+            testCase.total_executions = (testCase.total_executions or 0) + 1
+            if isSuccess:
+                testCase.success_count = (testCase.success_count or 0) + 1
+            updateFields += ['total_executions', 'success_count']
+        testCase.save(update_fields=updateFields)
+
+        # 更新每日统计
+        ApiTestTaskService.updateDailyStat(execution, testCase.project_id, isSuccess)
+
+        # 更新用例稳定性统计
+        try:
+            flakinessTracker.flush()
+        except Exception as e:
+            logger.error(f"更新执行记录 {executionId} 的用例稳定性统计失败: {e}")
+
+        return {
+            "code": ErrorCode.SUCCESS,
+            "message": f'执行完成: {passedCases}/{totalCases} 通过',
+            "data": {
+                'execution_id': executionId,
+                'status': execution.status,
+                'total_cases': totalCases,
+                'passed_cases': passedCases,
+                'failed_cases': failedCases,
+                'pass_rate': passRate,
+                'report_url': reportUrl,
+                'viewer_report_url': viewerReportUrl,
+                'junit_report_url': junitReportUrl,
+                'json_report_url': jsonReportUrl
+            },
+            "status_code": 200
+        }
+
+    @staticmethod
+    def isPartialExecution(execution) -> bool:
+        """是否只执行了部分用例（重跑失败用例），此类执行不计入每日统计和测试用例的执行次数"""
+        return bool(execution.parent_execution_id or execution.case_filter)
+
+    @staticmethod
+    def updateDailyStat(execution, projectId: int, isSuccess: bool):
+        """
+        将本次执行累加到 (项目, 日期, 测试用例, 环境) 的每日统计，供趋势接口直接读取
+        只执行部分用例的执行不计入，避免重跑后通过率偏高
+
+        :param execution: 已结束的执行记录
+        :param projectId: 项目 ID
+        :param isSuccess: 是否成功
+        """
+        if ApiTestTaskService.isPartialExecution(execution):
+            return
+
+        try:
+            stat, _ = ApiTestExecutionDailyStatModel.objects.get_or_create(
+                project_id=projectId,
+                stat_date=timezone.localtime(execution.finished_at).date(),
+                test_case_id=execution.test_case_id,
+                env_id=execution.env_id
+            )
+            ApiTestExecutionDailyStatModel.objects.filter(id=stat.id).update(
+                run_count=F('run_count') + 1,
+                passed_count=F('passed_count') + (1 if isSuccess else 0),
+                failed_count=F('failed_count') + (0 if isSuccess else 1),
+                total_cases=F('total_cases') + (execution.total_cases or 0),
+                passed_cases=F('passed_cases') + (execution.passed_cases or 0),
+                total_duration=F('total_duration') + (execution.duration or 0)
+            )
+        except Exception as e:
+            logger.error(f"更新执行记录 {execution.id} 的每日统计失败: {e}")
+
+    @staticmethod
+    def updateExecutionToFailed(executionId: int, errorMessage: str, recordStat: bool = True):
+        """
+        更新执行记录为失败状态
+
+        :param executionId: 执行记录 ID
+        :param errorMessage: 错误信息
+        :param recordStat: 是否计入每日统计（任务还会重试时传 False）
+        """
+        try:
+            execution = ApiTestExecutionModel.objects.get(id=executionId)
+            # 已结束的执行已经计入过每日统计
+            alreadyFinished = execution.status in (
+                ApiTestExecutionModel.ExecutionStatus.SUCCESS,
+                ApiTestExecutionModel.ExecutionStatus.FAILED
+            )
             execution.status = ApiTestExecutionModel.ExecutionStatus.FAILED
             execution.error_message = errorMessage
             execution.finished_at = timezone.now()
             if execution.started_at:
                 execution.duration = int((execution.finished_at - execution.started_at).total_seconds())
-            execution.save()
+            execution.save(update_fields=['status', 'error_message', 'finished_at', 'duration', 'updated_at'])
+            ApiTestTaskService.updateScheduleStatus(execution)
+
+            if recordStat and not alreadyFinished:
+                projectId = ApiTestCaseModel.objects.filter(
+                    id=execution.test_case_id
+                ).values_list('project_id', flat=True).first()
+                if projectId is not None:
+                    ApiTestTaskService.updateDailyStat(execution, projectId, False)
         except Exception:
             pass
 
+    @staticmethod
+    def uploadReportFile(cosClient, cosDir: str, fileName: str, filePath: str, contentType: str):
+        """
+        上传单个报告文件（JUnit XML、JSON 结果）
+        :param cosClient: COS 客户端
+        :param cosDir: COS 目录（以 / 结尾）
+        :param fileName: 文件名
+        :param filePath: 本地文件路径
+        :param contentType: Content-Type
+        :return: 文件访问 URL，上传失败时返回 None
+        """
+        try:
+            cosRes = cosClient.upload_file_to_cos_bucket(cosDir, fileName, filePath, content_type=contentType)
+            if cosRes and 'ETag' in cosRes:
+                fileUrl = f"https://{cosClient.bucket}.cos.ap-guangzhou.myqcloud.com/{cosDir}{fileName}"
+                logger.info(f"报告文件上传成功: {fileUrl}")
+                return fileUrl
+            logger.error(f"上传报告文件失败: {cosDir}{fileName}")
+        except Exception as e:
+            logger.error(f"上传报告文件 {fileName} 失败: {e}")
+        return None
+
+    @staticmethod
+    def uploadViewerReport(cosClient, cosDir: str, files: list):
+        """
+        上传按需加载报告的全部文件（查看器、索引、分块数据）
+        :param cosClient: COS 客户端
+        :param cosDir: COS 目录（以 / 结尾）
+        :param files: LazyReportWriter.close 返回的文件列表
+        :return: 查看器访问 URL，任一文件上传失败时返回 None
+        """
+        try:
+            for item in files:
+                cosRes = cosClient.upload_file_to_cos_bucket(
+                    cosDir,
+                    item['file_name'],
+                    item['file_path'],
+                    content_type=item['content_type'],
+                    content_encoding=item['content_encoding']
+                )
+                if not cosRes or 'ETag' not in cosRes:
+                    logger.error(f"上传按需加载报告失败: {cosDir}{item['file_name']}")
+                    return None
+        except Exception as e:
+            logger.error(f"上传按需加载报告失败: {e}")
+            return None
+
+        viewerUrl = f"https://{cosClient.bucket}.cos.ap-guangzhou.myqcloud.com/{cosDir}{LazyReportWriter.VIEWER_FILE}"
+        logger.info(f"按需加载报告上传成功: {viewerUrl}, 文件数: {len(files)}")
+        return viewerUrl
+
+    @staticmethod
+    def updateScheduleStatus(execution):
+        """
+        将执行状态同步到关联定时任务的 last_execution_status
+        只更新 last_execution_id 指向本次执行的定时任务，避免较早的执行覆盖最近一次执行的状态；
+        多个定时任务的请求合并到同一条执行记录时，这些定时任务都会被更新
+
+        :param execution: 执行记录
+        """
+        if not execution.scheduled_task_id:
+            return
+
+        scheduleStatus = {
+            ApiTestExecutionModel.ExecutionStatus.PENDING: ApiTestScheduleModel.ExecutionStatus.PENDING,
+            ApiTestExecutionModel.ExecutionStatus.RUNNING: ApiTestScheduleModel.ExecutionStatus.RUNNING,
+            ApiTestExecutionModel.ExecutionStatus.SUCCESS: ApiTestScheduleModel.ExecutionStatus.SUCCESS,
+            ApiTestExecutionModel.ExecutionStatus.FAILED: ApiTestScheduleModel.ExecutionStatus.FAILED,
+        }.get(execution.status)
+        if scheduleStatus is None:
+            return
+
+        try:
+            ApiTestScheduleModel.objects.filter(
+                last_execution_id=execution.id
+            ).update(last_execution_status=scheduleStatus)
+        except Exception as e:
+            logger.error(f"更新定时任务 {execution.scheduled_task_id} 执行状态失败: {e}")
+
     @staticmethod
     @shared_task
     def generateApiTestCaseTask(interfaceIds: list, projectId: int, userId: int) -> dict:
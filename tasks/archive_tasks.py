@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+执行记录归档相关任务
+负责将超过保留天数的接口测试执行记录移入归档表，控制 api_test_execution 的数据量
+"""
+import os
+import sys
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.db import transaction
+from django.utils import timezone
+
+# 添加项目根目录到 Python 路径
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from api_auto_test.models import (
+    ApiTestCaseResultModel,
+    ApiTestExecutionArchiveModel,
+    ApiTestExecutionModel
+)
+from constant.error_code import ErrorCode
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionArchiveTaskService:
+    """执行记录归档服务类"""
+
+    # 执行记录保留天数，0 表示不归档
+    RETENTION_DAYS = int(os.environ.get('API_TEST_EXECUTION_RETENTION_DAYS', 90))
+    # 单个事务归档的执行记录数量
+    BATCH_SIZE = int(os.environ.get('API_TEST_EXECUTION_ARCHIVE_BATCH_SIZE', 500))
+
+    @staticmethod
+    @shared_task
+    def archiveExecutions(retentionDays: int = None) -> dict:
+        """
+        归档过期的执行记录（Celery 任务入口）
+
+        每天执行一次，将创建时间早于保留天数、且已结束（成功/失败）的执行记录复制到
+        api_test_execution_archive 后从执行记录表删除，同时删除其用例结果明细（完整结果保留在 COS 测试报告中）。
+        归档记录仍可通过执行历史接口（archived=true）和执行详情接口查询。
+
+        :param retentionDays: 保留天数，为空时使用 RETENTION_DAYS
+        :return: 执行结果
+        """
+        response = {
+            "code": "",
+            "message": "",
+            "data": {},
+            "status_code": 200
+        }
+
+        if retentionDays is None:
+            retentionDays = ExecutionArchiveTaskService.RETENTION_DAYS
+
+        if retentionDays <= 0:
+            response['code'] = ErrorCode.SUCCESS
+            response['message'] = '未配置保留天数，跳过归档'
+            return response
+
+        cutoff = timezone.now() - timedelta(days=retentionDays)
+        archivedCount = 0
+
+        try:
+            while True:
+                batchCount = ExecutionArchiveTaskService.archiveBatch(cutoff, ExecutionArchiveTaskService.BATCH_SIZE)
+                archivedCount += batchCount
+                if batchCount < ExecutionArchiveTaskService.BATCH_SIZE:
+                    break
+
+            response['code'] = ErrorCode.SUCCESS
+            response['message'] = f'归档完成，共归档 {archivedCount} 条执行记录'
+            response['data'] = {
+                'cutoff': cutoff.isoformat(),
+                'archived_count': archivedCount
+            }
+            logger.info(f"执行记录归档完成: 归档 {archivedCount} 条 {cutoff.isoformat()} 之前的记录")
+
+        except Exception as e:
+            response['code'] = ErrorCode.SERVER_ERROR
+            response['message'] = f'归档失败: {str(e)}'
+            response['data'] = {
+                'cutoff': cutoff.isoformat(),
+                'archived_count': archivedCount
+            }
+            response['status_code'] = 500
+            logger.error(f"archiveExecutions 失败: {str(e)}")
+
+        return response
+
+    @staticmethod
+    def archiveBatch(cutoff, limit: int) -> int:
+        """
+        在一个事务内归档一批执行记录
+        已被锁定的行直接跳过，多个归档任务同时运行时不会重复处理
+
+        :param cutoff: 归档截止时间（早于该时间创建的记录被归档）
+        :param limit: 最多归档的数量
+        :return: 本批归档的数量
+        """
+        fieldNames = [
+            field.attname for field in ApiTestExecutionArchiveModel._meta.concrete_fields
+            if field.attname != 'archived_at'
+        ]
+
+        with transaction.atomic():
+            rows = list(
+                ApiTestExecutionModel.objects.select_for_update(skip_locked=True).filter(
+                    created_at__lt=cutoff,
+                    status__in=[
+                        ApiTestExecutionModel.ExecutionStatus.SUCCESS,
+                        ApiTestExecutionModel.ExecutionStatus.FAILED
+                    ]
+                ).order_by('created_at').values(*fieldNames)[:limit]
+            )
+            if not rows:
+                return 0
+
+            executionIds = [row['id'] for row in rows]
+
+            # 重复归档（如上次删除前中断）时忽略已存在的归档记录
+            ApiTestExecutionArchiveModel.objects.bulk_create(
+                [ApiTestExecutionArchiveModel(**row) for row in rows],
+                ignore_conflicts=True
+            )
+            ApiTestCaseResultModel.objects.filter(execution_id__in=executionIds).delete()
+            ApiTestExecutionModel.objects.filter(id__in=executionIds).delete()
+
+        return len(rows)
@@ -6,9 +6,12 @@
 import os
 import sys
 import logging
+import zlib
 from datetime import datetime, timedelta
 
 from celery import shared_task
+from django.db import transaction
+from django.db.models import Case, Exists, OuterRef, Value, When
 from django.utils import timezone
 
 # 添加项目根目录到 Python 路径
@@ -16,7 +19,7 @@ BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if BACKEND_DIR not in sys.path:
     sys.path.insert(0, BACKEND_DIR)
 
-from api_auto_test.models import ApiTestScheduleModel, ApiTestExecutionModel
+from api_auto_test.models import ApiTestScheduleModel, ApiTestExecutionModel, ApiTestEnvironmentModel
 from tasks.api_test_tasks import ApiTestTaskService
 from constant.error_code import ErrorCode
 
@@ -26,17 +29,28 @@ logger = logging.getLogger(__name__)
 class ScheduleTaskService:
     """定时任务调度服务类"""
 
+    # 单次认领的定时任务数量
+    CLAIM_BATCH_SIZE = int(os.environ.get('SCHEDULE_CLAIM_BATCH_SIZE', 100))
+    # 每次检查（每分钟）最多触发的定时任务数量，0 表示不限制，超出的到期任务留到后续检查按到期先后触发
+    MAX_TRIGGERS_PER_MINUTE = int(os.environ.get('SCHEDULE_MAX_TRIGGERS_PER_MINUTE', 0))
+    # 错峰窗口上限（分钟）
+    MAX_SPREAD_WINDOW = 60
+
     @staticmethod
     @shared_task
     def checkScheduledTasks() -> dict:
         """
         检查接口测试定时任务（Celery 任务入口）
 
-        每分钟执行一次，检查是否有到达执行时间的定时任务，触发执行。
+        每分钟执行一次，按 next_execution_time 索引只查询已到期的定时任务并触发执行。
 
         调度逻辑：
-        - daily: 每天在指定时间执行
-        - weekly: 每周在指定星期的指定时间执行
+        - 到期任务通过 select_for_update(skip_locked=True) 认领，认领的同时推进 next_execution_time，
+          多个调度进程同时运行时同一任务只会被其中一个触发
+        - beat 延迟或停机错过的执行时间点，在下一次检查时补触发一次
+        - 下次执行时间由 calculateNextExecutionTime 计算（daily 每天、weekly 每周指定星期），
+          设置了错峰窗口的任务在执行时间后按固定偏移触发
+        - 配置了 MAX_TRIGGERS_PER_MINUTE 时，单次检查触发数量达到上限后停止认领
 
         :return: 执行结果
         """
@@ -49,78 +63,53 @@ class ScheduleTaskService:
 
         now = timezone.now()
         localNow = timezone.localtime(now)
-        currentTime = localNow.time()
-        currentWeekday = localNow.isoweekday()
-
-        schedules = ApiTestScheduleModel.objects.filter(
-            is_enabled=True,
-            deleted_at__isnull=True
-        )
 
         triggeredCount = 0
         triggeredTasks = []
         errors = []
 
-        for schedule in schedules:
-            shouldTrigger = False
-
-            if schedule.schedule_type == ApiTestScheduleModel.ScheduleType.DAILY:
-                scheduleHour = schedule.schedule_time.hour
-                scheduleMinute = schedule.schedule_time.minute
-                currentHour = currentTime.hour
-                currentMinute = currentTime.minute
+        maxTriggers = ScheduleTaskService.MAX_TRIGGERS_PER_MINUTE
+        claimedCount = 0
+        deferred = False
 
-                shouldTrigger = (scheduleHour == currentHour and scheduleMinute == currentMinute)
+        while True:
+            limit = ScheduleTaskService.CLAIM_BATCH_SIZE
+            if maxTriggers > 0:
+                limit = min(limit, maxTriggers - claimedCount)
+                if limit <= 0:
+                    deferred = True
+                    break
 
-            elif schedule.schedule_type == ApiTestScheduleModel.ScheduleType.WEEKLY:
-                if schedule.schedule_weekday == currentWeekday:
-                    scheduleHour = schedule.schedule_time.hour
-                    scheduleMinute = schedule.schedule_time.minute
-                    currentHour = currentTime.hour
-                    currentMinute = currentTime.minute
+            schedules = ScheduleTaskService.claimDueSchedules(now, localNow, limit)
+            claimedCount += len(schedules)
 
-                    shouldTrigger = (scheduleHour == currentHour and scheduleMinute == currentMinute)
-
-            if shouldTrigger and schedule.last_execution_time:
-                lastExecLocal = timezone.localtime(schedule.last_execution_time)
-                if lastExecLocal.date() == localNow.date():
-                    if schedule.schedule_type == ApiTestScheduleModel.ScheduleType.DAILY:
-                        shouldTrigger = False
-                    elif schedule.schedule_type == ApiTestScheduleModel.ScheduleType.WEEKLY:
-                        shouldTrigger = False
-
-            if shouldTrigger:
+            for schedule in schedules:
                 try:
-                    execution = ApiTestExecutionModel.objects.create(
-                        test_case_id=schedule.test_case_id,
-                        env_id=schedule.env_id,
-                        status=ApiTestExecutionModel.ExecutionStatus.PENDING,
-                        trigger_type=ApiTestExecutionModel.TriggerType.SCHEDULED,
-                        scheduled_task_id=schedule.id,
-                        executed_user_id=schedule.created_user_id,
-                        executed_user=schedule.created_user
-                    )
-
-                    task = ApiTestTaskService.executeApiTestTask.delay(execution.id)
-
-                    execution.celery_task_id = task.id
-                    execution.save(update_fields=['celery_task_id'])
-
-                    schedule.last_execution_time = now
-                    schedule.last_execution_status = ApiTestScheduleModel.ExecutionStatus.PENDING
-
-                    nextTime = ScheduleTaskService.calculateNextExecutionTime(schedule, localNow)
-                    schedule.next_execution_time = nextTime
-                    schedule.save(update_fields=[
-                        'last_execution_time', 'last_execution_status', 'next_execution_time'
-                    ])
+                    coalesce = ApiTestEnvironmentModel.objects.filter(
+                        id=schedule.env_id
+                    ).values_list('coalesce_pending', flat=True).first()
+
+                    # 执行记录的状态变化通过 last_execution_id 同步到定时任务，
+                    # 与创建执行记录在同一事务内关联，任务在事务提交后才投递
+                    with transaction.atomic():
+                        execution, coalesced = ApiTestTaskService.submitExecution(
+                            schedule.test_case_id,
+                            schedule.env_id,
+                            ApiTestExecutionModel.TriggerType.SCHEDULED,
+                            schedule.created_user_id,
+                            schedule.created_user,
+                            scheduledTaskId=schedule.id,
+                            coalesce=bool(coalesce)
+                        )
+                        ApiTestScheduleModel.objects.filter(id=schedule.id).update(last_execution_id=execution.id)
 
                     triggeredCount += 1
                     triggeredTasks.append({
                         'schedule_id': schedule.id,
                         'task_name': schedule.task_name,
                         'execution_id': execution.id,
-                        'celery_task_id': task.id
+                        'celery_task_id': execution.celery_task_id,
+                        'coalesced': coalesced
                     })
 
                     logger.info(f"触发定时任务: {schedule.task_name} (schedule_id={schedule.id}, execution_id={execution.id})")
@@ -134,43 +123,109 @@ class ScheduleTaskService:
                         'error': str(e)
                     })
 
+                    # 本次执行时间点已被认领，提交失败时直接标记为失败
+                    ApiTestScheduleModel.objects.filter(id=schedule.id).update(
+                        last_execution_status=ApiTestScheduleModel.ExecutionStatus.FAILED
+                    )
+
+            if len(schedules) < limit:
+                break
+
+        if deferred:
+            logger.info(f"本次检查触发数量已达上限 {maxTriggers}，剩余到期定时任务延后触发")
+
         response['code'] = ErrorCode.SUCCESS
         response['message'] = f'检查完成，触发了 {triggeredCount} 个定时任务'
         response['data'] = {
             'checked_at': now.isoformat(),
             'triggered_count': triggeredCount,
             'triggered_tasks': triggeredTasks,
+            'deferred': deferred,
             'errors': errors
         }
 
         return response
 
+    @staticmethod
+    def claimDueSchedules(now, localNow, limit: int) -> list:
+        """
+        认领已到期的定时任务
+
+        在一个短事务内锁定到期任务并推进下次执行时间，已被其他调度进程锁定的行直接跳过；
+        事务提交后再提交执行任务，避免 worker 读取到未提交的执行记录
+
+        :param now: 当前时间
+        :param localNow: 当前本地时间
+        :param limit: 最多认领的数量
+        :return: 认领到的定时任务列表
+        """
+        with transaction.atomic():
+            schedules = list(
+                ApiTestScheduleModel.objects.select_for_update(skip_locked=True).filter(
+                    is_enabled=True,
+                    deleted_at__isnull=True,
+                    next_execution_time__lte=now
+                ).order_by('next_execution_time')[:limit]
+            )
+
+            for schedule in schedules:
+                schedule.last_execution_time = now
+                schedule.last_execution_status = ApiTestScheduleModel.ExecutionStatus.PENDING
+                schedule.next_execution_time = ScheduleTaskService.calculateNextExecutionTime(schedule, localNow)
+                schedule.save(update_fields=[
+                    'last_execution_time', 'last_execution_status', 'next_execution_time'
+                ])
+
+        return schedules
+
     @staticmethod
     def calculateNextExecutionTime(schedule, localNow):
-        """计算下次执行时间"""
+        """
+        计算下次执行时间（localNow 之后的第一个执行时间点，包含错峰偏移）
+        :param schedule: ApiTestScheduleModel 实例
+        :param localNow: 当前本地时间
+        :return: 下次执行时间，调度类型未知时返回 None
+        """
+        scheduleTime = schedule.schedule_time
+        offset = timedelta(minutes=ScheduleTaskService.getSpreadOffset(schedule))
+        # 执行时间点为 执行时间 + 偏移，先按 localNow - 偏移 计算不含偏移的下一个执行时间
+        localNow = localNow - offset
+
         if schedule.schedule_type == ApiTestScheduleModel.ScheduleType.DAILY:
-            nextDate = localNow.date() + timedelta(days=1)
-            nextTime = timezone.make_aware(
-                datetime.combine(nextDate, schedule.schedule_time)
-            )
+            daysUntilNext = 0 if localNow.time() < scheduleTime else 1
         elif schedule.schedule_type == ApiTestScheduleModel.ScheduleType.WEEKLY:
-            daysUntilNext = 7
-            nextDate = localNow.date() + timedelta(days=daysUntilNext)
-            nextTime = timezone.make_aware(
-                datetime.combine(nextDate, schedule.schedule_time)
-            )
+            weekday = schedule.schedule_weekday or 1
+            daysUntilNext = (weekday - localNow.isoweekday()) % 7
+            if daysUntilNext == 0 and localNow.time() >= scheduleTime:
+                daysUntilNext = 7
         else:
-            nextTime = None
+            return None
 
-        return nextTime
+        nextDate = localNow.date() + timedelta(days=daysUntilNext)
+        return timezone.make_aware(datetime.combine(nextDate, scheduleTime)) + offset
+
+    @staticmethod
+    def getSpreadOffset(schedule) -> int:
+        """
+        计算定时任务在错峰窗口内的偏移（分钟）
+        按定时任务 ID 哈希取模，同一任务每次得到相同偏移，同一时间点的任务均匀分布在窗口内
+        :param schedule: ApiTestScheduleModel 实例
+        :return: 偏移分钟数，未设置错峰窗口时为 0
+        """
+        spreadWindow = schedule.spread_window or 0
+        if spreadWindow <= 1 or not schedule.id:
+            return 0
+        return zlib.crc32(str(schedule.id).encode('utf-8')) % spreadWindow
 
     @staticmethod
     @shared_task
     def updateExecutionStatus() -> dict:
         """
-        更新定时任务的执行状态（Celery 任务入口）
+        对账定时任务的执行状态（Celery 任务入口）
 
-        定期检查定时任务关联的最近执行记录，更新定时任务的 last_execution_status。
+        执行状态在执行开始和结束时已直接同步到定时任务（见 ApiTestTaskService.updateScheduleStatus），
+        本任务只用一条 UPDATE 兜底修正遗漏的情况：
+        last_execution_status 仍为待执行/执行中、但 last_execution_id 对应的执行已结束的定时任务
 
         :return: 执行结果
         """
@@ -181,37 +236,33 @@ class ScheduleTaskService:
             "status_code": 200
         }
 
-        updatedCount = 0
-
         try:
-            schedules = ApiTestScheduleModel.objects.filter(
-                is_enabled=True,
-                deleted_at__isnull=True,
-                last_execution_status=ApiTestScheduleModel.ExecutionStatus.PENDING,
-                last_execution_time__isnull=False
+            finishedExecutions = ApiTestExecutionModel.objects.filter(
+                id=OuterRef('last_execution_id'),
+                status__in=[
+                    ApiTestExecutionModel.ExecutionStatus.SUCCESS,
+                    ApiTestExecutionModel.ExecutionStatus.FAILED
+                ]
+            )
+            successExecutions = ApiTestExecutionModel.objects.filter(
+                id=OuterRef('last_execution_id'),
+                status=ApiTestExecutionModel.ExecutionStatus.SUCCESS
             )
 
-            for schedule in schedules:
-                try:
-                    latestExecution = ApiTestExecutionModel.objects.filter(
-                        scheduled_task_id=schedule.id
-                    ).order_by('-created_at').first()
-
-                    if latestExecution:
-                        if latestExecution.status in [
-                            ApiTestExecutionModel.ExecutionStatus.SUCCESS,
-                            ApiTestExecutionModel.ExecutionStatus.FAILED
-                        ]:
-                            if latestExecution.status == ApiTestExecutionModel.ExecutionStatus.SUCCESS:
-                                schedule.last_execution_status = ApiTestScheduleModel.ExecutionStatus.SUCCESS
-                            else:
-                                schedule.last_execution_status = ApiTestScheduleModel.ExecutionStatus.FAILED
-
-                            schedule.save(update_fields=['last_execution_status'])
-                            updatedCount += 1
-
-                except Exception as e:
-                    logger.error(f"更新定时任务 {schedule.id} 状态失败: {str(e)}")
+            updatedCount = ApiTestScheduleModel.objects.filter(
+                Exists(finishedExecutions),
+                deleted_at__isnull=True,
+                last_execution_id__isnull=False,
+                last_execution_status__in=[
+                    ApiTestScheduleModel.ExecutionStatus.PENDING,
+                    ApiTestScheduleModel.ExecutionStatus.RUNNING
+                ]
+            ).update(
+                last_execution_status=Case(
+                    When(Exists(successExecutions), then=Value(ApiTestScheduleModel.ExecutionStatus.SUCCESS)),
+                    default=Value(ApiTestScheduleModel.ExecutionStatus.FAILED)
+                )
+            )
 
             response['code'] = ErrorCode.SUCCESS
             response['message'] = f'更新完成，共更新 {updatedCount} 个定时任务状态'
@@ -0,0 +1,210 @@
+from datetime import time
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from api_auto_test.executor import CaseResultRecorder
+from api_auto_test.models import ApiTestCaseModel, ApiTestExecutionModel, ApiTestScheduleModel
+from api_auto_test.service import Service
+from back.celery import app
+from tasks.api_test_tasks import ApiTestTaskService
+
+
+class CeleryTaskRoutingTest(SimpleTestCase):
+    """Celery 任务队列路由与优先级测试"""
+
+    def get_queue_name(self, task_name):
+        return app.amqp.router.route({}, task_name)['queue'].name
+
+    def test_api_test_tasks_route_to_api_test_queue(self):
+        for task_name in [
+            'tasks.api_test_tasks.executeApiTestTask',
+            'tasks.api_test_tasks.executeApiTestShardTask',
+            'tasks.api_test_tasks.mergeApiTestShardsTask',
+        ]:
+            self.assertEqual(self.get_queue_name(task_name), 'api_test', task_name)
+
+    def test_llm_tasks_route_to_llm_queue(self):
+        for task_name in [
+            'tasks.requirement_tasks.async_parse_requirement_document',
+            'tasks.requirement_tasks.async_vectorize_requirement_list',
+            'tasks.functional_test_case_tasks.async_generate_functional_test_case',
+            'tasks.functional_test_case_tasks.generate_single_functional_test_case',
+        ]:
+            self.assertEqual(self.get_queue_name(task_name), 'llm', task_name)
+
+    def test_schedule_tasks_route_to_schedule_queue(self):
+        for task_name in [
+            'tasks.schedule_tasks.checkScheduledTasks',
+            'tasks.schedule_tasks.updateExecutionStatus',
+            'tasks.archive_tasks.archiveExecutions',
+        ]:
+            self.assertEqual(self.get_queue_name(task_name), 'schedule', task_name)
+
+    def test_beat_schedule_uses_registered_task_names(self):
+        app.loader.import_default_modules()
+        for entry in app.conf.beat_schedule.values():
+            self.assertIn(entry['task'], app.tasks)
+
+    def test_api_test_queue_supports_priority(self):
+        queue = app.amqp.queues['api_test']
+        self.assertEqual(queue.queue_arguments.get('x-max-priority'), 10)
+
+    def test_manual_trigger_has_higher_priority_than_scheduled(self):
+        manualPriority = ApiTestTaskService.getTaskPriority(ApiTestExecutionModel.TriggerType.MANUAL)
+        scheduledPriority = ApiTestTaskService.getTaskPriority(ApiTestExecutionModel.TriggerType.SCHEDULED)
+        self.assertGreater(manualPriority, scheduledPriority)
+        self.assertLessEqual(manualPriority, app.conf.task_queue_max_priority)
+
+
+class SubmitExecutionCoalesceTest(TestCase):
+    """重复执行请求合并测试"""
+
+    def setUp(self):
+        self.testCase = ApiTestCaseModel.objects.create(
+            project_id=1,
+            case_name='订单接口',
+            cos_access_url='https://bucket.cos.ap-guangzhou.myqcloud.com/cases/order.yaml'
+        )
+        patcher = mock.patch.object(ApiTestTaskService.executeApiTestTask, 'apply_async')
+        self.applyAsync = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def submit(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return ApiTestTaskService.submitExecution(
+                self.testCase.id, 1, ApiTestExecutionModel.TriggerType.MANUAL, **kwargs
+            )
+
+    def test_pending_execution_absorbs_duplicates(self):
+        first, firstCoalesced = self.submit(coalesce=True)
+        second, secondCoalesced = self.submit(coalesce=True)
+        third, _ = self.submit(coalesce=True, scheduledTaskId=7)
+
+        self.assertFalse(firstCoalesced)
+        self.assertTrue(secondCoalesced)
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(first.id, third.id)
+        self.assertEqual(third.coalesced_count, 2)
+        self.assertEqual(third.scheduled_task_id, 7)
+        self.applyAsync.assert_called_once()
+        self.assertEqual(self.applyAsync.call_args.kwargs['task_id'], first.celery_task_id)
+
+    def test_without_coalesce_creates_new_execution(self):
+        first, _ = self.submit(coalesce=True)
+        second, coalesced = self.submit()
+
+        self.assertFalse(coalesced)
+        self.assertNotEqual(first.id, second.id)
+        self.assertEqual(self.applyAsync.call_count, 2)
+
+    def test_rerun_with_case_filter_is_not_coalesced(self):
+        first, _ = self.submit(coalesce=True)
+        second, coalesced = self.submit(coalesce=True, caseFilter=['C1'])
+
+        self.assertFalse(coalesced)
+        self.assertNotEqual(first.id, second.id)
+
+    def test_running_execution_is_not_reused(self):
+        first, _ = self.submit(coalesce=True)
+        ApiTestExecutionModel.objects.filter(id=first.id).update(status=ApiTestExecutionModel.ExecutionStatus.RUNNING)
+
+        second, coalesced = self.submit(coalesce=True)
+
+        self.assertFalse(coalesced)
+        self.assertNotEqual(first.id, second.id)
+
+    def test_failure_update_keeps_coalesced_count(self):
+        execution, _ = self.submit(coalesce=True)
+        # worker 读取执行记录后又有请求合并进来
+        staleExecution = ApiTestExecutionModel.objects.get(id=execution.id)
+        self.submit(coalesce=True)
+
+        with mock.patch.object(ApiTestExecutionModel.objects, 'get', return_value=staleExecution), \
+                mock.patch.object(ApiTestTaskService, 'updateDailyStat'):
+            ApiTestTaskService.updateExecutionToFailed(execution.id, '执行失败')
+
+        execution.refresh_from_db()
+        self.assertEqual(execution.status, ApiTestExecutionModel.ExecutionStatus.FAILED)
+        self.assertEqual(execution.coalesced_count, 1)
+        self.assertEqual(execution.celery_task_id, self.applyAsync.call_args.kwargs['task_id'])
+
+
+class ShardResultMergeTest(TestCase):
+    """分片用例结果按序号合并测试"""
+
+    def setUp(self):
+        self.execution = ApiTestExecutionModel.objects.create(test_case_id=1, env_id=1, shard_count=2)
+
+    def record_shard(self, indexOffset, caseIds, failedCaseIds=()):
+        recorder = CaseResultRecorder(self.execution.id, index_offset=indexOffset)
+        CaseResultRecorder.add_total(self.execution.id, len(caseIds))
+        # 分片内按完成顺序写入
+        for index in reversed(range(len(caseIds))):
+            recorder.add(index, {
+                'case_id': caseIds[index],
+                'case_name': caseIds[index],
+                'status': 'FAIL' if caseIds[index] in failedCaseIds else 'PASS',
+                'duration': 0.1,
+                'steps': []
+            })
+        recorder.flush()
+
+    def test_results_follow_case_order_across_shards(self):
+        with mock.patch.object(CaseResultRecorder, 'BATCH_SIZE', 2):
+            # 后面的分片先完成
+            self.record_shard(3, ['C4', 'C5'], failedCaseIds=['C5'])
+            self.record_shard(0, ['C1', 'C2', 'C3'])
+            caseResults = list(CaseResultRecorder.iter_results(self.execution.id))
+
+        self.assertEqual([item['case_id'] for item in caseResults], ['C1', 'C2', 'C3', 'C4', 'C5'])
+        self.assertEqual(caseResults[-1]['status'], 'FAIL')
+
+        self.execution.refresh_from_db()
+        self.assertEqual(
+            (self.execution.total_cases, self.execution.passed_cases, self.execution.failed_cases),
+            (5, 4, 1)
+        )
+
+    def test_reset_clears_results_and_counts(self):
+        self.record_shard(0, ['C1', 'C2'])
+
+        CaseResultRecorder.reset(self.execution.id)
+
+        self.assertEqual(list(CaseResultRecorder.iter_results(self.execution.id)), [])
+        self.execution.refresh_from_db()
+        self.assertEqual((self.execution.total_cases, self.execution.passed_cases), (0, 0))
+
+
+class ScheduleTriggerLinkTest(TestCase):
+    """手动触发定时任务时关联执行记录测试"""
+
+    def setUp(self):
+        self.schedule = ApiTestScheduleModel.objects.create(
+            project_id=1,
+            task_name='每日回归',
+            test_case_id=1,
+            env_id=1,
+            schedule_time=time(8, 0)
+        )
+        patcher = mock.patch.object(ApiTestTaskService.executeApiTestTask, 'apply_async')
+        self.applyAsync = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_manual_trigger_updates_schedule_status(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = Service().trigger_api_test_schedule(self.schedule.id, 1, 'tester')
+        self.assertEqual(response['status_code'], 200, response['message'])
+
+        executionId = response['data']['execution_id']
+        self.schedule.refresh_from_db()
+        self.assertEqual(self.schedule.last_execution_id, executionId)
+        self.assertEqual(self.schedule.last_execution_status, ApiTestScheduleModel.ExecutionStatus.PENDING)
+        self.applyAsync.assert_called_once()
+
+        execution = ApiTestExecutionModel.objects.get(id=executionId)
+        execution.status = ApiTestExecutionModel.ExecutionStatus.SUCCESS
+        ApiTestTaskService.updateScheduleStatus(execution)
+
+        self.schedule.refresh_from_db()
+        self.assertEqual(self.schedule.last_execution_status, ApiTestScheduleModel.ExecutionStatus.SUCCESS)
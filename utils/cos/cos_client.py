@@ -46,13 +46,16 @@ class CosClient:
 
     # 上传文件
     # 失败重试时不会上传已成功的分块(这里重试3次)
-    def upload_file_to_cos_bucket(self, target_dir, file_name, file_path, content_type=None):
+    def upload_file_to_cos_bucket(self, target_dir, file_name, file_path, content_type=None, content_encoding=None,
+                                   cache_control=None):
         """
         上传文件
         :param target_dir: 目标目录
         :param file_name: 文件名
         :param file_path: 本地文件路径
         :param content_type: 文件的 Content-Type（可选）
+        :param content_encoding: 文件的 Content-Encoding（可选，如本地文件已 gzip 压缩时传 gzip）
+        :param cache_control: 文件的 Cache-Control（可选，仅在指定 content_type 时生效）
         """
         response = {}
         key = os.path.join(target_dir, file_name).replace('\\', '/')
@@ -61,13 +64,19 @@ class CosClient:
             try:
                 # 如果指定了 Content-Type，使用 put_object（更好地支持 Content-Type）
                 if content_type:
+                    extra_headers = {}
+                    if content_encoding:
+                        extra_headers['ContentEncoding'] = content_encoding
+                    if cache_control:
+                        extra_headers['CacheControl'] = cache_control
                     with open(file_path, 'rb') as fp:
                         response = self.client.put_object(
                             Bucket=self.bucket,
                             Key=key,
                             Body=fp,
                             ContentType=content_type,
-                            ContentDisposition='inline'  # 让浏览器内联显示而不是下载
+                            ContentDisposition='inline',  # 让浏览器内联显示而不是下载
+                            **extra_headers
                         )
                 else:
                     # 不指定 Content-Type 时使用 upload_file（支持大文件分片上传）
@@ -81,6 +90,16 @@ class CosClient:
                 print(e)
         return response
 
+    def is_file_exists(self, target_dir, file_name):
+        """
+        判断文件是否存在
+        :param target_dir: 目标目录
+        :param file_name: 文件名
+        :return: 存在返回 True
+        """
+        key = os.path.join(target_dir, file_name).replace('\\', '/')
+        return self.client.object_exists(Bucket=self.bucket, Key=key)
+
     def download_file_by_cos_bucket(self, target_dir, file_name, file_path):
         """
         下载文件
@@ -1,5 +1,12 @@
 # -*- coding: utf-8 -*-
 """测试报告生成模块"""
-from .html_report_generator import HtmlReportGenerator
+from .compressed_report_file import CompressedReportFile
+from .html_report_generator import HtmlReportGenerator, HtmlReportWriter
+from .lazy_report_writer import LazyReportWriter
+from .report_assets import ReportAssetPublisher
+from .result_export_writer import JsonResultWriter, JUnitXmlWriter
 
-__all__ = ['HtmlReportGenerator']
+__all__ = [
+    'CompressedReportFile', 'HtmlReportGenerator', 'HtmlReportWriter', 'LazyReportWriter',
+    'ReportAssetPublisher', 'JsonResultWriter', 'JUnitXmlWriter'
+]
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+gzip 压缩的报告文件
+报告写入时直接压缩到磁盘，同时统计压缩前后的大小；
+上传 COS 时设置 Content-Encoding: gzip，浏览器下载后自动解压
+"""
+import gzip
+import os
+
+
+class CompressedReportFile:
+    """写入时 gzip 压缩的文本文件（只支持 write，供 HtmlReportWriter 等流式写入器使用）"""
+
+    # 压缩级别：报告内容重复度高，6 级已接近最高压缩率且速度明显快于 9 级
+    COMPRESS_LEVEL = 6
+
+    def __init__(self, file_path: str, encoding: str = 'utf-8'):
+        """
+        :param file_path: 压缩文件路径
+        :param encoding: 文本编码
+        """
+        self.file_path = file_path
+        self.encoding = encoding
+        self.raw_size = 0
+        self.compressed_size = 0
+        self._file = gzip.open(file_path, 'wb', compresslevel=self.COMPRESS_LEVEL)
+
+    def write(self, text: str) -> int:
+        """写入文本，返回写入的字符数"""
+        data = text.encode(self.encoding)
+        self.raw_size += len(data)
+        self._file.write(data)
+        return len(text)
+
+    def close(self):
+        """关闭文件并记录压缩后的大小"""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        self.compressed_size = os.path.getsize(self.file_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
@@ -2,461 +2,514 @@
 """
 自制 HTML 测试报告生成器
 生成单文件 HTML 报告，包含所有 CSS/JS，下载后可直接查看
+
+HtmlReportWriter 以流式方式写入文件：先写头部，每个用例添加后立即写出，最后写统计数据和尾部，
+内存占用与用例数量无关；HtmlReportGenerator 保留先收集全部用例、再一次生成的用法
+
+指定 asset_base_url 时报告不再内联 CSS/JS，改为引用按 ASSET_VERSION 命名的共享静态文件（见 ReportAssetPublisher）
 """
+import hashlib
 import html
+import io
 import json
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, TextIO
 
 
-class HtmlReportGenerator:
-    """HTML 测试报告生成器"""
+REPORT_CSS = """
+* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
 
-    def __init__(self):
-        self.test_results: List[Dict[str, Any]] = []
-        self.start_time: Optional[datetime] = None
-        self.end_time: Optional[datetime] = None
-        self.test_name: str = "API 自动化测试报告"
-        self.environment: str = ""
-        self.base_url: str = ""
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
+    background: linear-gradient(135deg, #1a1a2e 0%, #16213e 50%, #0f3460 100%);
+    min-height: 100vh;
+    color: #e4e4e4;
+    line-height: 1.6;
+}
 
-    def set_test_info(self, name: str, environment: str = "", base_url: str = ""):
-        """设置测试信息"""
-        self.test_name = name
-        self.environment = environment
-        self.base_url = base_url
+.container {
+    max-width: 1400px;
+    margin: 0 auto;
+    padding: 20px;
+    display: flex;
+    flex-direction: column;
+}
 
-    def set_time(self, start_time: datetime, end_time: datetime):
-        """设置执行时间"""
-        self.start_time = start_time
-        self.end_time = end_time
+/* 统计卡片和进度条在用例写完后才输出，通过 order 显示在用例列表之前 */
+.container > .header { order: 0; }
+.container > .stats { order: 1; }
+.container > .progress-bar { order: 2; }
+.container > .cases { order: 3; }
+.container > .footer { order: 4; }
 
-    def add_case_result(self, case_result: Dict[str, Any]):
-        """
-        添加用例执行结果
-        case_result 格式：
-        {
-            "case_id": "LIST_001",
-            "case_name": "[查询链接列表] 正向-默认参数查询成功",
-            "status": "PASS" | "FAIL",
-            "duration": 1.23,  # 秒
-            "error_message": "",  # 失败时的错误信息
-            "steps": [
-                {
-                    "name": "owner_login",
-                    "request": {
-                        "method": "POST",
-                        "url": "https://xxx/v1/auth/login",
-                        "headers": {...},
-                        "body": {...}
-                    },
-                    "response": {
-                        "status_code": 200,
-                        "headers": {...},
-                        "body": {...}
-                    },
-                    "status": "PASS" | "FAIL",
-                    "error_message": ""
-                }
-            ]
+/* 头部 */
+.header {
+    background: rgba(255, 255, 255, 0.05);
+    backdrop-filter: blur(10px);
+    border-radius: 16px;
+    padding: 30px;
+    margin-bottom: 24px;
+    border: 1px solid rgba(255, 255, 255, 0.1);
+}
+
+.header h1 {
+    font-size: 28px;
+    font-weight: 600;
+    margin-bottom: 8px;
+    background: linear-gradient(90deg, #00d9ff, #00ff88);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    background-clip: text;
+}
+
+.header .subtitle {
+    color: #888;
+    font-size: 14px;
+}
+
+/* 统计卡片 */
+.stats {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+    gap: 16px;
+    margin-bottom: 24px;
+}
+
+.stat-card {
+    background: rgba(255, 255, 255, 0.05);
+    backdrop-filter: blur(10px);
+    border-radius: 12px;
+    padding: 24px;
+    text-align: center;
+    border: 1px solid rgba(255, 255, 255, 0.1);
+    transition: transform 0.2s, box-shadow 0.2s;
+}
+
+.stat-card:hover {
+    transform: translateY(-4px);
+    box-shadow: 0 8px 32px rgba(0, 0, 0, 0.3);
+}
+
+.stat-card .value {
+    font-size: 36px;
+    font-weight: 700;
+    margin-bottom: 8px;
+}
+
+.stat-card .label {
+    color: #888;
+    font-size: 14px;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+}
+
+.stat-card.total .value { color: #00d9ff; }
+.stat-card.passed .value { color: #00ff88; }
+.stat-card.failed .value { color: #ff4757; }
+.stat-card.rate .value { color: #ffa502; }
+
+/* 进度条 */
+.progress-bar {
+    background: rgba(255, 255, 255, 0.1);
+    border-radius: 10px;
+    height: 20px;
+    overflow: hidden;
+    margin-bottom: 24px;
+}
+
+.progress-bar .fill {
+    height: 100%;
+    background: linear-gradient(90deg, #00ff88, #00d9ff);
+    border-radius: 10px;
+    transition: width 0.5s ease;
+}
+
+/* 用例列表 */
+.cases {
+    background: rgba(255, 255, 255, 0.05);
+    backdrop-filter: blur(10px);
+    border-radius: 16px;
+    border: 1px solid rgba(255, 255, 255, 0.1);
+    overflow: hidden;
+}
+
+.cases-header {
+    padding: 20px 24px;
+    border-bottom: 1px solid rgba(255, 255, 255, 0.1);
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+}
+
+.cases-header h2 {
+    font-size: 18px;
+    font-weight: 600;
+}
+
+.filter-buttons {
+    display: flex;
+    gap: 8px;
+}
+
+.filter-btn {
+    padding: 6px 16px;
+    border-radius: 20px;
+    border: 1px solid rgba(255, 255, 255, 0.2);
+    background: transparent;
+    color: #e4e4e4;
+    cursor: pointer;
+    font-size: 13px;
+    transition: all 0.2s;
+}
+
+.filter-btn:hover, .filter-btn.active {
+    background: rgba(0, 217, 255, 0.2);
+    border-color: #00d9ff;
+    color: #00d9ff;
+}
+
+/* 用例项 */
+.case-item {
+    border-bottom: 1px solid rgba(255, 255, 255, 0.05);
+}
+
+.case-item:last-child {
+    border-bottom: none;
+}
+
+.case-header {
+    padding: 16px 24px;
+    display: flex;
+    align-items: center;
+    cursor: pointer;
+    transition: background 0.2s;
+}
+
+.case-header:hover {
+    background: rgba(255, 255, 255, 0.03);
+}
+
+.case-status {
+    width: 32px;
+    height: 32px;
+    border-radius: 50%;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    margin-right: 16px;
+    font-size: 16px;
+}
+
+.case-status.pass {
+    background: rgba(0, 255, 136, 0.2);
+    color: #00ff88;
+}
+
+.case-status.fail {
+    background: rgba(255, 71, 87, 0.2);
+    color: #ff4757;
+}
+
+.case-info {
+    flex: 1;
+}
+
+.case-id {
+    font-weight: 600;
+    color: #00d9ff;
+    margin-right: 12px;
+}
+
+.case-name {
+    color: #e4e4e4;
+}
+
+.case-duration {
+    color: #888;
+    font-size: 13px;
+    margin-left: 16px;
+}
+
+.case-expand {
+    color: #888;
+    transition: transform 0.3s;
+}
+
+.case-item.expanded .case-expand {
+    transform: rotate(180deg);
+}
+
+/* 用例详情 */
+.case-detail {
+    display: none;
+    padding: 0 24px 24px 72px;
+}
+
+.case-item.expanded .case-detail {
+    display: block;
+}
+
+.error-message {
+    background: rgba(255, 71, 87, 0.1);
+    border: 1px solid rgba(255, 71, 87, 0.3);
+    border-radius: 8px;
+    padding: 16px;
+    margin-bottom: 16px;
+    color: #ff4757;
+}
+
+.error-message .label {
+    font-weight: 600;
+    margin-bottom: 8px;
+}
+
+/* 步骤 */
+.step {
+    background: rgba(0, 0, 0, 0.2);
+    border-radius: 8px;
+    margin-bottom: 12px;
+    overflow: hidden;
+}
+
+.step-header {
+    padding: 12px 16px;
+    display: flex;
+    align-items: center;
+    cursor: pointer;
+    background: rgba(255, 255, 255, 0.03);
+}
+
+.step-header:hover {
+    background: rgba(255, 255, 255, 0.05);
+}
+
+.step-status {
+    width: 20px;
+    height: 20px;
+    border-radius: 50%;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    margin-right: 12px;
+    font-size: 12px;
+}
+
+.step-status.pass {
+    background: rgba(0, 255, 136, 0.2);
+    color: #00ff88;
+}
+
+.step-status.fail {
+    background: rgba(255, 71, 87, 0.2);
+    color: #ff4757;
+}
+
+.step-name {
+    flex: 1;
+    font-weight: 500;
+}
+
+.step-method {
+    padding: 2px 8px;
+    border-radius: 4px;
+    font-size: 12px;
+    font-weight: 600;
+    margin-left: 12px;
+}
+
+.step-method.GET { background: rgba(0, 217, 255, 0.2); color: #00d9ff; }
+.step-method.POST { background: rgba(0, 255, 136, 0.2); color: #00ff88; }
+.step-method.PUT { background: rgba(255, 165, 2, 0.2); color: #ffa502; }
+.step-method.DELETE { background: rgba(255, 71, 87, 0.2); color: #ff4757; }
+.step-method.PATCH { background: rgba(155, 89, 182, 0.2); color: #9b59b6; }
+
+.step-detail {
+    display: none;
+    padding: 16px;
+}
+
+.step.expanded .step-detail {
+    display: block;
+}
+
+.detail-section {
+    margin-bottom: 16px;
+}
+
+.detail-section:last-child {
+    margin-bottom: 0;
+}
+
+.detail-label {
+    font-size: 12px;
+    color: #888;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+    margin-bottom: 8px;
+}
+
+.detail-content {
+    background: rgba(0, 0, 0, 0.3);
+    border-radius: 6px;
+    padding: 12px;
+    font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
+    font-size: 13px;
+    overflow-x: auto;
+    white-space: pre-wrap;
+    word-break: break-all;
+}
+
+.detail-content.url {
+    color: #00d9ff;
+}
+
+.status-code {
+    display: inline-block;
+    padding: 2px 8px;
+    border-radius: 4px;
+    font-weight: 600;
+    margin-left: 8px;
+}
+
+.status-code.success { background: rgba(0, 255, 136, 0.2); color: #00ff88; }
+.status-code.error { background: rgba(255, 71, 87, 0.2); color: #ff4757; }
+
+/* 压测统计 */
+.load-metrics {
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(120px, 1fr));
+    gap: 8px;
+}
+
+.load-metric {
+    background: rgba(0, 0, 0, 0.3);
+    border-radius: 6px;
+    padding: 10px 12px;
+}
+
+.load-metric .value {
+    font-size: 18px;
+    font-weight: 600;
+    color: #00d9ff;
+}
+
+.load-metric .label {
+    font-size: 12px;
+    color: #888;
+    margin-top: 4px;
+}
+
+/* 底部 */
+.footer {
+    text-align: center;
+    padding: 24px;
+    color: #666;
+    font-size: 13px;
+}
+
+/* 响应式 */
+@media (max-width: 768px) {
+    .stats {
+        grid-template-columns: repeat(2, 1fr);
+    }
+
+    .case-detail {
+        padding-left: 24px;
+    }
+}
+"""
+
+REPORT_JS = """
+// 切换用例展开/折叠
+function toggleCase(element) {
+    const caseItem = element.closest('.case-item');
+    caseItem.classList.toggle('expanded');
+}
+
+// 切换步骤展开/折叠
+function toggleStep(element) {
+    const step = element.closest('.step');
+    step.classList.toggle('expanded');
+}
+
+// 过滤用例
+function filterCases(type) {
+    const buttons = document.querySelectorAll('.filter-btn');
+    buttons.forEach(btn => btn.classList.remove('active'));
+    event.target.classList.add('active');
+
+    const cases = document.querySelectorAll('.case-item');
+    cases.forEach(item => {
+        if (type === 'all') {
+            item.style.display = 'block';
+        } else if (type === 'pass') {
+            item.style.display = item.dataset.status === 'pass' ? 'block' : 'none';
+        } else if (type === 'fail') {
+            item.style.display = item.dataset.status === 'fail' ? 'block' : 'none';
         }
-        """
-        self.test_results.append(case_result)
+    });
+}
+
+// 自动展开失败的用例
+document.addEventListener('DOMContentLoaded', function() {
+    const failedCases = document.querySelectorAll('.case-item[data-status="fail"]');
+    failedCases.forEach(item => item.classList.add('expanded'));
+});
+"""
+
+# 共享静态文件版本号，CSS/JS 内容变化时随之变化，文件名带版本号后可设置长期缓存
+ASSET_VERSION = hashlib.sha256((REPORT_CSS + REPORT_JS).encode('utf-8')).hexdigest()[:12]
+ASSET_CSS_FILE = f'report.{ASSET_VERSION}.css'
+ASSET_JS_FILE = f'report.{ASSET_VERSION}.js'
 
-    def generate(self) -> str:
-        """生成 HTML 报告"""
-        # 统计数据
-        total = len(self.test_results)
-        passed = sum(1 for r in self.test_results if r.get('status') == 'PASS')
-        failed = total - passed
-        pass_rate = (passed / total * 100) if total > 0 else 0
 
-        duration = 0
+class HtmlReportWriter:
+    """流式 HTML 测试报告写入器"""
+
+    def __init__(self, file_obj: TextIO, test_name: str = "API 自动化测试报告",
+                 environment: str = "", base_url: str = "", start_time: Optional[datetime] = None,
+                 end_time: Optional[datetime] = None, asset_base_url: Optional[str] = None):
+        """
+        :param file_obj: 以文本模式打开的文件对象
+        :param test_name: 报告标题
+        :param environment: 环境名称
+        :param base_url: Base URL
+        :param start_time: 执行开始时间
+        :param end_time: 执行结束时间
+        :param asset_base_url: 共享静态文件所在目录 URL（以 / 结尾），为空时内联 CSS/JS
+        """
+        self.file = file_obj
+        self.test_name = test_name
+        self.environment = environment
+        self.base_url = base_url
+        self.start_time = start_time
+        self.end_time = end_time
+        self.asset_base_url = asset_base_url
+        self.total = 0
+        self.passed = 0
+
+    def write_header(self):
+        """写入报告头部（样式、标题、用例列表开始标签）"""
+        duration_text = ''
         if self.start_time and self.end_time:
-            duration = (self.end_time - self.start_time).total_seconds()
+            duration_text = f' | 耗时: {(self.end_time - self.start_time).total_seconds():.2f}s'
 
-        # 生成用例 HTML
-        cases_html = self._generate_cases_html()
+        if self.asset_base_url:
+            style_html = f'<link rel="stylesheet" href="{html.escape(self.asset_base_url + ASSET_CSS_FILE)}">'
+        else:
+            style_html = f'<style>{REPORT_CSS}    </style>'
 
-        # 生成完整 HTML
-        html_content = f'''<!DOCTYPE html>
+        self.file.write(f'''<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{html.escape(self.test_name)}</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 50%, #0f3460 100%);
-            min-height: 100vh;
-            color: #e4e4e4;
-            line-height: 1.6;
-        }}
-        
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        
-        /* 头部 */
-        .header {{
-            background: rgba(255, 255, 255, 0.05);
-            backdrop-filter: blur(10px);
-            border-radius: 16px;
-            padding: 30px;
-            margin-bottom: 24px;
-            border: 1px solid rgba(255, 255, 255, 0.1);
-        }}
-        
-        .header h1 {{
-            font-size: 28px;
-            font-weight: 600;
-            margin-bottom: 8px;
-            background: linear-gradient(90deg, #00d9ff, #00ff88);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-        }}
-        
-        .header .subtitle {{
-            color: #888;
-            font-size: 14px;
-        }}
-        
-        /* 统计卡片 */
-        .stats {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 16px;
-            margin-bottom: 24px;
-        }}
-        
-        .stat-card {{
-            background: rgba(255, 255, 255, 0.05);
-            backdrop-filter: blur(10px);
-            border-radius: 12px;
-            padding: 24px;
-            text-align: center;
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            transition: transform 0.2s, box-shadow 0.2s;
-        }}
-        
-        .stat-card:hover {{
-            transform: translateY(-4px);
-            box-shadow: 0 8px 32px rgba(0, 0, 0, 0.3);
-        }}
-        
-        .stat-card .value {{
-            font-size: 36px;
-            font-weight: 700;
-            margin-bottom: 8px;
-        }}
-        
-        .stat-card .label {{
-            color: #888;
-            font-size: 14px;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }}
-        
-        .stat-card.total .value {{ color: #00d9ff; }}
-        .stat-card.passed .value {{ color: #00ff88; }}
-        .stat-card.failed .value {{ color: #ff4757; }}
-        .stat-card.rate .value {{ color: #ffa502; }}
-        
-        /* 进度条 */
-        .progress-bar {{
-            background: rgba(255, 255, 255, 0.1);
-            border-radius: 10px;
-            height: 20px;
-            overflow: hidden;
-            margin-bottom: 24px;
-        }}
-        
-        .progress-bar .fill {{
-            height: 100%;
-            background: linear-gradient(90deg, #00ff88, #00d9ff);
-            border-radius: 10px;
-            transition: width 0.5s ease;
-        }}
-        
-        /* 用例列表 */
-        .cases {{
-            background: rgba(255, 255, 255, 0.05);
-            backdrop-filter: blur(10px);
-            border-radius: 16px;
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            overflow: hidden;
-        }}
-        
-        .cases-header {{
-            padding: 20px 24px;
-            border-bottom: 1px solid rgba(255, 255, 255, 0.1);
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }}
-        
-        .cases-header h2 {{
-            font-size: 18px;
-            font-weight: 600;
-        }}
-        
-        .filter-buttons {{
-            display: flex;
-            gap: 8px;
-        }}
-        
-        .filter-btn {{
-            padding: 6px 16px;
-            border-radius: 20px;
-            border: 1px solid rgba(255, 255, 255, 0.2);
-            background: transparent;
-            color: #e4e4e4;
-            cursor: pointer;
-            font-size: 13px;
-            transition: all 0.2s;
-        }}
-        
-        .filter-btn:hover, .filter-btn.active {{
-            background: rgba(0, 217, 255, 0.2);
-            border-color: #00d9ff;
-            color: #00d9ff;
-        }}
-        
-        /* 用例项 */
-        .case-item {{
-            border-bottom: 1px solid rgba(255, 255, 255, 0.05);
-        }}
-        
-        .case-item:last-child {{
-            border-bottom: none;
-        }}
-        
-        .case-header {{
-            padding: 16px 24px;
-            display: flex;
-            align-items: center;
-            cursor: pointer;
-            transition: background 0.2s;
-        }}
-        
-        .case-header:hover {{
-            background: rgba(255, 255, 255, 0.03);
-        }}
-        
-        .case-status {{
-            width: 32px;
-            height: 32px;
-            border-radius: 50%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            margin-right: 16px;
-            font-size: 16px;
-        }}
-        
-        .case-status.pass {{
-            background: rgba(0, 255, 136, 0.2);
-            color: #00ff88;
-        }}
-        
-        .case-status.fail {{
-            background: rgba(255, 71, 87, 0.2);
-            color: #ff4757;
-        }}
-        
-        .case-info {{
-            flex: 1;
-        }}
-        
-        .case-id {{
-            font-weight: 600;
-            color: #00d9ff;
-            margin-right: 12px;
-        }}
-        
-        .case-name {{
-            color: #e4e4e4;
-        }}
-        
-        .case-duration {{
-            color: #888;
-            font-size: 13px;
-            margin-left: 16px;
-        }}
-        
-        .case-expand {{
-            color: #888;
-            transition: transform 0.3s;
-        }}
-        
-        .case-item.expanded .case-expand {{
-            transform: rotate(180deg);
-        }}
-        
-        /* 用例详情 */
-        .case-detail {{
-            display: none;
-            padding: 0 24px 24px 72px;
-        }}
-        
-        .case-item.expanded .case-detail {{
-            display: block;
-        }}
-        
-        .error-message {{
-            background: rgba(255, 71, 87, 0.1);
-            border: 1px solid rgba(255, 71, 87, 0.3);
-            border-radius: 8px;
-            padding: 16px;
-            margin-bottom: 16px;
-            color: #ff4757;
-        }}
-        
-        .error-message .label {{
-            font-weight: 600;
-            margin-bottom: 8px;
-        }}
-        
-        /* 步骤 */
-        .step {{
-            background: rgba(0, 0, 0, 0.2);
-            border-radius: 8px;
-            margin-bottom: 12px;
-            overflow: hidden;
-        }}
-        
-        .step-header {{
-            padding: 12px 16px;
-            display: flex;
-            align-items: center;
-            cursor: pointer;
-            background: rgba(255, 255, 255, 0.03);
-        }}
-        
-        .step-header:hover {{
-            background: rgba(255, 255, 255, 0.05);
-        }}
-        
-        .step-status {{
-            width: 20px;
-            height: 20px;
-            border-radius: 50%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            margin-right: 12px;
-            font-size: 12px;
-        }}
-        
-        .step-status.pass {{
-            background: rgba(0, 255, 136, 0.2);
-            color: #00ff88;
-        }}
-        
-        .step-status.fail {{
-            background: rgba(255, 71, 87, 0.2);
-            color: #ff4757;
-        }}
-        
-        .step-name {{
-            flex: 1;
-            font-weight: 500;
-        }}
-        
-        .step-method {{
-            padding: 2px 8px;
-            border-radius: 4px;
-            font-size: 12px;
-            font-weight: 600;
-            margin-left: 12px;
-        }}
-        
-        .step-method.GET {{ background: rgba(0, 217, 255, 0.2); color: #00d9ff; }}
-        .step-method.POST {{ background: rgba(0, 255, 136, 0.2); color: #00ff88; }}
-        .step-method.PUT {{ background: rgba(255, 165, 2, 0.2); color: #ffa502; }}
-        .step-method.DELETE {{ background: rgba(255, 71, 87, 0.2); color: #ff4757; }}
-        .step-method.PATCH {{ background: rgba(155, 89, 182, 0.2); color: #9b59b6; }}
-        
-        .step-detail {{
-            display: none;
-            padding: 16px;
-        }}
-        
-        .step.expanded .step-detail {{
-            display: block;
-        }}
-        
-        .detail-section {{
-            margin-bottom: 16px;
-        }}
-        
-        .detail-section:last-child {{
-            margin-bottom: 0;
-        }}
-        
-        .detail-label {{
-            font-size: 12px;
-            color: #888;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-            margin-bottom: 8px;
-        }}
-        
-        .detail-content {{
-            background: rgba(0, 0, 0, 0.3);
-            border-radius: 6px;
-            padding: 12px;
-            font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
-            font-size: 13px;
-            overflow-x: auto;
-            white-space: pre-wrap;
-            word-break: break-all;
-        }}
-        
-        .detail-content.url {{
-            color: #00d9ff;
-        }}
-        
-        .status-code {{
-            display: inline-block;
-            padding: 2px 8px;
-            border-radius: 4px;
-            font-weight: 600;
-            margin-left: 8px;
-        }}
-        
-        .status-code.success {{ background: rgba(0, 255, 136, 0.2); color: #00ff88; }}
-        .status-code.error {{ background: rgba(255, 71, 87, 0.2); color: #ff4757; }}
-        
-        /* 底部 */
-        .footer {{
-            text-align: center;
-            padding: 24px;
-            color: #666;
-            font-size: 13px;
-        }}
-        
-        /* 响应式 */
-        @media (max-width: 768px) {{
-            .stats {{
-                grid-template-columns: repeat(2, 1fr);
-            }}
-            
-            .case-detail {{
-                padding-left: 24px;
-            }}
-        }}
-    </style>
+    {style_html}
 </head>
 <body>
     <div class="container">
@@ -466,8 +519,45 @@ class HtmlReportGenerator:
             <div class="subtitle">
                 {f'环境: {html.escape(self.environment)} | ' if self.environment else ''}
                 {f'Base URL: {html.escape(self.base_url)} | ' if self.base_url else ''}
-                执行时间: {self.start_time.strftime('%Y-%m-%d %H:%M:%S') if self.start_time else '-'}
+                执行时间: {self.start_time.strftime('%Y-%m-%d %H:%M:%S') if self.start_time else '-'}{duration_text}
+            </div>
+        </div>
+        
+        <!-- 用例列表 -->
+        <div class="cases">
+            <div class="cases-header">
+                <h2>测试用例详情</h2>
+                <div class="filter-buttons">
+                    <button class="filter-btn active" onclick="filterCases('all')">全部</button>
+                    <button class="filter-btn" onclick="filterCases('pass')">通过</button>
+                    <button class="filter-btn" onclick="filterCases('fail')">失败</button>
+                </div>
             </div>
+''')
+
+    def write_case(self, case_result: Dict[str, Any]):
+        """
+        写入一个用例，格式见 HtmlReportGenerator.add_case_result
+        :param case_result: 用例执行结果
+        """
+        self.total += 1
+        if case_result.get('status') == 'PASS':
+            self.passed += 1
+        self.file.write(self._generate_case_html(case_result))
+
+    def write_footer(self):
+        """写入统计数据和报告尾部"""
+        total = self.total
+        passed = self.passed
+        failed = total - passed
+        pass_rate = (passed / total * 100) if total > 0 else 0
+
+        if self.asset_base_url:
+            script_html = f'<script src="{html.escape(self.asset_base_url + ASSET_JS_FILE)}"></script>'
+        else:
+            script_html = f'<script>{REPORT_JS}    </script>'
+
+        self.file.write(f'''
         </div>
         
         <!-- 统计卡片 -->
@@ -495,94 +585,42 @@ class HtmlReportGenerator:
             <div class="fill" style="width: {pass_rate}%"></div>
         </div>
         
-        <!-- 用例列表 -->
-        <div class="cases">
-            <div class="cases-header">
-                <h2>测试用例详情</h2>
-                <div class="filter-buttons">
-                    <button class="filter-btn active" onclick="filterCases('all')">全部</button>
-                    <button class="filter-btn" onclick="filterCases('pass')">通过</button>
-                    <button class="filter-btn" onclick="filterCases('fail')">失败</button>
-                </div>
-            </div>
-            {cases_html}
-        </div>
-        
         <!-- 底部 -->
         <div class="footer">
             Generated by API Auto Test Platform | {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         </div>
     </div>
     
-    <script>
-        // 切换用例展开/折叠
-        function toggleCase(element) {{
-            const caseItem = element.closest('.case-item');
-            caseItem.classList.toggle('expanded');
-        }}
-        
-        // 切换步骤展开/折叠
-        function toggleStep(element) {{
-            const step = element.closest('.step');
-            step.classList.toggle('expanded');
-        }}
-        
-        // 过滤用例
-        function filterCases(type) {{
-            const buttons = document.querySelectorAll('.filter-btn');
-            buttons.forEach(btn => btn.classList.remove('active'));
-            event.target.classList.add('active');
-            
-            const cases = document.querySelectorAll('.case-item');
-            cases.forEach(item => {{
-                if (type === 'all') {{
-                    item.style.display = 'block';
-                }} else if (type === 'pass') {{
-                    item.style.display = item.dataset.status === 'pass' ? 'block' : 'none';
-                }} else if (type === 'fail') {{
-                    item.style.display = item.dataset.status === 'fail' ? 'block' : 'none';
-                }}
-            }});
-        }}
-        
-        // 自动展开失败的用例
-        document.addEventListener('DOMContentLoaded', function() {{
-            const failedCases = document.querySelectorAll('.case-item[data-status="fail"]');
-            failedCases.forEach(item => item.classList.add('expanded'));
-        }});
-    </script>
+    {script_html}
 </body>
-</html>'''
-        return html_content
+</html>''')
 
-    def _generate_cases_html(self) -> str:
-        """生成用例列表 HTML"""
-        cases_html = ""
-        for result in self.test_results:
-            case_id = html.escape(result.get('case_id', ''))
-            case_name = html.escape(result.get('case_name', ''))
-            status = result.get('status', 'FAIL')
-            duration = result.get('duration', 0)
-            error_message = result.get('error_message', '')
-            steps = result.get('steps', [])
-
-            status_lower = 'pass' if status == 'PASS' else 'fail'
-            status_icon = '✓' if status == 'PASS' else '✗'
-
-            # 生成步骤 HTML
-            steps_html = self._generate_steps_html(steps)
-
-            # 错误信息
-            error_html = ""
-            if error_message:
-                error_html = f'''
-                <div class="error-message">
-                    <div class="label">❌ 错误信息</div>
-                    <div>{html.escape(error_message)}</div>
-                </div>
-                '''
+    def _generate_case_html(self, result: Dict[str, Any]) -> str:
+        """生成单个用例 HTML"""
+        case_id = html.escape(result.get('case_id', ''))
+        case_name = html.escape(result.get('case_name', ''))
+        status = result.get('status', 'FAIL')
+        duration = result.get('duration', 0)
+        error_message = result.get('error_message', '')
+        steps = result.get('steps', [])
+
+        status_lower = 'pass' if status == 'PASS' else 'fail'
+        status_icon = '✓' if status == 'PASS' else '✗'
 
-            cases_html += f'''
+        # 生成步骤 HTML
+        steps_html = self._generate_steps_html(steps)
+
+        # 错误信息
+        error_html = ""
+        if error_message:
+            error_html = f'''
+            <div class="error-message">
+                <div class="label">❌ 错误信息</div>
+                <div>{html.escape(error_message)}</div>
+            </div>
+            '''
+
+        return f'''
             <div class="case-item" data-status="{status_lower}">
                 <div class="case-header" onclick="toggleCase(this)">
                     <div class="case-status {status_lower}">{status_icon}</div>
@@ -599,7 +637,6 @@ class HtmlReportGenerator:
                 </div>
             </div>
             '''
-        return cases_html
 
     def _generate_steps_html(self, steps: List[Dict]) -> str:
         """生成步骤 HTML"""
@@ -629,6 +666,29 @@ class HtmlReportGenerator:
             req_body_str = json.dumps(req_body, ensure_ascii=False, indent=2) if req_body else '{}'
             resp_body_str = json.dumps(resp_body, ensure_ascii=False, indent=2) if isinstance(resp_body, (dict, list)) else str(resp_body)
 
+            # 压测统计
+            load_html = self._generate_load_html(step.get('load'))
+
+            # 网络耗时
+            timings_html = ""
+            timings = step.get('timings')
+            if timings:
+                # 同步引擎不单独测量连接、TLS、发送阶段（为 None），首字节耗时包含这些阶段
+                ttfb_label = '首字节' if timings.get('connect') is not None else '首字节(含连接、发送)'
+                timing_labels = (
+                    ('connect', '连接(含DNS)'), ('tls', 'TLS'), ('send', '发送'),
+                    ('ttfb', ttfb_label), ('download', '下载'), ('total', '总计')
+                )
+                timings_str = " | ".join(
+                    f"{label} {timings[phase]} ms" for phase, label in timing_labels if timings.get(phase) is not None
+                )
+                timings_html = f'''
+                <div class="detail-section">
+                    <div class="detail-label">网络耗时</div>
+                    <div class="detail-content">{html.escape(timings_str)}</div>
+                </div>
+                '''
+
             # 步骤错误信息
             step_error_html = ""
             if step_error:
@@ -663,15 +723,123 @@ class HtmlReportGenerator:
                         <div class="detail-label">响应 <span class="status-code {status_class}">{resp_status}</span></div>
                         <div class="detail-content">{html.escape(resp_body_str)}</div>
                     </div>
+                    {timings_html}
+                    {load_html}
                     {step_error_html}
                 </div>
             </div>
             '''
         return steps_html
 
+    def _generate_load_html(self, load: Optional[Dict[str, Any]]) -> str:
+        """生成压测步骤统计 HTML"""
+        if not load:
+            return ""
+
+        latency = load.get('latency_ms', {})
+        metrics = [
+            ('p50', f"{latency.get('p50', 0)} ms"),
+            ('p90', f"{latency.get('p90', 0)} ms"),
+            ('p99', f"{latency.get('p99', 0)} ms"),
+            ('最大延迟', f"{latency.get('max', 0)} ms"),
+            ('实际 RPS', load.get('achieved_rps', 0)),
+            ('目标 RPS', load.get('target_rps') or '-'),
+            ('并发数', load.get('concurrency', 0)),
+            ('请求数', load.get('total_requests', 0)),
+            ('错误率', f"{load.get('error_rate', 0) * 100:.2f}%"),
+            ('持续时间', f"{load.get('elapsed', load.get('duration', 0))} s"),
+        ]
+        metrics_html = "".join(
+            f'<div class="load-metric"><div class="value">{html.escape(str(value))}</div>'
+            f'<div class="label">{html.escape(label)}</div></div>'
+            for label, value in metrics
+        )
+
+        return f'''
+                <div class="detail-section">
+                    <div class="detail-label">压测统计</div>
+                    <div class="load-metrics">{metrics_html}</div>
+                </div>
+                '''
+
+
+class HtmlReportGenerator:
+    """HTML 测试报告生成器（收集全部用例后生成，用例较多时使用 HtmlReportWriter 流式写入）"""
+
+    def __init__(self):
+        self.test_results: List[Dict[str, Any]] = []
+        self.start_time: Optional[datetime] = None
+        self.end_time: Optional[datetime] = None
+        self.test_name: str = "API 自动化测试报告"
+        self.environment: str = ""
+        self.base_url: str = ""
+
+    def set_test_info(self, name: str, environment: str = "", base_url: str = ""):
+        """设置测试信息"""
+        self.test_name = name
+        self.environment = environment
+        self.base_url = base_url
+
+    def set_time(self, start_time: datetime, end_time: datetime):
+        """设置执行时间"""
+        self.start_time = start_time
+        self.end_time = end_time
+
+    def add_case_result(self, case_result: Dict[str, Any]):
+        """
+        添加用例执行结果
+        case_result 格式：
+        {
+            "case_id": "LIST_001",
+            "case_name": "[查询链接列表] 正向-默认参数查询成功",
+            "status": "PASS" | "FAIL",
+            "duration": 1.23,  # 秒
+            "error_message": "",  # 失败时的错误信息
+            "steps": [
+                {
+                    "name": "owner_login",
+                    "request": {
+                        "method": "POST",
+                        "url": "https://xxx/v1/auth/login",
+                        "headers": {...},
+                        "body": {...}
+                    },
+                    "response": {
+                        "status_code": 200,
+                        "headers": {...},
+                        "body": {...}
+                    },
+                    "status": "PASS" | "FAIL",
+                    "error_message": ""
+                }
+            ]
+        }
+        """
+        self.test_results.append(case_result)
+
+    def generate(self) -> str:
+        """生成 HTML 报告"""
+        buffer = io.StringIO()
+        self.write_to(buffer)
+        return buffer.getvalue()
+
+    def write_to(self, file_obj: TextIO):
+        """将报告写入文件对象"""
+        writer = HtmlReportWriter(
+            file_obj,
+            test_name=self.test_name,
+            environment=self.environment,
+            base_url=self.base_url,
+            start_time=self.start_time,
+            end_time=self.end_time
+        )
+        writer.write_header()
+        for result in self.test_results:
+            writer.write_case(result)
+        writer.write_footer()
+
     def save_to_file(self, file_path: str):
         """保存报告到文件"""
-        html_content = self.generate()
         with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            self.write_to(f)
         return file_path
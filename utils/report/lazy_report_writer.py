@@ -0,0 +1,377 @@
+# -*- coding: utf-8 -*-
+"""
+按需加载的测试报告
+报告由一个很小的 HTML 查看器（index.html）、汇总索引（index.json）和按用例分块的 JSON 数据（cases_*.json）组成，
+JSON 文件以 gzip 压缩写入，上传时需设置 Content-Encoding: gzip，浏览器会自动解压；
+查看器打开时只加载索引和第一页数据，翻页、筛选失败用例时再加载对应的分块，展开用例时才渲染步骤详情，
+打开报告的耗时与用例数量无关；
+指定 asset_base_url 时查看器不再内联 CSS/JS，改为引用按 VIEWER_ASSET_VERSION 命名的共享静态文件（见 ReportAssetPublisher）
+"""
+import gzip
+import hashlib
+import html
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .html_report_generator import REPORT_CSS
+
+
+VIEWER_CSS = """
+.pager {
+    display: flex;
+    justify-content: center;
+    align-items: center;
+    gap: 16px;
+    padding: 16px;
+    color: #888;
+    font-size: 13px;
+}
+
+.pager button:disabled {
+    opacity: 0.4;
+    cursor: not-allowed;
+}
+
+.loading {
+    padding: 24px;
+    text-align: center;
+    color: #888;
+}
+"""
+
+VIEWER_JS = """
+(function () {
+    var state = { index: null, filter: 'all', page: 0, chunks: {} };
+
+    function escapeHtml(value) {
+        return String(value === undefined || value === null ? '' : value)
+            .replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;')
+            .replace(/"/g, '&quot;').replace(/'/g, '&#39;');
+    }
+
+    function formatJson(value) {
+        if (value === undefined || value === null || value === '') return '{}';
+        return typeof value === 'object' ? JSON.stringify(value, null, 2) : String(value);
+    }
+
+    function loadJson(file) {
+        if (!state.chunks[file]) {
+            state.chunks[file] = fetch(file).then(function (resp) {
+                if (!resp.ok) throw new Error(file + ': HTTP ' + resp.status);
+                return resp.json();
+            });
+        }
+        return state.chunks[file];
+    }
+
+    function visibleChunks() {
+        return state.index.chunks.filter(function (chunk) {
+            if (state.filter === 'pass') return chunk.passed > 0;
+            if (state.filter === 'fail') return chunk.failed > 0;
+            return true;
+        });
+    }
+
+    function section(label, content, extraClass) {
+        return '<div class="detail-section"><div class="detail-label">' + label + '</div>' +
+            '<div class="detail-content' + (extraClass ? ' ' + extraClass : '') + '">' + escapeHtml(content) + '</div></div>';
+    }
+
+    function renderSteps(steps) {
+        return (steps || []).map(function (step) {
+            var request = step.request || {};
+            var response = step.response || {};
+            var statusLower = step.status === 'PASS' ? 'pass' : 'fail';
+            var method = escapeHtml(request.method || 'GET');
+            var code = response.status_code || 0;
+            var detail = section('请求 URL', request.url, 'url') +
+                section('请求头', formatJson(request.headers)) +
+                section('请求体', formatJson(request.body)) +
+                '<div class="detail-section"><div class="detail-label">响应 <span class="status-code ' +
+                (code >= 200 && code < 400 ? 'success' : 'error') + '">' + code + '</span></div>' +
+                '<div class="detail-content">' + escapeHtml(formatJson(response.body)) + '</div></div>';
+            if (step.timings) detail += section('网络耗时', formatJson(step.timings));
+            if (step.load) detail += section('压测统计', formatJson(step.load));
+            if (step.error_message) detail += section('错误信息', step.error_message);
+            return '<div class="step"><div class="step-header" data-toggle="step">' +
+                '<div class="step-status ' + statusLower + '">' + (statusLower === 'pass' ? '✓' : '✗') + '</div>' +
+                '<div class="step-name">' + escapeHtml(step.name) + '</div>' +
+                '<div class="step-method ' + method + '">' + method + '</div></div>' +
+                '<div class="step-detail">' + detail + '</div></div>';
+        }).join('');
+    }
+
+    function renderCase(item, key) {
+        var statusLower = item.status === 'PASS' ? 'pass' : 'fail';
+        return '<div class="case-item" data-status="' + statusLower + '" data-key="' + key + '">' +
+            '<div class="case-header" data-toggle="case">' +
+            '<div class="case-status ' + statusLower + '">' + (statusLower === 'pass' ? '✓' : '✗') + '</div>' +
+            '<div class="case-info"><span class="case-id">' + escapeHtml(item.case_id) + '</span>' +
+            '<span class="case-name">' + escapeHtml(item.case_name) + '</span></div>' +
+            '<div class="case-duration">' + Number(item.duration || 0).toFixed(2) + 's</div>' +
+            '<div class="case-expand">▼</div></div><div class="case-detail"></div></div>';
+    }
+
+    function renderPage() {
+        var chunks = visibleChunks();
+        var list = document.getElementById('case-list');
+        var pageInfo = document.getElementById('page-info');
+        document.getElementById('prev-page').disabled = state.page <= 0;
+        document.getElementById('next-page').disabled = state.page >= chunks.length - 1;
+        pageInfo.textContent = chunks.length ? ('第 ' + (state.page + 1) + ' / ' + chunks.length + ' 页') : '无用例';
+        if (!chunks.length) {
+            list.innerHTML = '';
+            return;
+        }
+
+        var chunk = chunks[state.page];
+        list.innerHTML = '<div class="loading">加载中...</div>';
+        loadJson(chunk.file).then(function (cases) {
+            state.current = cases;
+            list.innerHTML = cases.map(function (item, i) {
+                if (state.filter === 'pass' && item.status !== 'PASS') return '';
+                if (state.filter === 'fail' && item.status === 'PASS') return '';
+                return renderCase(item, i);
+            }).join('');
+        }).catch(function (err) {
+            list.innerHTML = '<div class="loading">加载失败: ' + escapeHtml(err.message) + '</div>';
+        });
+    }
+
+    function renderSummary(index) {
+        var summary = index.summary;
+        document.title = index.test_name;
+        document.getElementById('title').textContent = index.test_name;
+        document.getElementById('subtitle').textContent = [
+            index.environment ? '环境: ' + index.environment : '',
+            index.base_url ? 'Base URL: ' + index.base_url : '',
+            '执行时间: ' + (index.start_time || '-')
+        ].filter(Boolean).join(' | ');
+        document.getElementById('stat-total').textContent = summary.total;
+        document.getElementById('stat-passed').textContent = summary.passed;
+        document.getElementById('stat-failed').textContent = summary.failed;
+        document.getElementById('stat-rate').textContent = summary.pass_rate.toFixed(1) + '%';
+        document.getElementById('progress-fill').style.width = summary.pass_rate + '%';
+        document.getElementById('generated-at').textContent = index.generated_at;
+    }
+
+    document.addEventListener('click', function (event) {
+        var toggle = event.target.closest('[data-toggle]');
+        if (toggle) {
+            var item = toggle.closest(toggle.dataset.toggle === 'case' ? '.case-item' : '.step');
+            if (toggle.dataset.toggle === 'case' && !item.dataset.rendered) {
+                var result = state.current[Number(item.dataset.key)];
+                var detail = item.querySelector('.case-detail');
+                detail.innerHTML = (result.error_message ? '<div class="error-message"><div class="label">❌ 错误信息</div><div>' +
+                    escapeHtml(result.error_message) + '</div></div>' : '') + renderSteps(result.steps);
+                item.dataset.rendered = '1';
+            }
+            item.classList.toggle('expanded');
+            return;
+        }
+
+        var filterButton = event.target.closest('.filter-btn');
+        if (filterButton) {
+            document.querySelectorAll('.filter-btn').forEach(function (btn) { btn.classList.remove('active'); });
+            filterButton.classList.add('active');
+            state.filter = filterButton.dataset.filter;
+            state.page = 0;
+            renderPage();
+        }
+    });
+
+    document.getElementById('prev-page').addEventListener('click', function () {
+        state.page -= 1;
+        renderPage();
+    });
+    document.getElementById('next-page').addEventListener('click', function () {
+        state.page += 1;
+        renderPage();
+    });
+
+    loadJson('index.json').then(function (index) {
+        state.index = index;
+        renderSummary(index);
+        renderPage();
+    }).catch(function (err) {
+        document.getElementById('case-list').innerHTML = '<div class="loading">加载失败: ' + escapeHtml(err.message) + '</div>';
+    });
+})();
+"""
+
+VIEWER_HTML = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    {style_html}
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1 id="title">{title}</h1>
+            <div class="subtitle" id="subtitle"></div>
+        </div>
+        <div class="stats">
+            <div class="stat-card total"><div class="value" id="stat-total">-</div><div class="label">总用例数</div></div>
+            <div class="stat-card passed"><div class="value" id="stat-passed">-</div><div class="label">通过</div></div>
+            <div class="stat-card failed"><div class="value" id="stat-failed">-</div><div class="label">失败</div></div>
+            <div class="stat-card rate"><div class="value" id="stat-rate">-</div><div class="label">通过率</div></div>
+        </div>
+        <div class="progress-bar"><div class="fill" id="progress-fill" style="width: 0"></div></div>
+        <div class="cases">
+            <div class="cases-header">
+                <h2>测试用例详情</h2>
+                <div class="filter-buttons">
+                    <button class="filter-btn active" data-filter="all">全部</button>
+                    <button class="filter-btn" data-filter="pass">通过</button>
+                    <button class="filter-btn" data-filter="fail">失败</button>
+                </div>
+            </div>
+            <div id="case-list"></div>
+            <div class="pager">
+                <button class="filter-btn" id="prev-page">上一页</button>
+                <span id="page-info"></span>
+                <button class="filter-btn" id="next-page">下一页</button>
+            </div>
+        </div>
+        <div class="footer">Generated by API Auto Test Platform | <span id="generated-at"></span></div>
+    </div>
+    {script_html}
+</body>
+</html>"""
+
+# 查看器共享静态文件：样式由报告样式和查看器样式合并而成，版本号随内容变化
+VIEWER_ASSET_CSS = REPORT_CSS + VIEWER_CSS
+VIEWER_ASSET_VERSION = hashlib.sha256((VIEWER_ASSET_CSS + VIEWER_JS).encode('utf-8')).hexdigest()[:12]
+VIEWER_ASSET_CSS_FILE = f'viewer.{VIEWER_ASSET_VERSION}.css'
+VIEWER_ASSET_JS_FILE = f'viewer.{VIEWER_ASSET_VERSION}.js'
+
+
+class LazyReportWriter:
+    """按需加载的测试报告写入器（用例按块写入 gzip 压缩的 JSON 文件，内存中只保留当前块）"""
+
+    # 查看器入口文件
+    VIEWER_FILE = 'index.html'
+    # 汇总索引文件
+    INDEX_FILE = 'index.json'
+    # 每个分块（查看器中的一页）的用例数
+    CHUNK_SIZE = int(os.environ.get('API_TEST_REPORT_CHUNK_SIZE', 100))
+
+    def __init__(self, output_dir: str, test_name: str = "API 自动化测试报告",
+                 environment: str = "", base_url: str = "",
+                 start_time: Optional[datetime] = None, end_time: Optional[datetime] = None,
+                 asset_base_url: Optional[str] = None):
+        """
+        :param output_dir: 输出目录（不存在时自动创建）
+        :param test_name: 报告标题
+        :param environment: 环境名称
+        :param base_url: Base URL
+        :param start_time: 执行开始时间
+        :param end_time: 执行结束时间
+        :param asset_base_url: 共享静态文件所在目录 URL（以 / 结尾），为空时内联 CSS/JS
+        """
+        self.output_dir = output_dir
+        self.test_name = test_name
+        self.environment = environment
+        self.base_url = base_url
+        self.start_time = start_time
+        self.end_time = end_time
+        self.asset_base_url = asset_base_url
+        self.total = 0
+        self.passed = 0
+        self.chunk: List[Dict[str, Any]] = []
+        self.chunks: List[Dict[str, Any]] = []
+        os.makedirs(output_dir, exist_ok=True)
+
+    def write_case(self, case_result: Dict[str, Any]):
+        """
+        写入一个用例，格式见 HtmlReportGenerator.add_case_result
+        :param case_result: 用例执行结果
+        """
+        self.total += 1
+        if case_result.get('status') == 'PASS':
+            self.passed += 1
+        self.chunk.append(case_result)
+        if len(self.chunk) >= self.CHUNK_SIZE:
+            self._flush_chunk()
+
+    def close(self) -> List[Dict[str, Any]]:
+        """
+        写出剩余用例、索引和查看器
+        :return: 生成的文件列表 [{"file_name", "file_path", "content_type", "content_encoding"}]
+        """
+        self._flush_chunk()
+
+        failed = self.total - self.passed
+        index = {
+            'test_name': self.test_name,
+            'environment': self.environment,
+            'base_url': self.base_url,
+            'start_time': self.start_time.strftime('%Y-%m-%d %H:%M:%S') if self.start_time else None,
+            'end_time': self.end_time.strftime('%Y-%m-%d %H:%M:%S') if self.end_time else None,
+            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'summary': {
+                'total': self.total,
+                'passed': self.passed,
+                'failed': failed,
+                'pass_rate': round(self.passed / self.total * 100, 2) if self.total else 0
+            },
+            'chunks': self.chunks
+        }
+        self._write_json(self.INDEX_FILE, index)
+
+        if self.asset_base_url:
+            style_html = f'<link rel="stylesheet" href="{html.escape(self.asset_base_url + VIEWER_ASSET_CSS_FILE)}">'
+            script_html = f'<script src="{html.escape(self.asset_base_url + VIEWER_ASSET_JS_FILE)}"></script>'
+        else:
+            style_html = f'<style>{VIEWER_ASSET_CSS}    </style>'
+            script_html = f'<script>{VIEWER_JS}    </script>'
+
+        viewer_path = os.path.join(self.output_dir, self.VIEWER_FILE)
+        with open(viewer_path, 'w', encoding='utf-8') as f:
+            f.write(VIEWER_HTML.format(
+                title=html.escape(self.test_name),
+                style_html=style_html,
+                script_html=script_html
+            ))
+
+        files = [{
+            'file_name': self.VIEWER_FILE,
+            'file_path': viewer_path,
+            'content_type': 'text/html; charset=utf-8',
+            'content_encoding': None
+        }]
+        for file_name in [self.INDEX_FILE] + [chunk['file'] for chunk in self.chunks]:
+            files.append({
+                'file_name': file_name,
+                'file_path': os.path.join(self.output_dir, file_name),
+                'content_type': 'application/json; charset=utf-8',
+                'content_encoding': 'gzip'
+            })
+        return files
+
+    def _flush_chunk(self):
+        """将当前块写入文件并记录到索引"""
+        if not self.chunk:
+            return
+
+        file_name = f"cases_{len(self.chunks):05d}.json"
+        passed = sum(1 for item in self.chunk if item.get('status') == 'PASS')
+        self._write_json(file_name, self.chunk)
+        self.chunks.append({
+            'file': file_name,
+            'start': self.total - len(self.chunk),
+            'count': len(self.chunk),
+            'passed': passed,
+            'failed': len(self.chunk) - passed
+        })
+        self.chunk = []
+
+    def _write_json(self, file_name: str, data: Any):
+        """以 gzip 压缩写入 JSON 文件"""
+        with gzip.open(os.path.join(self.output_dir, file_name), 'wt', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'), default=str)
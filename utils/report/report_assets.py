@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+HTML 报告和按需加载报告查看器的共享静态文件
+将报告、查看器的 CSS/JS 按版本号上传到 COS（只上传一次，设置长期缓存），报告中只引用，不再逐份内联；
+浏览器访问不同报告时可复用缓存的静态文件
+"""
+import logging
+import os
+from typing import Optional
+
+from utils.report.compressed_report_file import CompressedReportFile
+from utils.report.html_report_generator import (
+    ASSET_CSS_FILE, ASSET_JS_FILE, ASSET_VERSION, REPORT_CSS, REPORT_JS
+)
+from utils.report.lazy_report_writer import (
+    VIEWER_ASSET_CSS, VIEWER_ASSET_CSS_FILE, VIEWER_ASSET_JS_FILE, VIEWER_ASSET_VERSION, VIEWER_JS
+)
+
+
+class ReportAssetPublisher:
+    """报告共享静态文件发布"""
+
+    # 是否启用共享静态文件（关闭时报告内联 CSS/JS，下载到本地后可离线查看）
+    ENABLED = os.environ.get('API_TEST_REPORT_SHARED_ASSETS', 'false').lower() in ('1', 'true', 'yes')
+
+    # COS 目录，文件名带版本号，不同版本并存
+    ASSET_COS_DIR = os.environ.get('API_TEST_REPORT_ASSET_DIR', 'webtest/webtest_api_test_reports/assets/')
+
+    # 文件名带版本号，内容不会变化，可设置长期缓存
+    CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+    # 当前全部静态文件的版本（报告、查看器各自按内容计算）
+    VERSION = (ASSET_VERSION, VIEWER_ASSET_VERSION)
+
+    # 已确认发布的版本（进程内缓存，避免每份报告都查询 COS）
+    _published_version = None
+
+    @classmethod
+    def publish(cls, cos_client, temp_dir: str, logger: Optional[logging.Logger] = None) -> Optional[str]:
+        """
+        确保当前版本的静态文件已上传到 COS
+        :param cos_client: COS 客户端
+        :param temp_dir: 临时目录
+        :param logger: 日志
+        :return: 静态文件目录 URL（以 / 结尾），上传失败时返回 None（报告应回退为内联 CSS/JS）
+        """
+        logger = logger or logging.getLogger(__name__)
+        base_url = f"https://{cos_client.bucket}.cos.ap-guangzhou.myqcloud.com/{cls.ASSET_COS_DIR}"
+        if cls._published_version == cls.VERSION:
+            return base_url
+
+        assets = (
+            (ASSET_CSS_FILE, REPORT_CSS, 'text/css; charset=utf-8'),
+            (ASSET_JS_FILE, REPORT_JS, 'application/javascript; charset=utf-8'),
+            (VIEWER_ASSET_CSS_FILE, VIEWER_ASSET_CSS, 'text/css; charset=utf-8'),
+            (VIEWER_ASSET_JS_FILE, VIEWER_JS, 'application/javascript; charset=utf-8'),
+        )
+        try:
+            for file_name, content, content_type in assets:
+                if cos_client.is_file_exists(cls.ASSET_COS_DIR, file_name):
+                    continue
+
+                file_path = os.path.join(temp_dir, f'{file_name}.gz')
+                with CompressedReportFile(file_path) as asset_file:
+                    asset_file.write(content)
+                cos_res = cos_client.upload_file_to_cos_bucket(
+                    cls.ASSET_COS_DIR,
+                    file_name,
+                    file_path,
+                    content_type=content_type,
+                    content_encoding='gzip',
+                    cache_control=cls.CACHE_CONTROL
+                )
+                if not cos_res or 'ETag' not in cos_res:
+                    logger.error(f"上传报告静态文件失败: {cls.ASSET_COS_DIR}{file_name}")
+                    return None
+                logger.info(f"报告静态文件上传成功: {base_url}{file_name}")
+        except Exception as e:
+            logger.error(f"发布报告静态文件失败: {e}")
+            return None
+
+        cls._published_version = cls.VERSION
+        return base_url
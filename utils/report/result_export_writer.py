@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+机器可读的测试结果导出
+与 HtmlReportWriter 使用相同的用例结果格式和写入方式（write_header / write_case / write_footer），
+逐个用例写出，不在内存中保留全部结果：
+- JUnitXmlWriter: JUnit XML，供 Jenkins、GitLab 等 CI 系统直接解析
+- JsonResultWriter: 精简 JSON 结果（不含请求/响应头和 body）
+"""
+import json
+import re
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Optional, TextIO
+from xml.sax.saxutils import escape, quoteattr
+
+# XML 1.0 不允许出现的控制字符
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f￾￿]')
+
+
+def xml_text(value: Any) -> str:
+    """转换为可写入 XML 文本节点的字符串"""
+    return escape(INVALID_XML_CHARS.sub('', '' if value is None else str(value)))
+
+
+def xml_attr(value: Any) -> str:
+    """转换为带引号的 XML 属性值"""
+    return quoteattr(INVALID_XML_CHARS.sub('', '' if value is None else str(value)))
+
+
+class JUnitXmlWriter:
+    """流式 JUnit XML 写入器"""
+
+    def __init__(self, file_obj: TextIO, test_name: str = "API 自动化测试报告",
+                 environment: str = "", base_url: str = "",
+                 start_time: Optional[datetime] = None, end_time: Optional[datetime] = None):
+        """
+        :param file_obj: 以文本模式打开的文件对象
+        :param test_name: 测试套件名称
+        :param environment: 环境名称
+        :param base_url: Base URL
+        :param start_time: 执行开始时间
+        :param end_time: 执行结束时间
+        """
+        self.file = file_obj
+        self.test_name = test_name
+        self.environment = environment
+        self.base_url = base_url
+        self.start_time = start_time
+        self.end_time = end_time
+        self.total = 0
+        self.failed = 0
+        self.case_time = 0.0
+        # testsuite 标签上的用例数、失败数需要在全部用例写完后才能确定，用例先写入临时文件
+        self._cases_file = None
+
+    def write_header(self):
+        """准备写入（用例写入临时文件，XML 头部在 write_footer 时写出）"""
+        self._cases_file = tempfile.TemporaryFile(mode='w+', encoding='utf-8')
+
+    def write_case(self, case_result: Dict[str, Any]):
+        """
+        写入一个用例，格式见 HtmlReportGenerator.add_case_result
+        :param case_result: 用例执行结果
+        """
+        self.total += 1
+        duration = case_result.get('duration') or 0
+        self.case_time += duration
+
+        case_name = f"{case_result.get('case_id', '')} {case_result.get('case_name') or ''}".strip()
+        parts = [
+            f'    <testcase classname={xml_attr(self.test_name)} name={xml_attr(case_name)} time="{duration:.3f}">\n'
+        ]
+
+        step_lines = []
+        failed_steps = []
+        for step in case_result.get('steps') or []:
+            request = step.get('request') or {}
+            response = step.get('response') or {}
+            line = (
+                f"[{step.get('status', '')}] {step.get('name', '')} "
+                f"{request.get('method', '')} {request.get('url', '')} -> {response.get('status_code', '')}"
+            )
+            if step.get('error_message'):
+                line += f" ({step['error_message']})"
+                failed_steps.append(line)
+            step_lines.append(line)
+
+        if case_result.get('status') != 'PASS':
+            self.failed += 1
+            message = case_result.get('error_message') or '用例执行失败'
+            parts.append(
+                f'      <failure message={xml_attr(message)} type="AssertionError">'
+                f'{xml_text(chr(10).join(failed_steps) or message)}</failure>\n'
+            )
+
+        if step_lines:
+            parts.append(f'      <system-out>{xml_text(chr(10).join(step_lines))}</system-out>\n')
+
+        parts.append('    </testcase>\n')
+        self._cases_file.write(''.join(parts))
+
+    def write_footer(self):
+        """写出 XML 头部、全部用例和尾部"""
+        total_time = self.case_time
+        if self.start_time and self.end_time:
+            total_time = (self.end_time - self.start_time).total_seconds()
+        timestamp = self.start_time.strftime('%Y-%m-%dT%H:%M:%S') if self.start_time else ''
+        counts = f'tests="{self.total}" failures="{self.failed}" errors="0" skipped="0" time="{total_time:.3f}"'
+
+        self.file.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        self.file.write(f'<testsuites name={xml_attr(self.test_name)} {counts}>\n')
+        self.file.write(f'  <testsuite name={xml_attr(self.test_name)} {counts} timestamp="{timestamp}">\n')
+        self.file.write('    <properties>\n')
+        self.file.write(f'      <property name="environment" value={xml_attr(self.environment)}/>\n')
+        self.file.write(f'      <property name="base_url" value={xml_attr(self.base_url)}/>\n')
+        self.file.write('    </properties>\n')
+
+        self._cases_file.seek(0)
+        shutil.copyfileobj(self._cases_file, self.file)
+        self._cases_file.close()
+        self._cases_file = None
+
+        self.file.write('  </testsuite>\n')
+        self.file.write('</testsuites>\n')
+
+
+class JsonResultWriter:
+    """流式 JSON 结果写入器"""
+
+    def __init__(self, file_obj: TextIO, test_name: str = "API 自动化测试报告",
+                 environment: str = "", base_url: str = "",
+                 start_time: Optional[datetime] = None, end_time: Optional[datetime] = None):
+        """
+        :param file_obj: 以文本模式打开的文件对象
+        :param test_name: 报告标题
+        :param environment: 环境名称
+        :param base_url: Base URL
+        :param start_time: 执行开始时间
+        :param end_time: 执行结束时间
+        """
+        self.file = file_obj
+        self.test_name = test_name
+        self.environment = environment
+        self.base_url = base_url
+        self.start_time = start_time
+        self.end_time = end_time
+        self.total = 0
+        self.passed = 0
+
+    def write_header(self):
+        """写入文档开头的基本信息和用例数组开始"""
+        header = {
+            'test_name': self.test_name,
+            'environment': self.environment,
+            'base_url': self.base_url,
+            'start_time': self.start_time.strftime('%Y-%m-%d %H:%M:%S') if self.start_time else None,
+            'end_time': self.end_time.strftime('%Y-%m-%d %H:%M:%S') if self.end_time else None
+        }
+        # 去掉结尾的 }，后面接着写用例数组
+        self.file.write(self._dumps(header)[:-1] + ',"cases":[')
+
+    def write_case(self, case_result: Dict[str, Any]):
+        """
+        写入一个用例，格式见 HtmlReportGenerator.add_case_result
+        :param case_result: 用例执行结果
+        """
+        steps = []
+        for step in case_result.get('steps') or []:
+            request = step.get('request') or {}
+            response = step.get('response') or {}
+            item = {
+                'name': step.get('name'),
+                'status': step.get('status'),
+                'method': request.get('method'),
+                'url': request.get('url'),
+                'status_code': response.get('status_code'),
+                'error_message': step.get('error_message') or None
+            }
+            if step.get('timings'):
+                item['timings'] = step['timings']
+            if step.get('load'):
+                item['load'] = step['load']
+            steps.append(item)
+
+        if self.total:
+            self.file.write(',')
+        self.total += 1
+        if case_result.get('status') == 'PASS':
+            self.passed += 1
+
+        self.file.write(self._dumps({
+            'case_id': case_result.get('case_id'),
+            'case_name': case_result.get('case_name'),
+            'status': case_result.get('status'),
+            'duration': case_result.get('duration'),
+            'error_message': case_result.get('error_message') or None,
+            'steps': steps
+        }))
+
+    def write_footer(self):
+        """写入用例数组结尾和统计数据"""
+        summary = {
+            'total': self.total,
+            'passed': self.passed,
+            'failed': self.total - self.passed,
+            'pass_rate': round(self.passed / self.total * 100, 2) if self.total else 0
+        }
+        self.file.write('],"summary":' + self._dumps(summary) + '}')
+
+    @staticmethod
+    def _dumps(data: Any) -> str:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=str)